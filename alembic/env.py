@@ -5,10 +5,12 @@ from sqlalchemy import create_engine, pool
 from alembic import context
 from dotenv import load_dotenv
 
+from app.config import VECTOR_STORE_BACKEND
 from app.database import Base
 from app.models import user
 from app.models import resume
 from app.models import job
+from app.models import job_embedding
 
 
 # Load environment variables from .env
@@ -32,19 +34,34 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave job_embeddings (created by revision 0001 with pgvector) out of
+    autogenerate unless the pgvector backend is in use."""
+    if type_ == "table" and name == "job_embeddings":
+        return VECTOR_STORE_BACKEND == "pgvector"
+    return True
+
+
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
     connectable = create_engine(DATABASE_URL, poolclass=pool.NullPool)
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
         with context.begin_transaction():
             context.run_migrations()
 
 
 if context.is_offline_mode():
     context.configure(
-        url=DATABASE_URL, target_metadata=target_metadata, literal_binds=True
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
     )
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,104 @@
+"""Baseline schema: users, jobs, resumes, job_matches and cover_letters
+
+Revision ID: 0001_baseline_schema
+Revises:
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_baseline_schema"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Foreign keys are named the way Postgres names them by default, so databases
+# created before this revision existed can be stamped at it and upgraded.
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password", sa.String(), nullable=False),
+        sa.UniqueConstraint("email", name="users_email_key"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.id"], name="jobs_user_id_fkey", ondelete="CASCADE"
+        ),
+    )
+    op.create_index("ix_jobs_id", "jobs", ["id"])
+
+    op.create_table(
+        "resumes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=True),
+        sa.Column("parent_resume_id", sa.Integer(), nullable=True),
+        sa.Column("experience", sa.Text(), nullable=False),
+        sa.Column("improved_experience", sa.Text(), nullable=True),
+        sa.Column("summary_experience", sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.id"], name="resumes_user_id_fkey", ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["job_id"], ["jobs.id"], name="resumes_job_id_fkey", ondelete="SET NULL"
+        ),
+        sa.ForeignKeyConstraint(
+            ["parent_resume_id"], ["resumes.id"], name="resumes_parent_resume_id_fkey"
+        ),
+    )
+    op.create_index("ix_resumes_id", "resumes", ["id"])
+
+    op.create_table(
+        "job_matches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("resume_id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("match_score", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["resume_id"], ["resumes.id"], name="job_matches_resume_id_fkey"
+        ),
+        sa.ForeignKeyConstraint(
+            ["job_id"], ["jobs.id"], name="job_matches_job_id_fkey"
+        ),
+    )
+    op.create_index("ix_job_matches_id", "job_matches", ["id"])
+
+    op.create_table(
+        "cover_letters",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("resume_id", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.id"], name="cover_letters_user_id_fkey"
+        ),
+        sa.ForeignKeyConstraint(
+            ["job_id"], ["jobs.id"], name="cover_letters_job_id_fkey"
+        ),
+        sa.ForeignKeyConstraint(
+            ["resume_id"], ["resumes.id"], name="cover_letters_resume_id_fkey"
+        ),
+    )
+    op.create_index("ix_cover_letters_id", "cover_letters", ["id"])
+
+
+def downgrade() -> None:
+    for table in ("cover_letters", "job_matches", "resumes", "jobs", "users"):
+        op.drop_table(table)
@@ -0,0 +1,73 @@
+"""Embedding, content hash and section columns; cascade job_matches deletes
+
+Revision ID: 0002_matching_columns
+Revises: 0001_baseline_schema
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_matching_columns"
+down_revision: Union[str, None] = "0001_baseline_schema"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, type) of the nullable columns added to each table
+COLUMNS = {
+    "resumes": [
+        ("sections", sa.JSON()),
+        ("embedding", sa.LargeBinary()),
+        ("embedding_hash", sa.String(length=64)),
+        ("chunk_embeddings", sa.LargeBinary()),
+    ],
+    "jobs": [
+        ("description_hash", sa.String(length=64)),
+        ("chunk_embeddings", sa.LargeBinary()),
+    ],
+    "job_matches": [
+        ("resume_hash", sa.String(length=64)),
+        ("job_hash", sa.String(length=64)),
+    ],
+}
+
+# (name, local column, referred table) of the job_matches foreign keys
+JOB_MATCH_FKS = [
+    ("job_matches_resume_id_fkey", "resume_id", "resumes"),
+    ("job_matches_job_id_fkey", "job_id", "jobs"),
+]
+
+
+def _set_job_match_fks(ondelete):
+    with op.batch_alter_table("job_matches") as batch_op:
+        for name, column, table in JOB_MATCH_FKS:
+            batch_op.drop_constraint(name, type_="foreignkey")
+            batch_op.create_foreign_key(
+                name, table, [column], ["id"], ondelete=ondelete
+            )
+
+
+def upgrade() -> None:
+    # Databases stamped at the baseline may already have some of these columns
+    inspector = sa.inspect(op.get_bind())
+    for table, columns in COLUMNS.items():
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        with op.batch_alter_table(table) as batch_op:
+            for name, type_ in columns:
+                if name not in existing:
+                    batch_op.add_column(sa.Column(name, type_, nullable=True))
+
+    # Deleting a resume or job removes its stored match scores
+    _set_job_match_fks("CASCADE")
+
+
+def downgrade() -> None:
+    _set_job_match_fks(None)
+    for table, columns in COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for name, _ in reversed(columns):
+                batch_op.drop_column(name)
@@ -0,0 +1,72 @@
+"""Add job_embeddings table for the pgvector vector store
+
+Revision ID: 0003_job_embeddings_pgvector
+Revises: 0002_matching_columns
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+from app.config import EMBEDDING_DIM, PGVECTOR_INDEX
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_job_embeddings_pgvector"
+down_revision: Union[str, None] = "0002_matching_columns"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger(__name__)
+
+
+def _pgvector_available() -> bool:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return False
+    return bool(
+        bind.execute(
+            sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'vector'")
+        ).scalar()
+    )
+
+
+def upgrade() -> None:
+    # Postgres images without pgvector (and other databases) keep working
+    # with the Chroma backend
+    if not _pgvector_available():
+        logger.warning("⚠️ pgvector is not available; skipping job_embeddings")
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.create_table(
+        "job_embeddings",
+        sa.Column(
+            "job_id",
+            sa.Integer(),
+            sa.ForeignKey("jobs.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("embedding", Vector(EMBEDDING_DIM), nullable=False),
+        sa.Column("description_hash", sa.String(length=64), nullable=True),
+    )
+
+    # ✅ Cosine-distance ANN index (HNSW by default; IVFFlat builds faster)
+    if PGVECTOR_INDEX == "ivfflat":
+        op.execute(
+            "CREATE INDEX ix_job_embeddings_embedding ON job_embeddings "
+            "USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100)"
+        )
+    else:
+        op.execute(
+            "CREATE INDEX ix_job_embeddings_embedding ON job_embeddings "
+            "USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)"
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS job_embeddings")
@@ -0,0 +1,35 @@
+"""One job_matches row per (resume, job) pair
+
+Revision ID: 0004_job_matches_unique_pair
+Revises: 0003_job_embeddings_pgvector
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_job_matches_unique_pair"
+down_revision: Union[str, None] = "0003_job_embeddings_pgvector"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the newest row of any duplicated pair before adding the constraint
+    op.execute(
+        "DELETE FROM job_matches WHERE id NOT IN "
+        "(SELECT MAX(id) FROM job_matches GROUP BY resume_id, job_id)"
+    )
+    # Batch mode so SQLite (which cannot ALTER constraints) works too
+    with op.batch_alter_table("job_matches") as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_job_matches_resume_job", ["resume_id", "job_id"]
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("job_matches") as batch_op:
+        batch_op.drop_constraint("uq_job_matches_resume_job", type_="unique")
@@ -0,0 +1,60 @@
+"""Indexes for hot lookups and foreign keys
+
+Revision ID: 0005_hot_path_indexes
+Revises: 0004_job_matches_unique_pair
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_hot_path_indexes"
+down_revision: Union[str, None] = "0004_job_matches_unique_pair"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial index condition)
+INDEXES = [
+    # A user's resumes, optionally for one job, newest first (cover letters)
+    ("ix_resumes_user_id_job_id_id", "resumes", ["user_id", "job_id", "id"], None),
+    # A user's base resume (`link_resume_to_job`)
+    ("ix_resumes_unlinked_user_id", "resumes", ["user_id"], "job_id IS NULL"),
+    ("ix_resumes_job_id", "resumes", ["job_id"], None),
+    ("ix_resumes_parent_resume_id", "resumes", ["parent_resume_id"], None),
+    ("ix_jobs_user_id", "jobs", ["user_id"], None),
+    # job_matches.resume_id is covered by uq_job_matches_resume_job
+    ("ix_job_matches_job_id", "job_matches", ["job_id"], None),
+    ("ix_cover_letters_user_id", "cover_letters", ["user_id"], None),
+    ("ix_cover_letters_job_id", "cover_letters", ["job_id"], None),
+    ("ix_cover_letters_resume_id", "cover_letters", ["resume_id"], None),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tables writable while the indexes are built
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                sqlite_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
@@ -6,3 +6,148 @@ load_dotenv()
 DATABASE_URL = os.getenv(
     "DATABASE_URL", "postgresql://postgres:password@db:5432/resume_db"
 )
+
+
+def _async_driver_url(url: str) -> str:
+    for sync_prefix, async_prefix in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix) :]
+    return url
+
+
+# ✅ Same database through asyncpg (derived from DATABASE_URL unless set)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_driver_url(DATABASE_URL)
+
+# ✅ Connection pool (per engine and process: sync + async each get one)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # wait for a free slot
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true") == "true"
+
+# ✅ ML model settings (shared by the model registry)
+SUMMARIZATION_MODEL = os.getenv("SUMMARIZATION_MODEL", "facebook/bart-large-cnn")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+MODEL_DEVICE = os.getenv("MODEL_DEVICE", "cpu")  # e.g. "cpu", "cuda", "cuda:1"
+MODEL_NUM_THREADS = int(os.getenv("MODEL_NUM_THREADS", "0"))  # 0 = torch default
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "lazy")  # "lazy", "startup" or "background"
+
+# ✅ Micro-batching for summarization / embedding inference
+INFERENCE_MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "16"))
+INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "5"))
+
+# ✅ Matching embeddings: "summarize" (BART summary of the first 1024 chars, then
+# embed) or "chunked" (token-bounded chunks embedded in one batch, mean-pooled)
+EMBEDDING_MODE = os.getenv("EMBEDDING_MODE", "summarize")
+EMBEDDING_CHUNK_TOKENS = int(os.getenv("EMBEDDING_CHUNK_TOKENS", "256"))
+EMBEDDING_CHUNK_OVERLAP = int(os.getenv("EMBEDDING_CHUNK_OVERLAP", "32"))
+EMBEDDING_MAX_CHUNKS = int(os.getenv("EMBEDDING_MAX_CHUNKS", "32"))
+
+# ✅ Content-addressed cache for summaries / embeddings
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "4096"))  # in-process LRU
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "none")  # "none", "redis" or "disk"
+CACHE_DIR = os.getenv("CACHE_DIR", "/tmp/ai-resume-cache")
+CACHE_DISK_MAX_ENTRIES = int(os.getenv("CACHE_DISK_MAX_ENTRIES", "100000"))
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# ✅ Job vector store: "chroma", "pgvector" (job_embeddings table) or "numpy" (tests)
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "chroma")
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "384"))  # pgvector column size
+PGVECTOR_INDEX = os.getenv("PGVECTOR_INDEX", "hnsw")  # "hnsw" or "ivfflat"
+CHROMA_HOST = os.getenv("CHROMA_HOST", "")  # set to use a Chroma server over HTTP
+CHROMA_PORT = int(os.getenv("CHROMA_PORT", "8000"))
+CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", "/app/chromadb")  # embedded mode
+CHROMA_COLLECTION = os.getenv("CHROMA_COLLECTION", "job-matching")
+
+# ✅ Top-K job search: "chroma" / "store" (VECTOR_STORE_BACKEND's own query) or
+# "local" (in-process index)
+VECTOR_SEARCH_BACKEND = os.getenv("VECTOR_SEARCH_BACKEND", "chroma")
+
+# ✅ Job vector sync (batched vector store writes + periodic jobs-table reconciliation)
+VECTOR_SYNC_BATCH_SIZE = int(os.getenv("VECTOR_SYNC_BATCH_SIZE", "64"))
+VECTOR_RECONCILE_INTERVAL_SECONDS = int(
+    os.getenv("VECTOR_RECONCILE_INTERVAL_SECONDS", str(6 * 3600))
+)  # 0 disables the scheduled run
+
+# ✅ Resume embedding matrix used for candidate ranking
+RESUME_MATRIX_PATH = os.getenv("RESUME_MATRIX_PATH", "")  # set to memory-map from disk
+RESUME_MATRIX_TTL_SECONDS = int(os.getenv("RESUME_MATRIX_TTL_SECONDS", "60"))
+
+# ✅ List endpoints (keyset pagination)
+PAGE_SIZE = int(os.getenv("PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+
+# ✅ POST /job-match/batch: max resume ids and job ids per request
+BATCH_MATCH_MAX_IDS = int(os.getenv("BATCH_MATCH_MAX_IDS", "200"))
+
+# ✅ LLM (OpenRouter / OpenAI-compatible) client settings
+DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "qwen/qwen2.5-vl-72b-instruct:free")
+DEFAULT_API_KEY = os.getenv("DEFAULT_API_KEY", "")  # Optional: Store in .env
+OPENROUTER_API_BASE = os.getenv("OPENROUTER_API_BASE", "https://openrouter.ai/api/v1")
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "20"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "64"))  # in-flight calls
+LLM_CLIENT_CACHE_SIZE = int(os.getenv("LLM_CLIENT_CACHE_SIZE", "256"))
+
+# ✅ Background tasks (Celery). Use "memory://" + "cache+memory://" for tests.
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", REDIS_URL)
+CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", REDIS_URL)
+CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "false") == "true"
+TASK_MAX_RETRIES = int(os.getenv("TASK_MAX_RETRIES", "3"))
+TASK_RESULT_EXPIRES = int(os.getenv("TASK_RESULT_EXPIRES", str(24 * 3600)))
+WEBHOOK_TIMEOUT_SECONDS = float(os.getenv("WEBHOOK_TIMEOUT_SECONDS", "10"))
+# Fernet key (shared by the API and workers) encrypting API keys in task messages:
+#   python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"
+TASK_SECRET_KEY = os.getenv("TASK_SECRET_KEY", "")
+# Comma-separated callback hosts; when set, only these are accepted (and may be
+# internal). Otherwise callbacks must resolve to public addresses.
+WEBHOOK_ALLOWED_HOSTS = [
+    host.strip().lower()
+    for host in os.getenv("WEBHOOK_ALLOWED_HOSTS", "").split(",")
+    if host.strip()
+]
+
+# ✅ LLM response cache (shares CACHE_BACKEND=redis when configured)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true") == "true"
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+
+# ✅ Password hashing (bcrypt cost; stored hashes with another cost are
+# re-hashed on login) and its dedicated thread pool
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+
+# ✅ Resume PDF ingestion
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(256 * 1024)))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "4"))  # processes for single PDF uploads
+BULK_PDF_PROCESSES = int(os.getenv("BULK_PDF_PROCESSES", "0"))  # 0 = one per CPU
+BULK_MAX_FILES = int(os.getenv("BULK_MAX_FILES", "2000"))
+BULK_MAX_BYTES = int(os.getenv("BULK_MAX_BYTES", str(500 * 1024 * 1024)))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "30"))
+PDF_TIME_LIMIT_SECONDS = float(os.getenv("PDF_TIME_LIMIT_SECONDS", "10"))
+# Hard limit per document (PDF_TIME_LIMIT_SECONDS is only checked between pages)
+PDF_HARD_TIME_LIMIT_SECONDS = float(
+    os.getenv("PDF_HARD_TIME_LIMIT_SECONDS", str(3 * PDF_TIME_LIMIT_SECONDS))
+)
+PDF_MIN_PAGE_CHARS = int(os.getenv("PDF_MIN_PAGE_CHARS", "20"))
+PDF_PAGE_CACHE_SIZE = int(os.getenv("PDF_PAGE_CACHE_SIZE", "2048"))
+
+# ✅ Instrumentation: always send a Server-Timing header (otherwise only when the
+# request carries `X-Server-Timing: 1`). Prometheus metrics are served on /metrics.
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false") == "true"
+# Chat models reported by name in the `llm` metrics (besides DEFAULT_MODEL);
+# any other client-chosen `user_model` is labelled "custom"
+LLM_METRIC_MODELS = [
+    model.strip()
+    for model in os.getenv("LLM_METRIC_MODELS", "").split(",")
+    if model.strip()
+]
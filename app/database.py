@@ -1,14 +1,64 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from app.config import DATABASE_URL
+from app.config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+)
 
-# Create database engine
-engine = create_engine(DATABASE_URL)
+
+def _pool_options(url: str) -> dict:
+    """Connection pool settings (SQLite's single-connection pools take none)."""
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,  # Drop connections before the server does
+        "pool_pre_ping": DB_POOL_PRE_PING,  # Detect connections closed by Postgres
+    }
+
+
+# Create database engine (sync: Celery tasks and threadpool handlers)
+engine = create_engine(DATABASE_URL, **_pool_options(DATABASE_URL))
 
 # Create session for database queries
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# ✅ Async engine (asyncpg) for `async def` handlers; has its own pool. Created
+# on first use so Celery workers and scripts don't need the async driver.
+_async_engine = None
+
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL, **_pool_options(ASYNC_DATABASE_URL)
+        )
+    return _async_engine
+
+
+async def dispose_async_engine():
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
+# Objects stay readable after commit, so handlers can release the connection early
+_async_sessionmaker = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def AsyncSessionLocal():
+    return _async_sessionmaker(bind=get_async_engine())
+
+
 # Base class for ORM models
 Base = declarative_base()
 
@@ -20,3 +70,24 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ✅ Pool usage of this process's engines (served at /health/db)
+def pool_stats() -> dict:
+    pools = [("sync", engine.pool)]
+    if _async_engine is not None:
+        pools.append(("async", _async_engine.sync_engine.pool))
+    stats = {}
+    for name, pool in pools:
+        stats[name] = {
+            "size": getattr(pool, "size", lambda: None)(),
+            "checked_out": getattr(pool, "checkedout", lambda: None)(),
+            "overflow": getattr(pool, "overflow", lambda: None)(),
+        }
+    return stats
+
+
+# ✅ Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,14 +1,52 @@
+import logging
 from fastapi import FastAPI
-from app.routers import resume, job, job_match, cover_letter, user
+from app.config import MODEL_WARMUP
+from app.routers import resume, job, job_match, cover_letter, user, health, task
+from app.routers import metrics
+from app.services.metrics import MetricsMiddleware
+from app.services.model_registry import warm_up, warm_up_in_background
+from app.services import llm
+from app.database import dispose_async_engine
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
+# ✅ Request latency, stage spans and the optional Server-Timing header
+app.add_middleware(MetricsMiddleware)
+
 # ✅ Include Routers
 app.include_router(user.router)
 app.include_router(resume.router)
 app.include_router(job.router)
 app.include_router(job_match.router)
 app.include_router(cover_letter.router)
+app.include_router(health.router)
+app.include_router(task.router)
+app.include_router(metrics.router)
+
+
+# ✅ Load ML models before serving traffic (MODEL_WARMUP=startup) or alongside it
+# (MODEL_WARMUP=background, with /health/ready reporting 503 until they are loaded)
+@app.on_event("startup")
+def warm_up_models():
+    if MODEL_WARMUP == "startup":
+        warm_up()
+    elif MODEL_WARMUP == "background":
+        warm_up_in_background()
+
+
+# ✅ Close pooled LLM HTTP connections
+@app.on_event("shutdown")
+async def close_llm_clients():
+    await llm.aclose()
+
+
+# ✅ Close pooled async database connections
+@app.on_event("shutdown")
+async def close_db_pool():
+    await dispose_async_engine()
+
 
 # ✅ Ensure Alembic is used for migrations in production
-print("🚀 FastAPI Server Running - Ensure Alembic migrations are applied!")
+logger.info("🚀 FastAPI Server Running - Ensure Alembic migrations are applied!")
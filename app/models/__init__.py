@@ -2,3 +2,5 @@ from app.models.user import User  # Ensure User is loaded first
 from app.models.job import Job
 from app.models.resume import Resume
 from app.models.cover_letter import CoverLetter
+from app.models.job_match import JobMatch
+from app.models.job_embedding import JobEmbedding
@@ -7,10 +7,14 @@ class CoverLetter(Base):
     __tablename__ = "cover_letters"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # Links to User
-    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)  # ✅ Links to Job
+    user_id = Column(
+        Integer, ForeignKey("users.id"), nullable=False, index=True
+    )  # Links to User
+    job_id = Column(
+        Integer, ForeignKey("jobs.id"), nullable=False, index=True
+    )  # ✅ Links to Job
     resume_id = Column(
-        Integer, ForeignKey("resumes.id"), nullable=False
+        Integer, ForeignKey("resumes.id"), nullable=False, index=True
     )  # ✅ Links to Resume
     content = Column(Text, nullable=False)
 
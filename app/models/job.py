@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, LargeBinary
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -9,8 +9,10 @@ class Job(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
+    description_hash = Column(String(64))  # ✅ Content hash of the embedded text
+    chunk_embeddings = Column(LargeBinary)  # float32 chunk vectors (chunked mode)
     user_id = Column(
-        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
 
     user = relationship("User", back_populates="jobs")
@@ -18,3 +20,6 @@ class Job(Base):
     cover_letters = relationship(
         "CoverLetter", back_populates="job", cascade="all, delete-orphan"
     )
+    job_matches = relationship(
+        "JobMatch", back_populates="job", cascade="all, delete-orphan"
+    )
@@ -0,0 +1,16 @@
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import Column, Integer, String, ForeignKey
+from app.config import EMBEDDING_DIM
+from app.database import Base
+
+
+class JobEmbedding(Base):
+    """Job vectors for VECTOR_STORE_BACKEND=pgvector (one row per job)."""
+
+    __tablename__ = "job_embeddings"
+
+    job_id = Column(
+        Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True
+    )
+    embedding = Column(Vector(EMBEDDING_DIM), nullable=False)
+    description_hash = Column(String(64))  # ✅ Content hash of the embedded text
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Float
+from sqlalchemy import Column, Integer, ForeignKey, Float, String, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -7,11 +7,24 @@ class JobMatch(Base):
     """Stores resume match scores for jobs."""
 
     __tablename__ = "job_matches"
+    # One score per pair (the conflict target of bulk upserts)
+    __table_args__ = (
+        UniqueConstraint("resume_id", "job_id", name="uq_job_matches_resume_job"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
-    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
+    resume_id = Column(
+        Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False
+    )
+    job_id = Column(
+        Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False, index=True
+    )  # resume_id is covered by the unique constraint above
     match_score = Column(Float, nullable=False)
 
+    # ✅ Content hashes the score was computed from (used for staleness checks)
+    resume_hash = Column(String(64))
+    job_hash = Column(String(64))
+
     # Relationship: A job match belongs to a resume and a job
     resume = relationship("Resume", back_populates="job_matches")
+    job = relationship("Job", back_populates="job_matches")
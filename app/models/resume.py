@@ -1,4 +1,13 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey
+from sqlalchemy import (
+    Column,
+    Integer,
+    Text,
+    ForeignKey,
+    String,
+    LargeBinary,
+    JSON,
+    Index,
+)
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -10,19 +19,54 @@ class Resume(Base):
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
-    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="SET NULL"), nullable=True)
+    job_id = Column(
+        Integer, ForeignKey("jobs.id", ondelete="SET NULL"), nullable=True, index=True
+    )
     parent_resume_id = Column(
-        Integer, ForeignKey("resumes.id"), nullable=True
+        Integer, ForeignKey("resumes.id"), nullable=True, index=True
     )  # ✅ Track AI-generated versions
     experience = Column(Text, nullable=False)
     improved_experience = Column(Text)
     summary_experience = Column(Text)
+    sections = Column(JSON)  # ✅ Parsed sections of `experience` (summary, skills, ...)
+    embedding = Column(LargeBinary)  # ✅ float32 vector of the matched text
+    embedding_hash = Column(String(64))  # Content hash of the embedded text
+    chunk_embeddings = Column(LargeBinary)  # float32 chunk vectors (chunked mode)
 
     user = relationship("User", back_populates="resumes")
     job = relationship("Job", back_populates="resumes")
     cover_letters = relationship(
         "CoverLetter", back_populates="resume", cascade="all, delete-orphan"
     )
+    job_matches = relationship(
+        "JobMatch", back_populates="resume", cascade="all, delete-orphan"
+    )
     parent_resume = relationship(
         "Resume", remote_side=[id]
     )  # ✅ Link to the original resume
+
+    __table_args__ = (
+        # ✅ A user's resumes, optionally for one job, newest first (cover letters)
+        Index("ix_resumes_user_id_job_id_id", user_id, job_id, id),
+        # ✅ A user's base (unlinked) resume
+        Index(
+            "ix_resumes_unlinked_user_id",
+            user_id,
+            postgresql_where=job_id.is_(None),
+            sqlite_where=job_id.is_(None),
+        ),
+    )
+
+
+# ✅ Columns served by the API (everything except the binary embedding blobs)
+RESPONSE_COLUMNS = (
+    Resume.id,
+    Resume.user_id,
+    Resume.job_id,
+    Resume.parent_resume_id,
+    Resume.experience,
+    Resume.improved_experience,
+    Resume.summary_experience,
+    Resume.sections,
+)
+LIST_COLUMNS = RESPONSE_COLUMNS[:4]  # Without the text columns
@@ -11,8 +11,10 @@ class User(Base):
     email = Column(String, unique=True, nullable=False)
     password = Column(String, nullable=False)
 
-    resumes = relationship("Resume", back_populates="user")
-    jobs = relationship("Job", back_populates="user")
+    resumes = relationship(
+        "Resume", back_populates="user", cascade="all, delete-orphan"
+    )
+    jobs = relationship("Job", back_populates="user", cascade="all, delete-orphan")
     cover_letters = relationship(
         "CoverLetter", back_populates="user", cascade="all, delete-orphan"
     )
@@ -1,42 +1,57 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, AsyncSessionLocal
 from app.models.job import Job  # ✅ Import Job
 from app.models.resume import Resume
 from app.models.cover_letter import CoverLetter
 from app.schemas.cover_letter import CoverLetterResponse
-from app.services.cover_letter import generate_cover_letter
+from app.services.cover_letter import agenerate_cover_letter, astream_cover_letter
+from app.services.streaming import stream_completion, sse_response
 
 router = APIRouter(prefix="/cover-letters", tags=["Cover Letters"])
 
 
-@router.post("/{user_id}/{job_id}/generate", response_model=CoverLetterResponse)
-def generate_cover_letter_for_job(
-    user_id: int,
-    job_id: int,
-    user_model: str = Query(None),
-    user_api_key: str = Query(None),
-    db: Session = Depends(get_db),
-):
-    """Generate a cover letter using the latest resume linked to the job"""
-    job = db.query(Job).filter(Job.id == job_id).first()  # ✅ Fetch job
-
+async def _load_job_and_resume(db: AsyncSession, user_id: int, job_id: int):
+    """The job and the user's latest resume linked to it (404 if either is missing)."""
+    job = await db.get(Job, job_id)  # ✅ Fetch job
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    latest_resume = (
-        db.query(Resume)
-        .filter(Resume.user_id == user_id, Resume.job_id == job_id)
+    latest_resume = await db.scalar(
+        select(Resume)
+        .where(Resume.user_id == user_id, Resume.job_id == job_id)
         .order_by(Resume.id.desc())
-        .first()
+        .limit(1)
     )
-
     if not latest_resume:
         raise HTTPException(status_code=404, detail="No resume linked to this job")
 
+    # ✅ Hand the connection back to the pool before the (slow) LLM call;
+    # the loaded rows stay readable
+    await db.close()
+    return job, latest_resume
+
+
+@router.post("/{user_id}/{job_id}/generate", response_model=CoverLetterResponse)
+async def generate_cover_letter_for_job(
+    user_id: int,
+    job_id: int,
+    user_model: str = Query(None),
+    user_api_key: str = Query(None),
+    no_cache: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Generate a cover letter using the latest resume linked to the job"""
+    job, latest_resume = await _load_job_and_resume(db, user_id, job_id)
+
     # ✅ Generate AI-powered cover letter
-    cover_letter_text = generate_cover_letter(
-        job.description, latest_resume.experience, user_model, user_api_key
+    cover_letter_text = await agenerate_cover_letter(
+        job.description,
+        latest_resume.experience,
+        user_model,
+        user_api_key,
+        bypass_cache=no_cache,
     )
 
     new_cover_letter = CoverLetter(
@@ -47,7 +62,47 @@ def generate_cover_letter_for_job(
     )
 
     db.add(new_cover_letter)
-    db.commit()
-    db.refresh(new_cover_letter)
+    await db.commit()
 
     return new_cover_letter
+
+
+# ✅ Cover letter with tokens streamed as Server-Sent Events
+@router.post("/{user_id}/{job_id}/generate/stream")
+async def generate_cover_letter_stream(
+    user_id: int,
+    job_id: int,
+    user_model: str = Query(None),
+    user_api_key: str = Query(None),
+    no_cache: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
+):
+    job, latest_resume = await _load_job_and_resume(db, user_id, job_id)
+    resume_id = latest_resume.id
+
+    async def persist(content: str) -> dict:
+        return await _save_cover_letter(user_id, job_id, resume_id, content)
+
+    chunks = astream_cover_letter(
+        job.description,
+        latest_resume.experience,
+        user_model,
+        user_api_key,
+        bypass_cache=no_cache,
+    )
+    return sse_response(stream_completion(chunks, persist))
+
+
+async def _save_cover_letter(
+    user_id: int, job_id: int, resume_id: int, content: str
+) -> dict:
+    """Persist a streamed cover letter (runs after the request's session is closed)."""
+    async with AsyncSessionLocal() as db:
+        new_cover_letter = CoverLetter(
+            user_id=user_id, job_id=job_id, resume_id=resume_id, content=content
+        )
+        db.add(new_cover_letter)
+        await db.commit()
+        return CoverLetterResponse.model_validate(
+            new_cover_letter, from_attributes=True
+        ).model_dump()
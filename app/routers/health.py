@@ -0,0 +1,35 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.services.model_registry import model_stats, readiness
+from app.services.inference import cache_stats
+from app.services.llm_cache import response_cache
+from app.database import pool_stats
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+# ✅ Model load metrics (load time, memory, device)
+@router.get("/models")
+def get_model_stats():
+    return model_stats()
+
+
+# ✅ Readiness probe: 503 until model warm-up has finished
+@router.get("/ready")
+def get_readiness():
+    status = readiness()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+# ✅ Summary / embedding / LLM response cache hit-miss counters
+@router.get("/cache")
+def get_cache_stats():
+    stats = cache_stats()
+    stats["llm"] = response_cache.stats() if response_cache else None
+    return stats
+
+
+# ✅ Database connection pool usage (sync + async engines of this worker)
+@router.get("/db")
+def get_db_pool_stats():
+    return pool_stats()
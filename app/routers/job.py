@@ -1,18 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.orm import Session, load_only, selectinload
+from app.config import PAGE_SIZE, MAX_PAGE_SIZE
 from app.database import get_db
 from app.models.job import Job
-from app.schemas.job import JobCreate, JobResponse
+from app.models.resume import RESPONSE_COLUMNS as RESUME_COLUMNS
+from app.schemas.job import (
+    JobCreate,
+    JobUpdate,
+    JobResponse,
+    JobTaskResponse,
+    JobPage,
+)
+from app.schemas.job_match import JobCandidatesResponse
 from app.models.user import User
-from app.services.job_matching import store_job  # ✅ Import ChromaDB function
+from app.services.job_matching import get_job_embedding
+from app.services.match_store import text_hash
+from app.services.resume_index import get_resume_matrix
+from app.tasks import store_job_task, delete_job_vectors_task
+from app.services.webhooks import callback_url_param
+from app.utils.pagination import keyset_page
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
 
-# ✅ Create a new job
-@router.post("/", response_model=JobResponse)
-def create_job(job: JobCreate, db: Session = Depends(get_db)):
+# ✅ Create a new job (embedding + match scores are computed in the background)
+@router.post("/", response_model=JobTaskResponse, status_code=202)
+def create_job(
+    job: JobCreate,
+    callback_url: str = Depends(callback_url_param),
+    db: Session = Depends(get_db),
+):
     if not job.user_id:
         raise HTTPException(
             status_code=400, detail="User ID is required and must be a valid integer."
@@ -30,16 +47,36 @@ def create_job(job: JobCreate, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(new_job)
 
-    # ✅ Store job description in ChromaDB
-    store_job(new_job.description, new_job.id)
+    # ✅ Queue vector storage and match precomputation
+    task = store_job_task.delay(new_job.id, callback_url=callback_url)
 
-    return new_job
+    response = JobResponse.model_validate(new_job).model_dump()
+    response.update(task_id=task.id, status_url=f"/tasks/{task.id}")
+    return response
 
 
-# ✅ Get all jobs
-@router.get("/", response_model=List[JobResponse])
-def get_all_jobs(db: Session = Depends(get_db)):
-    return db.query(Job).all()
+# ✅ List jobs one keyset page at a time (description / resumes with full=true)
+@router.get("/", response_model=JobPage, response_model_exclude_unset=True)
+def get_all_jobs(
+    cursor: int = Query(None),
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    user_id: int = Query(None),
+    full: bool = Query(False),
+    db: Session = Depends(get_db),
+):
+    if full:
+        # Linked resumes for the whole page in one extra query (no N+1)
+        query = db.query(Job).options(
+            load_only(Job.id, Job.title, Job.description, Job.user_id),
+            selectinload(Job.resumes).load_only(*RESUME_COLUMNS),
+        )
+    else:
+        query = db.query(Job.id, Job.title, Job.user_id)
+    if user_id is not None:
+        query = query.filter(Job.user_id == user_id)
+
+    jobs, next_cursor = keyset_page(query, Job.id, cursor, limit)
+    return {"items": jobs, "next_cursor": next_cursor}
 
 
 # ✅ Get a single job
@@ -49,3 +86,80 @@ def get_job(job_id: int, db: Session = Depends(get_db)):
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
+
+
+# ✅ Update a job (its vector is re-synced in the background)
+@router.put("/{job_id}", response_model=JobTaskResponse, status_code=202)
+def update_job(
+    job_id: int,
+    job_update: JobUpdate,
+    callback_url: str = Depends(callback_url_param),
+    db: Session = Depends(get_db),
+):
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    updates = job_update.dict(exclude_unset=True)
+    if "description" in updates:
+        job.description_hash = None  # Recomputed from the new text
+    for key, value in updates.items():
+        setattr(job, key, value)
+    db.commit()
+    db.refresh(job)
+
+    task = store_job_task.delay(job.id, callback_url=callback_url)
+
+    response = JobResponse.model_validate(job).model_dump()
+    response.update(task_id=task.id, status_url=f"/tasks/{task.id}")
+    return response
+
+
+# ✅ Delete a job and its stored vector
+@router.delete("/{job_id}")
+def delete_job(job_id: int, db: Session = Depends(get_db)):
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    db.delete(job)
+    db.commit()
+    delete_job_vectors_task.delay([job_id])
+    return {"message": "Job deleted successfully"}
+
+
+# ✅ Rank all stored resumes for a job in one vectorized pass
+@router.get("/{job_id}/candidates", response_model=JobCandidatesResponse)
+def get_job_candidates(
+    job_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=200),
+    min_score: float = Query(0.0, ge=-100, le=100),
+    db: Session = Depends(get_db),
+):
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    try:
+        job_embedding = get_job_embedding(job_id, text_hash(job.description))
+    except Exception:
+        raise HTTPException(
+            status_code=500, detail="Error retrieving job embedding from ChromaDB"
+        )
+    if job_embedding is None:
+        raise HTTPException(
+            status_code=404, detail="Job embedding not found in ChromaDB"
+        )
+
+    total, ranked = get_resume_matrix(db).rank(job_embedding, offset, limit, min_score)
+    return {
+        "job_id": job_id,
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "candidates": [
+            {"resume_id": resume_id, "user_id": user_id, "match_percentage": score}
+            for resume_id, user_id, score in ranked
+        ],
+    }
@@ -1,11 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.services.job_matching import match_resume_to_job
+from app.database import get_db, get_async_db, SessionLocal
+from app.services.job_matching import search_jobs
+from app.config import EMBEDDING_MODE
+from app.services.match_store import (
+    batch_match_scores,
+    explain_match,
+    get_match_score,
+    refresh_matches_for_resume,
+    refresh_resume_embedding,
+)
 from app.models.resume import Resume
 from app.models.job import Job
-from app.services.ai import optimize_resume_for_job
+from app.services.ai import aoptimize_resume_for_job, astream_optimize_resume_for_job
+from app.services.streaming import stream_completion, sse_response
+from app.utils.resume_sections import split_sections
 from app.schemas.resume import ResumeResponse
+from app.schemas.job_match import (
+    TopJobsResponse,
+    MatchExplanationResponse,
+    BatchMatchRequest,
+    BatchMatchResponse,
+)
 
 router = APIRouter(prefix="/job-match", tags=["Job Matching"])
 
@@ -19,10 +38,8 @@ def find_resume_match(resume_id: int, job_id: int, db: Session = Depends(get_db)
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
 
-    # Compute match percentage
-    match_percentage, error = match_resume_to_job(
-        resume.improved_experience or resume.experience, job_id, db
-    )
+    # ✅ Served from job_matches; recomputed only if resume or job changed
+    match_percentage, error = get_match_score(resume, job_id, db)
     if error:
         raise HTTPException(status_code=404, detail=error)
 
@@ -33,33 +50,197 @@ def find_resume_match(resume_id: int, job_id: int, db: Session = Depends(get_db)
     }
 
 
-@router.post("/{resume_id}/optimize/{job_id}", response_model=ResumeResponse)
-def generate_resume_for_job(resume_id: int, job_id: int, db: Session = Depends(get_db)):
-    """Create a job-specific resume if the match score is low."""
+# ✅ Resumes x jobs score matrix in one request
+@router.post("/batch", response_model=BatchMatchResponse)
+def batch_match(request: BatchMatchRequest, db: Session = Depends(get_db)):
+    """Score every listed resume against every listed job."""
+    try:
+        return batch_match_scores(
+            request.resume_ids, request.job_ids, db, persist=request.persist
+        )
+    except Exception:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Batch match failed")
+
+
+@router.get("/{resume_id}/explain/{job_id}", response_model=MatchExplanationResponse)
+def explain_resume_match(
+    resume_id: int,
+    job_id: int,
+    k: int = Query(3, ge=1, le=20),
+    db: Session = Depends(get_db),
+):
+    """Show the resume and job passages that contributed most to a match."""
+    if EMBEDDING_MODE != "chunked":
+        raise HTTPException(
+            status_code=400, detail="Match explanations need EMBEDDING_MODE=chunked"
+        )
+
+    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    match_percentage, error = get_match_score(resume, job_id, db)
+    if error:
+        raise HTTPException(status_code=404, detail=error)
+
     job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
+    pairs = explain_match(resume, job, top_n=k)
+    if pairs is None:
+        raise HTTPException(
+            status_code=409, detail="Chunk vectors are missing; re-store the job"
+        )
+
+    return {
+        "resume_id": resume_id,
+        "job_id": job_id,
+        "match_percentage": match_percentage,
+        "pairs": pairs,
+    }
+
+
+@router.get("/{resume_id}/top", response_model=TopJobsResponse)
+def recommend_jobs(
+    resume_id: int,
+    k: int = Query(10, ge=1, le=100),
+    user_id: int = Query(None),
+    title: str = Query(None),
+    keyword: str = Query(None),
+    db: Session = Depends(get_db),
+):
+    """Rank stored jobs for a resume with a single vector-index query."""
+    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    # ✅ Embed the resume once (reuses the stored embedding when unchanged)
+    try:
+        resume_embedding = refresh_resume_embedding(resume)
+        db.commit()
+    except Exception:
+        raise HTTPException(
+            status_code=500, detail="Failed to generate resume embedding"
+        )
+
+    try:
+        hits = search_jobs(
+            resume_embedding, k, user_id=user_id, title=title, keyword=keyword
+        )
+    except Exception:
+        raise HTTPException(status_code=500, detail="Job search failed")
+
+    # ✅ One query for the titles of all returned jobs
+    job_ids = [job_id for job_id, _ in hits]
+    titles = dict(db.query(Job.id, Job.title).filter(Job.id.in_(job_ids)).all())
+
+    return {
+        "resume_id": resume_id,
+        "jobs": [
+            {"job_id": job_id, "title": titles[job_id], "match_percentage": score}
+            for job_id, score in hits
+            if job_id in titles  # Skip vectors of jobs deleted from Postgres
+        ],
+    }
+
+
+async def _load_job_and_resume(db: AsyncSession, job_id: int, resume_id: int):
+    """(job description, parent resume experience, parent resume user_id)."""
+    job_description = await db.scalar(select(Job.description).where(Job.id == job_id))
+    if job_description is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    parent_resume = db.query(Resume).filter(Resume.id == resume_id).first()
-    if not parent_resume:
+    parent = (
+        await db.execute(
+            select(Resume.experience, Resume.user_id).where(Resume.id == resume_id)
+        )
+    ).first()
+    if parent is None:
         raise HTTPException(status_code=404, detail="Resume not found")
 
+    # ✅ Hand the connection back to the pool before the (slow) LLM call
+    await db.close()
+    return job_description, parent.experience, parent.user_id
+
+
+@router.post("/{resume_id}/optimize/{job_id}", response_model=ResumeResponse)
+async def generate_resume_for_job(
+    resume_id: int,
+    job_id: int,
+    user_model: str = Query(None),
+    user_api_key: str = Query(None),
+    no_cache: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Create a job-specific resume if the match score is low."""
+    job_description, experience, user_id = await _load_job_and_resume(
+        db, job_id, resume_id
+    )
+
     # ✅ Correct: Improve the resume using the job description!
-    improved_experience = optimize_resume_for_job(
-        resume_text=parent_resume.experience, job_description=job.description
+    improved_experience = await aoptimize_resume_for_job(
+        resume_text=experience,
+        job_description=job_description,
+        user_model=user_model,
+        user_api_key=user_api_key,
+        bypass_cache=no_cache,
     )
 
-    # ✅ Create a new resume linked to the job & parent resume
-    new_resume = Resume(
-        user_id=parent_resume.user_id,
-        job_id=job.id,
-        parent_resume_id=parent_resume.id,
-        experience=improved_experience,
-        improved_experience=improved_experience,
+    # ✅ New resume linked to the job & parent resume, with its embedding and
+    # precomputed match scores
+    return await run_in_threadpool(
+        _save_optimized_resume, user_id, job_id, resume_id, improved_experience
     )
 
-    db.add(new_resume)
-    db.commit()
-    db.refresh(new_resume)
 
-    return new_resume
+# ✅ Job-specific resume with tokens streamed as Server-Sent Events
+@router.post("/{resume_id}/optimize/{job_id}/stream")
+async def generate_resume_for_job_stream(
+    resume_id: int,
+    job_id: int,
+    user_model: str = Query(None),
+    user_api_key: str = Query(None),
+    no_cache: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
+):
+    job_description, experience, user_id = await _load_job_and_resume(
+        db, job_id, resume_id
+    )
+
+    async def persist(improved_experience: str) -> dict:
+        return await run_in_threadpool(
+            _save_optimized_resume, user_id, job_id, resume_id, improved_experience
+        )
+
+    chunks = astream_optimize_resume_for_job(
+        experience,
+        job_description,
+        user_model,
+        user_api_key,
+        bypass_cache=no_cache,
+    )
+    return sse_response(stream_completion(chunks, persist))
+
+
+def _save_optimized_resume(
+    user_id: int, job_id: int, parent_resume_id: int, improved_experience: str
+) -> dict:
+    """Persist a streamed job-specific resume as a new version."""
+    db = SessionLocal()
+    try:
+        new_resume = Resume(
+            user_id=user_id,
+            job_id=job_id,
+            parent_resume_id=parent_resume_id,
+            experience=improved_experience,
+            improved_experience=improved_experience,
+            sections=split_sections(improved_experience),
+        )
+        db.add(new_resume)
+        db.commit()
+        db.refresh(new_resume)
+
+        refresh_matches_for_resume(new_resume, db)
+        db.refresh(new_resume)
+        return ResumeResponse.model_validate(new_resume).model_dump()
+    finally:
+        db.close()
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+from app.services.metrics import metrics_payload
+
+router = APIRouter(tags=["Metrics"])
+
+
+# ✅ Prometheus scrape endpoint (request latency and per-stage histograms)
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    body, content_type = metrics_payload()
+    return Response(body, media_type=content_type)
@@ -1,16 +1,48 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile
-from app.utils.pdf_parser import extract_experience_from_pdf
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
 from typing import List
-from app.database import get_db
-from app.models.resume import Resume
-from app.schemas.resume import ResumeCreate, ResumeUpdate, ResumeResponse
-from app.services.ai import improve_resume, summarize_experience
+from app.config import PAGE_SIZE, MAX_PAGE_SIZE
+from app.database import get_db, get_async_db, SessionLocal
+from app.models.resume import Resume, RESPONSE_COLUMNS, LIST_COLUMNS
+from app.schemas.resume import (
+    ResumeCreate,
+    ResumeUpdate,
+    ResumeResponse,
+    ResumePage,
+    BulkUploadResponse,
+)
+from app.schemas.task import TaskResponse
+from app.routers.task import task_response
+from app.tasks import improve_resume_task, embed_resumes_task
+from app.services.ai import (
+    astream_improve_resume,
+    summarize_experience,
+    resume_summary_input,
+)
+from app.services.streaming import stream_completion, sse_response
+from app.services.task_secrets import encrypt_secret
+from app.services.webhooks import callback_url_param
+from app.services.ingestion import (
+    read_upload,
+    is_pdf,
+    extract_experience,
+    collect_bulk_files,
+    extract_many,
+)
+from app.services.match_store import refresh_matches_for_resume
+from app.utils.resume_sections import split_sections
+from app.utils.pagination import keyset_page
 from app.models.user import User
 from app.models.job import Job
 
 router = APIRouter(prefix="/resumes", tags=["Resumes"])
 
+logger = logging.getLogger(__name__)
+
 
 # ✅ Create a new resume
 @router.post("/", response_model=ResumeResponse)
@@ -23,23 +55,29 @@ def create_resume(resume: ResumeCreate, db: Session = Depends(get_db)):
         )
 
     # ✅ Create the resume only if user exists
-    new_resume = Resume(**resume.dict())
+    new_resume = Resume(**resume.dict(), sections=split_sections(resume.experience))
     db.add(new_resume)
     db.commit()
     db.refresh(new_resume)
+
+    # ✅ Store the embedding and precompute match scores
+    refresh_matches_for_resume(new_resume, db)
     return new_resume
 
 
 # ✅ Upload a resume and store it in the database
 @router.post("/upload-resume/{user_id}", response_model=ResumeResponse)
 async def upload_resume(
-    user_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)
+    user_id: int,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Upload a resume PDF, extract experience, and store in the database"""
 
     # ✅ Check if user exists
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    exists = await db.scalar(select(User.id).where(User.id == user_id))
+    await db.close()  # ✅ No connection is held while the PDF is parsed
+    if not exists:
         raise HTTPException(
             status_code=400, detail=f"User with id {user_id} does not exist."
         )
@@ -48,59 +86,227 @@ async def upload_resume(
     if not file.filename.endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
-    # ✅ Save file temporarily
-    file_path = f"/tmp/{file.filename}"
-    with open(file_path, "wb") as buffer:
-        buffer.write(file.file.read())
+    # ✅ Stream the upload into memory (size-capped, no temp file on disk)
+    data = await read_upload(file)
+    if not is_pdf(data):
+        raise HTTPException(status_code=400, detail="Uploaded file is not a valid PDF")
 
-    # ✅ Extract experience from the PDF
-    extracted_experience = extract_experience_from_pdf(file_path)
+    # ✅ Extract experience from the PDF off the event loop
+    try:
+        extracted_experience = await extract_experience(data)
+    except TimeoutError:
+        raise HTTPException(status_code=422, detail="The PDF took too long to parse")
+    except Exception:
+        raise HTTPException(status_code=400, detail="Could not read the PDF file")
 
     # ✅ Store resume in DB
-    new_resume = Resume(user_id=user_id, experience=extracted_experience)
+    new_resume = Resume(
+        user_id=user_id,
+        experience=extracted_experience,
+        sections=split_sections(extracted_experience),
+    )
     db.add(new_resume)
-    db.commit()
-    db.refresh(new_resume)
+    await db.commit()
+    await db.close()
+
+    # ✅ Store the embedding and precompute match scores
+    await run_in_threadpool(_refresh_resume_matches, new_resume.id)
 
     return new_resume
 
 
-# ✅ Get all resumes for a user
-@router.get("/user/{user_id}", response_model=List[ResumeResponse])
-def get_user_resumes(user_id: int, db: Session = Depends(get_db)):
-    return db.query(Resume).filter(Resume.user_id == user_id).all()
+def _refresh_resume_matches(resume_id: int):
+    """Embed a stored resume and score it (sync session, runs in the threadpool)."""
+    db = SessionLocal()
+    try:
+        resume = db.query(Resume).filter(Resume.id == resume_id).first()
+        if resume:
+            refresh_matches_for_resume(resume, db)
+    finally:
+        db.close()
+
+
+# ✅ Bulk upload: a multipart batch of PDFs and/or zip archives of PDFs
+@router.post(
+    "/bulk-upload/{user_id}", response_model=BulkUploadResponse, status_code=202
+)
+async def bulk_upload_resumes(
+    user_id: int,
+    files: List[UploadFile] = File(...),
+    callback_url: str = Depends(callback_url_param),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Extract many resumes in parallel, insert them at once, queue embeddings"""
+
+    exists = await db.scalar(select(User.id).where(User.id == user_id))
+    await db.close()  # ✅ No connection is held while the files are parsed
+    if not exists:
+        raise HTTPException(
+            status_code=400, detail=f"User with id {user_id} does not exist."
+        )
+
+    # ✅ Parse every PDF across the process pool
+    documents = await collect_bulk_files(files)
+    extracted = await extract_many(documents)
+
+    # ✅ One multi-row INSERT ... RETURNING for all successfully parsed files
+    parsed = [(name, text) for name, text, error in extracted if error is None]
+    resume_ids = []
+    if parsed:
+        rows = await run_in_threadpool(_bulk_resume_rows, user_id, parsed)
+        resume_ids = (
+            await db.scalars(
+                insert(Resume).returning(Resume.id, sort_by_parameter_order=True),
+                rows,
+            )
+        ).all()
+        await db.commit()
+        await db.close()
+
+    ids_by_file = iter(resume_ids)
+    results = [
+        (
+            {"filename": name, "status": "created", "resume_id": next(ids_by_file)}
+            if error is None
+            else {"filename": name, "status": "failed", "detail": error}
+        )
+        for name, _, error in extracted
+    ]
+
+    response = {
+        "created": len(resume_ids),
+        "failed": len(results) - len(resume_ids),
+        "results": results,
+    }
+    # ✅ Summaries, embeddings and match scores run as one batch job
+    if resume_ids:
+        task = await run_in_threadpool(
+            embed_resumes_task.delay, list(resume_ids), callback_url=callback_url
+        )
+        response.update(task_id=task.id, status_url=f"/tasks/{task.id}")
+    return response
+
+
+def _bulk_resume_rows(user_id: int, parsed: list) -> list:
+    """INSERT rows for [(filename, text)], sections included (CPU-bound)."""
+    return [
+        {"user_id": user_id, "experience": text, "sections": split_sections(text)}
+        for _, text in parsed
+    ]
+
+
+# ✅ Get a user's resumes one keyset page at a time (text columns with full=true)
+@router.get(
+    "/user/{user_id}", response_model=ResumePage, response_model_exclude_unset=True
+)
+def get_user_resumes(
+    user_id: int,
+    cursor: int = Query(None),
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    full: bool = Query(False),
+    db: Session = Depends(get_db),
+):
+    if full:
+        query = db.query(Resume).options(load_only(*RESPONSE_COLUMNS))
+    else:
+        query = db.query(*LIST_COLUMNS)
+    query = query.filter(Resume.user_id == user_id)
+
+    resumes, next_cursor = keyset_page(query, Resume.id, cursor, limit)
+    return {"items": resumes, "next_cursor": next_cursor}
 
 
 # ✅ Get a single resume by ID
 @router.get("/{resume_id}", response_model=ResumeResponse)
-def get_resume(resume_id: int, db: Session = Depends(get_db)):
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+async def get_resume(resume_id: int, db: AsyncSession = Depends(get_async_db)):
+    query = select(Resume).options(load_only(*RESPONSE_COLUMNS))
+    resume = await db.scalar(query.where(Resume.id == resume_id))
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     return resume
 
 
 # ✅ Improve resume experience (AI-powered)
-@router.post("/{resume_id}/improve", response_model=ResumeResponse)
-def improve_resume_endpoint(
+@router.post("/{resume_id}/improve", response_model=TaskResponse, status_code=202)
+async def improve_resume_endpoint(
     resume_id: int,
     user_model: str = Query(None),
     user_api_key: str = Query(None),
-    db: Session = Depends(get_db),
+    no_cache: bool = Query(False),
+    callback_url: str = Depends(callback_url_param),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
-    if not resume:
+    exists = await db.scalar(select(Resume.id).where(Resume.id == resume_id))
+    await db.close()  # ✅ No connection is held while the task is queued
+    if not exists:
         raise HTTPException(status_code=404, detail="Resume not found")
+    try:
+        encrypted_api_key = encrypt_secret(user_api_key)  # ✅ Never plaintext in Redis
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # ✅ LLM call, summarization and re-embedding run on the llm worker queue
+    task = await run_in_threadpool(
+        improve_resume_task.delay,
+        resume_id,
+        user_model=user_model,
+        encrypted_api_key=encrypted_api_key,
+        no_cache=no_cache,
+        callback_url=callback_url,
+    )
+    return task_response(task.id)
 
-    improved_text = improve_resume(resume.experience, user_model, user_api_key)
-    summary_text = summarize_experience(improved_text)
 
-    resume.improved_experience = improved_text
-    resume.summary_experience = summary_text
-    db.commit()
-    db.refresh(resume)
+# ✅ Improve resume with tokens streamed as Server-Sent Events
+@router.post("/{resume_id}/improve/stream")
+async def improve_resume_stream(
+    resume_id: int,
+    user_model: str = Query(None),
+    user_api_key: str = Query(None),
+    no_cache: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
+):
+    experience = await db.scalar(
+        select(Resume.experience).where(Resume.id == resume_id)
+    )
+    await db.close()  # ✅ Released before the LLM stream starts
+    if experience is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    async def persist(improved_text: str) -> dict:
+        return await run_in_threadpool(_save_improved_resume, resume_id, improved_text)
+
+    chunks = astream_improve_resume(
+        experience, user_model, user_api_key, bypass_cache=no_cache
+    )
+    return sse_response(stream_completion(chunks, persist))
 
-    return resume
+
+def _save_improved_resume(resume_id: int, improved_text: str) -> dict:
+    """Persist a streamed improvement (runs after the request's session is closed)."""
+    db = SessionLocal()
+    try:
+        resume = db.query(Resume).filter(Resume.id == resume_id).first()
+        if not resume:
+            return {"detail": "Resume not found"}
+
+        resume.improved_experience = improved_text
+        db.commit()
+
+        try:
+            resume.summary_experience = summarize_experience(
+                resume_summary_input(improved_text)
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Error summarizing improved resume {resume_id}: {e}")
+
+        refresh_matches_for_resume(resume, db)
+        db.refresh(resume)
+        return ResumeResponse.model_validate(resume).model_dump()
+    finally:
+        db.close()
 
 
 # ✅ Update resume manually
@@ -112,10 +318,17 @@ def update_resume(
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
 
-    for key, value in updated_resume.dict(exclude_unset=True).items():
+    changes = updated_resume.dict(exclude_unset=True)
+    for key, value in changes.items():
         setattr(resume, key, value)
+    if "experience" in changes:
+        resume.sections = split_sections(resume.experience)
 
     db.commit()
+
+    # ✅ Matched text changed: re-embed and refresh match scores
+    if "experience" in changes or "improved_experience" in changes:
+        refresh_matches_for_resume(resume, db)
     db.refresh(resume)
     return resume
 
@@ -0,0 +1,26 @@
+from fastapi import APIRouter
+from app.schemas.task import TaskResponse
+from app.worker import celery_app
+
+router = APIRouter(prefix="/tasks", tags=["Tasks"])
+
+
+def task_response(task_id: str) -> dict:
+    """Current state of a background task (unknown ids report PENDING)."""
+    result = celery_app.AsyncResult(task_id)
+    response = {
+        "task_id": task_id,
+        "status": result.status,
+        "status_url": f"/tasks/{task_id}",
+    }
+    if result.successful():
+        response["result"] = result.result
+    elif result.failed():
+        response["error"] = str(result.result)
+    return response
+
+
+# ✅ Poll a background task
+@router.get("/{task_id}", response_model=TaskResponse)
+def get_task(task_id: str):
+    return task_response(task_id)
@@ -1,29 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.config import PAGE_SIZE, MAX_PAGE_SIZE
+from app.database import get_db, get_async_db
 from app.models.user import User
-from app.schemas.user import UserCreate, UserResponse, UserUpdate
-from passlib.context import CryptContext
+from app.models.job import Job
+from app.schemas.user import (
+    UserCreate,
+    UserResponse,
+    UserUpdate,
+    UserPage,
+    UserLogin,
+)
+from app.services.passwords import ahash_password, averify_password
+from app.tasks import delete_job_vectors_task
+from app.utils.pagination import keyset_page
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
 
 # ✅ Create a new user
 @router.post("/", response_model=UserResponse)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # Check if the email already exists
-    existing_user = db.query(User).filter(User.email == user.email).first()
+    existing_user = await db.scalar(select(User.id).where(User.email == user.email))
     if existing_user:
         raise HTTPException(status_code=400, detail="Email is already registered")
+    await db.close()  # ✅ Don't hold a connection while bcrypt runs
 
-    # Hash the password before storing it
-    hashed_password = hash_password(user.password)
+    # Hash the password before storing it (on the dedicated bcrypt pool)
+    hashed_password = await ahash_password(user.password)
 
     new_user = User(
         email=user.email,
@@ -32,11 +39,31 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
     return new_user
 
 
+# ✅ Verify a user's credentials
+@router.post("/login", response_model=UserResponse)
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(select(User).where(User.email == credentials.email))
+    await db.close()  # ✅ Don't hold a connection while bcrypt runs
+
+    valid, new_hash = await averify_password(
+        credentials.password, user.password if user else None
+    )
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+
+    # ✅ Stored with an outdated cost: upgrade the hash transparently
+    if new_hash:
+        await db.execute(
+            update(User).where(User.id == user.id).values(password=new_hash)
+        )
+        await db.commit()
+    return user
+
+
 # ✅ Get user by ID
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(user_id: int, db: Session = Depends(get_db)):
@@ -46,24 +73,38 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
     return user
 
 
-# ✅ Get all users
-@router.get("/", response_model=list[UserResponse])
-def get_users(db: Session = Depends(get_db)):
-    return db.query(User).all()
+# ✅ List users one keyset page at a time (password hashes are never loaded)
+@router.get("/", response_model=UserPage)
+def get_users(
+    cursor: int = Query(None),
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    query = db.query(User.id, User.email, User.name)
+    users, next_cursor = keyset_page(query, User.id, cursor, limit)
+    return {"items": users, "next_cursor": next_cursor}
 
 
 # ✅ Update user
 @router.put("/{user_id}", response_model=UserResponse)
-def update_user(user_id: int, user_update: UserUpdate, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def update_user(
+    user_id: int, user_update: UserUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    updates = user_update.dict(exclude_unset=True)
+    if updates.get("password") is None:
+        updates.pop("password", None)
+    else:
+        # ✅ Never store the plain password
+        updates["password"] = await ahash_password(updates["password"])
+
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    for key, value in user_update.dict(exclude_unset=True).items():
+    for key, value in updates.items():
         setattr(user, key, value)
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     return user
 
 
@@ -74,6 +115,11 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    # ✅ Jobs and resumes are deleted with the user; drop the job vectors too
+    job_ids = [job_id for (job_id,) in db.query(Job.id).filter(Job.user_id == user_id)]
+
     db.delete(user)
     db.commit()
+    if job_ids:
+        delete_job_vectors_task.delay(job_ids)
     return {"message": "User deleted successfully"}
@@ -16,6 +16,12 @@ class JobCreate(BaseModel):
     user_id: int
 
 
+# ✅ Job Update Schema (re-embedded only if the description changes)
+class JobUpdate(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+
+
 # ✅ Job Response Schema (returns job + resumes linked to it)
 class JobResponse(JobBase):
     id: int
@@ -23,3 +29,27 @@ class JobResponse(JobBase):
 
     class Config:
         from_attributes = True  # ✅ SQLAlchemy conversion
+
+
+# ✅ Job list item (description / resumes only with `full=true`)
+class JobListItem(BaseModel):
+    id: int
+    title: str
+    user_id: int
+    description: Optional[str] = None
+    resumes: Optional[List[ResumeResponse]] = None
+
+    class Config:
+        from_attributes = True
+
+
+# ✅ One page of jobs (keyset pagination)
+class JobPage(BaseModel):
+    items: List[JobListItem]
+    next_cursor: Optional[int] = None  # Pass as `cursor` for the next page
+
+
+# ✅ Job creation response (embedding runs as a background task)
+class JobTaskResponse(JobResponse):
+    task_id: str
+    status_url: str
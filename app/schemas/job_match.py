@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.config import BATCH_MATCH_MAX_IDS
 
 
 # ✅ Schema for Resume-Job Match Response
@@ -6,3 +8,64 @@ class ResumeJobMatchResponse(BaseModel):
     resume_id: int
     job_id: int
     match_percentage: float
+
+
+# ✅ One ranked job in a top-k recommendation
+class JobRecommendation(BaseModel):
+    job_id: int
+    title: Optional[str] = None
+    match_percentage: float
+
+
+# ✅ Schema for Top-K Job Recommendation Response
+class TopJobsResponse(BaseModel):
+    resume_id: int
+    jobs: List[JobRecommendation]
+
+
+# ✅ One ranked resume for a job
+class CandidateMatch(BaseModel):
+    resume_id: int
+    user_id: int
+    match_percentage: float
+
+
+# ✅ Schema for the Best-Candidates-for-a-Job Response
+class JobCandidatesResponse(BaseModel):
+    job_id: int
+    total: int  # Resumes scoring at or above min_score
+    offset: int
+    limit: int
+    candidates: List[CandidateMatch]
+
+
+# ✅ One pair of matching resume / job chunks
+class ChunkMatch(BaseModel):
+    resume_chunk: str
+    job_chunk: str
+    similarity: float
+
+
+# ✅ Schema for a Chunk-Level Match Explanation
+class MatchExplanationResponse(BaseModel):
+    resume_id: int
+    job_id: int
+    match_percentage: float
+    pairs: List[ChunkMatch]
+
+
+# ✅ Schema for a Resumes x Jobs Batch Match Request
+class BatchMatchRequest(BaseModel):
+    resume_ids: List[int] = Field(..., min_length=1, max_length=BATCH_MATCH_MAX_IDS)
+    job_ids: List[int] = Field(..., min_length=1, max_length=BATCH_MATCH_MAX_IDS)
+    persist: bool = False  # Also upsert the scores into job_matches
+
+
+# ✅ Schema for a Batch Match Response (scores[i][j]: resume_ids[i] vs job_ids[j])
+class BatchMatchResponse(BaseModel):
+    resume_ids: List[int]
+    job_ids: List[int]
+    scores: List[List[Optional[float]]]  # None: the job has no stored vector
+    missing_resume_ids: List[int] = []
+    missing_job_ids: List[int] = []
+    unembedded_job_ids: List[int] = []
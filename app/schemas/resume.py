@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class ResumeBase(BaseModel):
@@ -27,6 +27,45 @@ class ResumeUpdate(BaseModel):
 class ResumeResponse(ResumeBase):
     id: int
     user_id: int
+    sections: Optional[Dict[str, str]] = None
 
     class Config:
         from_attributes = True
+
+
+class ResumeListItem(BaseModel):
+    """List view: text columns are only included with `full=true`"""
+
+    id: int
+    user_id: int
+    job_id: Optional[int] = None
+    parent_resume_id: Optional[int] = None
+    experience: Optional[str] = None
+    improved_experience: Optional[str] = None
+    summary_experience: Optional[str] = None
+    sections: Optional[Dict[str, str]] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ResumePage(BaseModel):
+    items: List[ResumeListItem]
+    next_cursor: Optional[int] = None  # Pass as `cursor` for the next page
+
+
+class BulkUploadItem(BaseModel):
+    """Per-file outcome of a bulk upload"""
+
+    filename: str
+    status: str  # "created" or "failed"
+    resume_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class BulkUploadResponse(BaseModel):
+    created: int
+    failed: int
+    task_id: Optional[str] = None  # Batch summary/embedding job
+    status_url: Optional[str] = None
+    results: List[BulkUploadItem]
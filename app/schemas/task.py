@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Any, Optional
+
+
+# ✅ Background task status
+class TaskResponse(BaseModel):
+    task_id: str
+    status: str  # PENDING, STARTED, RETRY, SUCCESS or FAILURE
+    status_url: str
+    result: Optional[Any] = None
+    error: Optional[str] = None
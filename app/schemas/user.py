@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import List, Optional
 
 
 # ✅ User creation schema
@@ -19,8 +19,20 @@ class UserResponse(BaseModel):
         from_attributes = True  # Pydantic v2 compatibility
 
 
+# ✅ Login schema
+class UserLogin(BaseModel):
+    email: EmailStr
+    password: str
+
+
 # ✅ User update schema (allows partial updates)
 class UserUpdate(BaseModel):
     email: Optional[EmailStr] = None
     name: Optional[str] = None
     password: Optional[str] = None
+
+
+# ✅ One page of users (keyset pagination)
+class UserPage(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[int] = None  # Pass as `cursor` for the next page
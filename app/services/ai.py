@@ -1,59 +1,121 @@
-import os
-from transformers import pipeline
-from langchain_community.chat_models import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
+from app.services.inference import summarize, summarize_many
+from app.services.llm import invoke_chain, ainvoke_chain, astream_chain
+from app.utils.resume_sections import split_sections, matching_text
 
-# Default AI Model (Qwen Free)
-DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "qwen/qwen2.5-vl-72b-instruct:free")
-DEFAULT_API_KEY = os.getenv("DEFAULT_API_KEY", "")  # Optional: Store in .env
+# ✅ Prompt templates
+# Bump a version whenever its prompt changes: versions key the LLM response cache.
+# Prompts are (role, template) messages; `llm.get_prompt` builds the LangChain
+# template on first use so importing this module does not pull in LangChain.
+IMPROVE_RESUME_PROMPT_VERSION = "improve_resume:v1"
+OPTIMIZE_RESUME_PROMPT_VERSION = "optimize_resume:v1"
+
+IMPROVE_RESUME_PROMPT = (
+    (
+        "system",
+        "You are an AI resume optimizer. "
+        "Your task is to take an input resume and improve it while maintaining the original structure, formatting, and sectioning. "
+        "The output should be a complete and professional resume in markdown format, without any extra explanations, questions, or placeholders. "
+        "Only return the final resume.",
+    ),
+    (
+        "human",
+        "Improve this resume while keeping proper sectioning and structure:\n{resume_text}\n\n"
+        "Ensure the resume has a clear Markdown format, structured sections (such as **Summary, Experience, Education, Skills, Projects**), "
+        "and is well-formatted without any additional text, comments, or requests for more details.",
+    ),
+)
+
+OPTIMIZE_RESUME_PROMPT = (
+    (
+        "system",
+        "You are an AI resume optimizer specializing in tailoring resumes for specific jobs. "
+        "Your task is to enhance an input resume so that it better aligns with the given job description, "
+        "while maintaining the resume's original structure and formatting. "
+        "Ensure the final output is in professional Markdown format and requires no additional modifications.",
+    ),
+    (
+        "human",
+        "Here is a resume that needs to be improved for a job:\n\n"
+        "**Job Description:**\n{job_description}\n\n"
+        "**Current Resume:**\n{resume_text}\n\n"
+        "Improve the resume so it is highly relevant to the job, keeping its structure (such as **Summary, Experience, Education, Skills, Projects**), "
+        "and formatting intact. The output should be a fully improved Markdown resume with no extra explanations, questions, or placeholders.",
+    ),
+)
 
 
 # ✅ Improve Resume Using OpenRouter via LangChain
 def improve_resume(
-    resume_text: str, user_model: str = None, user_api_key: str = None
+    resume_text: str,
+    user_model: str = None,
+    user_api_key: str = None,
+    bypass_cache: bool = False,
 ) -> str:
     """Improve resume experience using OpenRouter AI."""
-    model = user_model or DEFAULT_MODEL
-    api_key = user_api_key or DEFAULT_API_KEY
-
-    llm = ChatOpenAI(
-        model=model,
-        openai_api_key=api_key,
-        openai_api_base="https://openrouter.ai/api/v1",
+    return invoke_chain(
+        IMPROVE_RESUME_PROMPT,
+        {"resume_text": resume_text},
+        user_model,
+        user_api_key,
+        template=IMPROVE_RESUME_PROMPT_VERSION,
+        bypass_cache=bypass_cache,
     )
 
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                "You are an AI resume optimizer. "
-                "Your task is to take an input resume and improve it while maintaining the original structure, formatting, and sectioning. "
-                "The output should be a complete and professional resume in markdown format, without any extra explanations, questions, or placeholders. "
-                "Only return the final resume.",
-            ),
-            (
-                "human",
-                "Improve this resume while keeping proper sectioning and structure:\n{resume_text}\n\n"
-                "Ensure the resume has a clear Markdown format, structured sections (such as **Summary, Experience, Education, Skills, Projects**), "
-                "and is well-formatted without any additional text, comments, or requests for more details.",
-            ),
-        ]
+
+async def aimprove_resume(
+    resume_text: str,
+    user_model: str = None,
+    user_api_key: str = None,
+    bypass_cache: bool = False,
+) -> str:
+    """Async variant of `improve_resume` (pooled connection, no worker thread)."""
+    return await ainvoke_chain(
+        IMPROVE_RESUME_PROMPT,
+        {"resume_text": resume_text},
+        user_model,
+        user_api_key,
+        template=IMPROVE_RESUME_PROMPT_VERSION,
+        bypass_cache=bypass_cache,
     )
 
-    chain = prompt | llm
-    response = chain.invoke({"resume_text": resume_text})
 
-    return response.content if hasattr(response, "content") else str(response)
+def astream_improve_resume(
+    resume_text: str,
+    user_model: str = None,
+    user_api_key: str = None,
+    bypass_cache: bool = False,
+):
+    """Stream the improved resume token by token."""
+    return astream_chain(
+        IMPROVE_RESUME_PROMPT,
+        {"resume_text": resume_text},
+        user_model,
+        user_api_key,
+        template=IMPROVE_RESUME_PROMPT_VERSION,
+        bypass_cache=bypass_cache,
+    )
 
 
 # ✅ Summarize Experience Using Hugging Face
+SUMMARY_INPUT_CHARS = 1024  # Ensure within model limits
+
+
 def summarize_experience(resume_text: str) -> str:
     """Summarize experience using a pre-trained summarization model."""
-    summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
-    max_length = 1024
-    resume_text = resume_text[:max_length]  # Ensure within model limits
-    summary = summarizer(resume_text, max_length=150, min_length=50, do_sample=False)
-    return summary[0]["summary_text"]
+    resume_text = resume_text[:SUMMARY_INPUT_CHARS]
+    return summarize(resume_text)  # ✅ Micro-batched with concurrent requests
+
+
+def summarize_experiences(texts: list) -> list:
+    """Summarize many texts in one batched pass (bulk jobs)."""
+    return summarize_many([text[:SUMMARY_INPUT_CHARS] for text in texts])
+
+
+def resume_summary_input(resume_text: str, sections: dict = None) -> str:
+    """The relevant resume sections, fitted to the summarizer's input budget."""
+    if sections is None:
+        sections = split_sections(resume_text)
+    return matching_text(sections, SUMMARY_INPUT_CHARS, fallback=resume_text)
 
 
 # ✅ New Function for Job-Specific Resume Improvement
@@ -62,40 +124,50 @@ def optimize_resume_for_job(
     job_description: str,
     user_model: str = None,
     user_api_key: str = None,
+    bypass_cache: bool = False,
 ) -> str:
     """Optimize an existing resume to better match a job description using OpenRouter AI."""
-    model = user_model or DEFAULT_MODEL
-    api_key = user_api_key or DEFAULT_API_KEY
-
-    llm = ChatOpenAI(
-        model=model,
-        openai_api_key=api_key,
-        openai_api_base="https://openrouter.ai/api/v1",
+    return invoke_chain(
+        OPTIMIZE_RESUME_PROMPT,
+        {"resume_text": resume_text, "job_description": job_description},
+        user_model,
+        user_api_key,
+        template=OPTIMIZE_RESUME_PROMPT_VERSION,
+        bypass_cache=bypass_cache,
     )
 
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                "You are an AI resume optimizer specializing in tailoring resumes for specific jobs. "
-                "Your task is to enhance an input resume so that it better aligns with the given job description, "
-                "while maintaining the resume's original structure and formatting. "
-                "Ensure the final output is in professional Markdown format and requires no additional modifications.",
-            ),
-            (
-                "human",
-                "Here is a resume that needs to be improved for a job:\n\n"
-                "**Job Description:**\n{job_description}\n\n"
-                "**Current Resume:**\n{resume_text}\n\n"
-                "Improve the resume so it is highly relevant to the job, keeping its structure (such as **Summary, Experience, Education, Skills, Projects**), "
-                "and formatting intact. The output should be a fully improved Markdown resume with no extra explanations, questions, or placeholders.",
-            ),
-        ]
-    )
 
-    chain = prompt | llm
-    response = chain.invoke(
-        {"resume_text": resume_text, "job_description": job_description}
+async def aoptimize_resume_for_job(
+    resume_text: str,
+    job_description: str,
+    user_model: str = None,
+    user_api_key: str = None,
+    bypass_cache: bool = False,
+) -> str:
+    """Async variant of `optimize_resume_for_job`."""
+    return await ainvoke_chain(
+        OPTIMIZE_RESUME_PROMPT,
+        {"resume_text": resume_text, "job_description": job_description},
+        user_model,
+        user_api_key,
+        template=OPTIMIZE_RESUME_PROMPT_VERSION,
+        bypass_cache=bypass_cache,
     )
 
-    return response.content if hasattr(response, "content") else str(response)
+
+def astream_optimize_resume_for_job(
+    resume_text: str,
+    job_description: str,
+    user_model: str = None,
+    user_api_key: str = None,
+    bypass_cache: bool = False,
+):
+    """Stream the job-optimized resume token by token."""
+    return astream_chain(
+        OPTIMIZE_RESUME_PROMPT,
+        {"resume_text": resume_text, "job_description": job_description},
+        user_model,
+        user_api_key,
+        template=OPTIMIZE_RESUME_PROMPT_VERSION,
+        bypass_cache=bypass_cache,
+    )
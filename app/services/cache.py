@@ -0,0 +1,181 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from app.config import (
+    REDIS_URL,
+    CACHE_MAX_ENTRIES,
+    CACHE_BACKEND,
+    CACHE_DIR,
+    CACHE_DISK_MAX_ENTRIES,
+    CACHE_TTL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so cosmetic differences hit the same cache entry."""
+    return " ".join(text.split())
+
+
+def content_hash(model_name: str, text: str) -> str:
+    """Cache key: SHA-256 of the model name plus the normalized text."""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# ✅ Second-tier backends (shared across processes / restarts)
+class RedisTier:
+    def __init__(self, url: str, ttl_seconds: int):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str):
+        raw = self.client.get(key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value):
+        # Size is bounded by the TTL plus the server's maxmemory eviction policy
+        self.client.set(key, json.dumps(value), ex=self.ttl_seconds or None)
+
+
+class DiskTier:
+    def __init__(self, directory: str, max_entries: int):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str):
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, value):
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp_path, self._path(key))
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self._evict()
+
+    def _evict(self):
+        """Drop the least recently written files once over the size bound."""
+        entries = [e for e in os.scandir(self.directory) if e.name.endswith(".json")]
+        overflow = len(entries) - self.max_entries
+        if overflow <= 0:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:overflow]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+def _make_backend(namespace: str):
+    try:
+        if CACHE_BACKEND == "redis":
+            return RedisTier(REDIS_URL, CACHE_TTL_SECONDS)
+        if CACHE_BACKEND == "disk":
+            return DiskTier(os.path.join(CACHE_DIR, namespace), CACHE_DISK_MAX_ENTRIES)
+    except Exception as e:
+        logger.warning(f"⚠️ Cache backend '{CACHE_BACKEND}' unavailable: {e}")
+    return None
+
+
+class ContentCache:
+    """Two-tier cache keyed by content hash: in-process LRU + optional Redis/disk."""
+
+    def __init__(self, namespace: str, max_entries: int = None, backend="default"):
+        self.namespace = namespace
+        self.max_entries = max_entries or CACHE_MAX_ENTRIES
+        self.backend = _make_backend(namespace) if backend == "default" else backend
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _remote_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        if self.backend is not None:
+            try:
+                value = self.backend.get(self._remote_key(key))
+            except Exception as e:
+                logger.warning(f"⚠️ Cache backend read failed: {e}")
+                value = None
+            if value is not None:
+                self._store_local(key, value)
+                with self._lock:
+                    self.backend_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value):
+        self._store_local(key, value)
+        if self.backend is not None:
+            try:
+                self.backend.set(self._remote_key(key), value)
+            except Exception as e:
+                logger.warning(f"⚠️ Cache backend write failed: {e}")
+
+    def _store_local(self, key: str, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, model_name: str, text: str, compute):
+        key = content_hash(model_name, text)
+        value = self.get(key)
+        if value is None:
+            value = compute(text)
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        """Drop the in-process entries (the shared backend is left alone)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "entries": size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "backend_hits": self.backend_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "backend": type(self.backend).__name__ if self.backend else None,
+        }
@@ -1,11 +1,24 @@
-import os
-from transformers import pipeline
-from langchain_community.chat_models import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
+from app.services.llm import invoke_chain, ainvoke_chain, astream_chain
 
-# Default AI Model (Qwen Free)
-DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "qwen/qwen2.5-vl-72b-instruct:free")
-DEFAULT_API_KEY = os.getenv("DEFAULT_API_KEY", "")  # Optional: Store in .env
+# ✅ Prompt template
+# Bump a version whenever its prompt changes: versions key the LLM response cache
+COVER_LETTER_PROMPT_VERSION = "cover_letter:v1"
+
+COVER_LETTER_PROMPT = (
+    (
+        "system",
+        "You are an expert in writing professional cover letters. "
+        "You must generate a complete and professional cover letter based on the given job description and experience. "
+        "Do not ask for any additional details. "
+        "Your response should be a finalized markdown-formatted cover letter, not a draft or a request for more information.",
+    ),
+    (
+        "human",
+        "Write a professional cover letter for this job:\n{job_description}\n"
+        "Based on this experience:\n{experience}.\n"
+        "Ensure the output is fully written, properly formatted in markdown, and requires no further input from me.",
+    ),
+)
 
 
 # ✅ Generate AI-Powered Cover Letters
@@ -14,38 +27,50 @@ def generate_cover_letter(
     experience: str,
     user_model: str = None,
     user_api_key: str = None,
+    bypass_cache: bool = False,
 ) -> str:
     """Generate a professional cover letter using AI."""
-    model = user_model or DEFAULT_MODEL
-    api_key = user_api_key or DEFAULT_API_KEY
-
-    llm = ChatOpenAI(
-        model=model,
-        openai_api_key=api_key,
-        openai_api_base="https://openrouter.ai/api/v1",
+    return invoke_chain(
+        COVER_LETTER_PROMPT,
+        {"job_description": job_description, "experience": experience},
+        user_model,
+        user_api_key,
+        template=COVER_LETTER_PROMPT_VERSION,
+        bypass_cache=bypass_cache,
     )
 
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                "You are an expert in writing professional cover letters. "
-                "You must generate a complete and professional cover letter based on the given job description and experience. "
-                "Do not ask for any additional details. "
-                "Your response should be a finalized markdown-formatted cover letter, not a draft or a request for more information.",
-            ),
-            (
-                "human",
-                "Write a professional cover letter for this job:\n{job_description}\n"
-                "Based on this experience:\n{experience}.\n"
-                "Ensure the output is fully written, properly formatted in markdown, and requires no further input from me.",
-            ),
-        ]
-    )
 
-    chain = prompt | llm
-    response = chain.invoke(
-        {"job_description": job_description, "experience": experience}
+async def agenerate_cover_letter(
+    job_description: str,
+    experience: str,
+    user_model: str = None,
+    user_api_key: str = None,
+    bypass_cache: bool = False,
+) -> str:
+    """Async variant of `generate_cover_letter`."""
+    return await ainvoke_chain(
+        COVER_LETTER_PROMPT,
+        {"job_description": job_description, "experience": experience},
+        user_model,
+        user_api_key,
+        template=COVER_LETTER_PROMPT_VERSION,
+        bypass_cache=bypass_cache,
     )
 
-    return response.content if hasattr(response, "content") else str(response)
+
+def astream_cover_letter(
+    job_description: str,
+    experience: str,
+    user_model: str = None,
+    user_api_key: str = None,
+    bypass_cache: bool = False,
+):
+    """Stream the cover letter token by token."""
+    return astream_chain(
+        COVER_LETTER_PROMPT,
+        {"job_description": job_description, "experience": experience},
+        user_model,
+        user_api_key,
+        template=COVER_LETTER_PROMPT_VERSION,
+        bypass_cache=bypass_cache,
+    )
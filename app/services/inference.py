@@ -0,0 +1,263 @@
+import logging
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+from app.config import (
+    INFERENCE_MAX_BATCH_SIZE,
+    INFERENCE_MAX_WAIT_MS,
+    SUMMARIZATION_MODEL,
+    EMBEDDING_MODEL,
+    EMBEDDING_CHUNK_TOKENS,
+    EMBEDDING_CHUNK_OVERLAP,
+    EMBEDDING_MAX_CHUNKS,
+)
+from app.services.cache import ContentCache, content_hash
+from app.services.metrics import span
+from app.services.model_registry import get_model
+
+logger = logging.getLogger(__name__)
+
+# Generation settings shared by every summarization call
+SUMMARY_MAX_LENGTH = 150
+SUMMARY_MIN_LENGTH = 50
+
+
+class MicroBatcher:
+    """Collect concurrent single-item requests and run them as one batch.
+
+    Callers block on `submit(...).result()` while a background thread waits up
+    to `max_wait_ms` for more requests (or until `max_batch_size` is reached),
+    sorts the batch by text length so padding stays small, and runs `batch_fn`
+    once for the whole batch.
+    """
+
+    def __init__(self, name, batch_fn, max_batch_size=None, max_wait_ms=None):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size or INFERENCE_MAX_BATCH_SIZE)
+        self.max_wait = (
+            INFERENCE_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+        ) / 1000.0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, text: str) -> Future:
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def __call__(self, text: str):
+        return self.submit(text).result()
+
+    def _ensure_worker(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"batcher-{self.name}", daemon=True
+                )
+                self._thread.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            # Cancelled callers are dropped; the rest can no longer be cancelled
+            batch = [
+                item
+                for item in self._collect()
+                if item[1].set_running_or_notify_cancel()
+            ]
+            if not batch:
+                continue
+            # Length-sorted so the padded batch wastes as little compute as possible
+            batch.sort(key=lambda item: len(item[0]))
+            texts = [text for text, _ in batch]
+            try:
+                results = list(self.batch_fn(texts))
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"{self.name} returned {len(results)} results for "
+                        f"{len(batch)} inputs"
+                    )
+            except Exception as e:
+                logger.error(f"❌ {self.name} batch of {len(batch)} failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+# ✅ Batched model calls
+def _summarize_batch(texts: list) -> list:
+    summarizer = get_model("summarizer")
+    outputs = summarizer(
+        list(texts),
+        max_length=SUMMARY_MAX_LENGTH,
+        min_length=SUMMARY_MIN_LENGTH,
+        do_sample=False,
+        truncation=True,
+        batch_size=len(texts),
+    )
+    return [output["summary_text"] for output in outputs]
+
+
+def _embed_batch(texts: list) -> list:
+    return get_model("embeddings").embed_documents(list(texts))
+
+
+def summarize_many(texts: list) -> list:
+    """Summarize a list of texts in padded BART batches of at most
+    INFERENCE_MAX_BATCH_SIZE texts (a bulk upload can bring thousands)."""
+    if not texts:
+        return []
+    # Length-sorted so each batch pads as little as possible
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    summaries = [None] * len(texts)
+    with span("summarize", SUMMARIZATION_MODEL):
+        for start in range(0, len(order), INFERENCE_MAX_BATCH_SIZE):
+            batch = order[start : start + INFERENCE_MAX_BATCH_SIZE]
+            for i, summary in zip(batch, _summarize_batch([texts[i] for i in batch])):
+                summaries[i] = summary
+    return summaries
+
+
+def embed_many(texts: list) -> list:
+    """Embed a list of texts with one MiniLM batch."""
+    if not texts:
+        return []
+    with span("embed", EMBEDDING_MODEL):
+        return _embed_batch(texts)
+
+
+_summarizer_queue = MicroBatcher("summarizer", _summarize_batch)
+_embedding_queue = MicroBatcher("embeddings", _embed_batch)
+
+# ✅ Content-addressed caches (the generation settings are part of the model key)
+summary_cache = ContentCache("summary")
+embedding_cache = ContentCache("embedding")
+_SUMMARY_CACHE_MODEL = (
+    f"{SUMMARIZATION_MODEL}:{SUMMARY_MAX_LENGTH}:{SUMMARY_MIN_LENGTH}"
+)
+
+
+# ✅ Single-text entry points (cached, then batched with concurrent callers).
+# Only cache misses are timed; the span includes the wait for the batch.
+def _summarize_one(text: str) -> str:
+    with span("summarize", SUMMARIZATION_MODEL):
+        return _summarizer_queue(text)
+
+
+def _embed_one(text: str) -> list:
+    with span("embed", EMBEDDING_MODEL):
+        return _embedding_queue(text)
+
+
+def summarize(text: str) -> str:
+    return summary_cache.get_or_compute(_SUMMARY_CACHE_MODEL, text, _summarize_one)
+
+
+def embed(text: str) -> list:
+    return embedding_cache.get_or_compute(EMBEDDING_MODEL, text, _embed_one)
+
+
+# ✅ Chunked document embeddings
+def _embedding_tokenizer():
+    """The embedding model's fast tokenizer (None if it has no offset mapping)."""
+    client = getattr(get_model("embeddings"), "client", None)
+    tokenizer = getattr(client, "tokenizer", None)
+    return tokenizer if getattr(tokenizer, "is_fast", False) else None
+
+
+def chunk_text(text: str, max_tokens=None, overlap=None, max_chunks=None) -> list:
+    """Split text into overlapping windows of at most `max_tokens` model tokens."""
+    max_tokens = max_tokens or EMBEDDING_CHUNK_TOKENS
+    overlap = EMBEDDING_CHUNK_OVERLAP if overlap is None else overlap
+    max_chunks = max_chunks or EMBEDDING_MAX_CHUNKS
+
+    window = max(1, max_tokens - 2)  # Leave room for [CLS] / [SEP]
+    tokenizer = _embedding_tokenizer()
+    if tokenizer is not None:
+        spans = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)[
+            "offset_mapping"
+        ]
+    else:
+        # No offsets available: words stand in for tokens (~4 tokens per 3 words)
+        spans = [match.span() for match in re.finditer(r"\S+", text)]
+        window = max(1, window * 3 // 4)
+    stride = max(1, window - overlap)
+
+    chunks = []
+    for start in range(0, len(spans), stride):
+        span = spans[start : start + window]
+        chunks.append(text[span[0][0] : span[-1][1]])
+        if start + window >= len(spans) or len(chunks) >= max_chunks:
+            break
+    return chunks or [text]
+
+
+def pool_vectors(vectors, weights=None) -> np.ndarray:
+    """Weighted mean of chunk vectors, L2-normalized."""
+    pooled = np.average(np.asarray(vectors, dtype=np.float32), axis=0, weights=weights)
+    norm = np.linalg.norm(pooled)
+    return (pooled / norm if norm else pooled).astype(np.float32)
+
+
+def embed_documents_chunked(texts: list) -> list:
+    """Return (pooled vector, chunk vector matrix) per text.
+
+    Every uncached chunk of every text is embedded in a single MiniLM batch.
+    """
+    chunked = [chunk_text(text) for text in texts]
+    vectors = {}
+    missing = []
+    for chunks in chunked:
+        for chunk in chunks:
+            key = content_hash(EMBEDDING_MODEL, chunk)
+            if key in vectors:
+                continue
+            vectors[key] = embedding_cache.get(key)
+            if vectors[key] is None:
+                missing.append((key, chunk))
+
+    for (key, _), vector in zip(missing, embed_many([chunk for _, chunk in missing])):
+        vectors[key] = vector
+        embedding_cache.set(key, vector)
+
+    documents = []
+    for chunks in chunked:
+        matrix = np.asarray(
+            [vectors[content_hash(EMBEDDING_MODEL, chunk)] for chunk in chunks],
+            dtype=np.float32,
+        )
+        # Longer chunks carry more of the document, so they weigh more
+        pooled = pool_vectors(matrix, weights=[max(len(chunk), 1) for chunk in chunks])
+        documents.append((pooled, matrix))
+    return documents
+
+
+def embed_chunked(text: str):
+    """Single-text `embed_documents_chunked`."""
+    return embed_documents_chunked([text])[0]
+
+
+def cache_stats() -> dict:
+    return {"summary": summary_cache.stats(), "embedding": embedding_cache.stats()}
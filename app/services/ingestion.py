@@ -0,0 +1,214 @@
+import asyncio
+import io
+import os
+import threading
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from app.config import (
+    MAX_UPLOAD_BYTES,
+    UPLOAD_CHUNK_BYTES,
+    PDF_WORKERS,
+    BULK_PDF_PROCESSES,
+    BULK_MAX_FILES,
+    BULK_MAX_BYTES,
+    PDF_HARD_TIME_LIMIT_SECONDS,
+)
+from app.services.metrics import span
+from app.utils.pdf_parser import extract_experience_from_pdf
+
+# Callers queue here rather than in the pool, so the hard time limit only
+# counts parsing
+_pdf_slots = asyncio.Semaphore(PDF_WORKERS)
+
+
+async def read_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> bytes:
+    """Read an upload in chunks, rejecting it as soon as it exceeds `max_bytes`."""
+    buffer = bytearray()
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        buffer.extend(chunk)
+        if len(buffer) > max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit",
+            )
+    await file.close()
+    return bytes(buffer)
+
+
+def is_pdf(data: bytes) -> bool:
+    return data[:1024].lstrip().startswith(b"%PDF-")
+
+
+async def extract_experience(data: bytes) -> str:
+    """Parse PDF bytes in memory on the upload process pool.
+
+    Raises TimeoutError after PDF_HARD_TIME_LIMIT_SECONDS; the worker is
+    killed, so a runaway page never keeps a PDF_WORKERS slot busy.
+    """
+    async with _pdf_slots:
+        with span("pdf_extract", "upload_pool"):
+            return await upload_pool.run(
+                extract_experience_from_pdf, data, timeout=PDF_HARD_TIME_LIMIT_SECONDS
+            )
+
+
+# ✅ PDFs are parsed in worker processes, which (unlike threads) can be killed
+class KillablePool:
+    """A ProcessPoolExecutor that is replaced when a worker dies or hangs.
+
+    Created on first use so importing the app never forks.
+    """
+
+    def __init__(self, size):
+        self.size = size  # Callable, so the size is read when the pool starts
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.size())
+            return self._pool
+
+    def reset(self, broken: ProcessPoolExecutor, kill: bool = False):
+        """Drop a broken (or, with `kill`, hung) pool so the next caller gets a fresh one."""
+        with self._lock:
+            if self._pool is broken:  # Not already replaced by a concurrent caller
+                self._pool = None
+        if kill:
+            # No public API stops a busy worker; the pool's other in-flight calls
+            # fail with BrokenProcessPool and are retried on the fresh pool
+            for process in list((broken._processes or {}).values()):
+                process.terminate()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn, *args, timeout: float = None):
+        """Run `fn` on the pool, retrying once on a fresh pool if a worker died
+        (e.g. a crash or OOM kill while parsing a hostile PDF).
+
+        After `timeout` seconds the pool is killed and replaced, and
+        TimeoutError is raised.
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self.get()
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(pool, fn, *args), timeout
+                )
+            except TimeoutError:
+                self.reset(pool, kill=True)
+                raise
+            except BrokenProcessPool:
+                self.reset(pool)
+                if attempt:
+                    raise
+
+
+def process_pool_size() -> int:
+    return BULK_PDF_PROCESSES or os.cpu_count() or 1
+
+
+# Single uploads and bulk batches get separate pools, so a large batch never
+# delays an interactive upload
+upload_pool = KillablePool(lambda: PDF_WORKERS)
+bulk_pool = KillablePool(process_pool_size)
+
+
+# Encrypted members raise RuntimeError, unsupported compression NotImplementedError
+_ZIP_MEMBER_ERRORS = (zipfile.BadZipFile, RuntimeError, NotImplementedError, zlib.error)
+
+
+def expand_zip(data: bytes, max_bytes: int = BULK_MAX_BYTES) -> list:
+    """Return [(filename, pdf_bytes, error)] for every PDF inside a zip archive.
+
+    Members that cannot be extracted are returned with an error instead of
+    bytes. Raises 413 when the PDFs would decompress to more than `max_bytes`.
+    """
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        entries = [
+            info
+            for info in archive.infolist()
+            if not info.is_dir()
+            and info.filename.lower().endswith(".pdf")
+            and not info.filename.startswith("__MACOSX/")
+        ]
+        # Reads never return more than the declared sizes
+        if sum(info.file_size for info in entries) > max_bytes:
+            raise HTTPException(status_code=413, detail="Batch is too large")
+        members = []
+        for info in entries:
+            try:
+                members.append((info.filename, archive.read(info), None))
+            except _ZIP_MEMBER_ERRORS:
+                members.append((info.filename, b"", "Could not extract from the zip"))
+        return members
+
+
+async def collect_bulk_files(files: list) -> list:
+    """Read a multipart batch (PDFs and/or zips) into [(filename, bytes, error)].
+
+    BULK_MAX_BYTES caps the whole batch: uploaded PDFs plus decompressed zip
+    members.
+    """
+    collected, total = [], 0
+    for file in files:
+        data = await read_upload(file, BULK_MAX_BYTES - total)
+        if file.filename.lower().endswith(".zip"):
+            try:
+                # ✅ Decompression is CPU- and memory-bound: keep it off the loop
+                members = await run_in_threadpool(
+                    expand_zip, data, BULK_MAX_BYTES - total
+                )
+            except zipfile.BadZipFile:
+                members = [(file.filename, b"", "Not a valid zip archive")]
+            collected.extend(members)
+            total += sum(len(member) for _, member, _ in members)
+        else:
+            collected.append((file.filename, data, None))
+            total += len(data)
+        if len(collected) > BULK_MAX_FILES:
+            raise HTTPException(
+                status_code=413, detail=f"At most {BULK_MAX_FILES} files per batch"
+            )
+    return collected
+
+
+async def extract_many(documents: list) -> list:
+    """Parse [(filename, bytes, error)] on the process pool.
+
+    Returns [(filename, text or None, error or None)] in input order; documents
+    that already carry an error are passed through.
+    """
+    # At most one file per worker in flight, so the time limit only counts parsing
+    slots = asyncio.Semaphore(process_pool_size())
+
+    async def extract_one(filename, data, error):
+        if error is not None:
+            return filename, None, error
+        if not is_pdf(data):
+            return filename, None, "Not a valid PDF"
+        try:
+            async with slots:
+                with span("pdf_extract", "process_pool"):
+                    text = await bulk_pool.run(
+                        extract_experience_from_pdf,
+                        data,
+                        timeout=PDF_HARD_TIME_LIMIT_SECONDS,
+                    )
+        except TimeoutError:
+            return filename, None, "The PDF took too long to parse"
+        except Exception:
+            return filename, None, "Could not read the PDF file"
+        if not text.strip():
+            return filename, None, "No text could be extracted"
+        return filename, text, None
+
+    return await asyncio.gather(*(extract_one(*document) for document in documents))
@@ -1,10 +1,18 @@
 import numpy as np
 import logging
-from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from sqlalchemy.orm import Session
-from app.models.job import Job
-from app.services.ai import summarize_experience
+import time
+from app.config import VECTOR_SEARCH_BACKEND, EMBEDDING_MODE
+from app.services.ai import summarize_experience, summarize_experiences
+from app.services.model_registry import get_model, register_model
+from app.services.metrics import span
+from app.services.inference import (
+    embed,
+    embed_many,
+    embed_chunked,
+    embed_documents_chunked,
+)
+from app.services.vector_index import JobVectorIndex
+from app.services.vector_store import VectorStore, create_vector_store, vector_id
 
 # ✅ Configure logging
 logging.basicConfig(
@@ -12,20 +20,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# ✅ Initialize an embedding model
-embedding_model = HuggingFaceEmbeddings(
-    model_name="sentence-transformers/all-MiniLM-L6-v2"
-)
+# ✅ Job vector store (VECTOR_STORE_BACKEND), opened on first use and registered
+# so warm-up can open it early
+register_model("vector_store", create_vector_store)
 
-# Ensure this is mapped in Docker
-DB_PATH = "/app/chromadb"
 
-# ✅ Connect to ChromaDB with embeddings
-db = Chroma(
-    collection_name="job-matching",
-    persist_directory=DB_PATH,  # Ensure this directory exists for persistence
-    embedding_function=embedding_model,  # ✅ Provide embedding function
-)
+def get_vector_store() -> VectorStore:
+    """Return the shared job vector store, opening it on first use."""
+    return get_model("vector_store")
 
 
 # ✅ Function to compute cosine similarity manually
@@ -34,91 +36,302 @@ def cosine_similarity(vec1, vec2):
     return np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
 
 
-# ✅ Function to store job descriptions in ChromaDB
-def store_job(job_text: str, job_id: int):
-    """Store job descriptions for matching against resumes."""
+def upsert_job_embeddings(entries: list):
+    """Write many job vectors to the store in one call and mirror them in the index.
+
+    Each entry is a dict with job_id, text, embedding, user_id, title and
+    description_hash.
+    """
+    if not entries:
+        return
+    store = get_vector_store()
+    with span("vector_add", store.name):
+        store.upsert(entries)
+    index = get_job_index()
+    for entry in entries:
+        index.upsert(
+            entry["job_id"],
+            entry["embedding"],
+            entry.get("user_id"),
+            entry.get("title"),
+        )
+        _indexed_hashes[entry["job_id"]] = entry.get("description_hash")
+
+
+def update_job_metadata(entries: list):
+    """Rewrite filter metadata (title / user_id) without re-embedding."""
+    if not entries:
+        return
+    get_vector_store().update_metadata(entries)
+    index = get_job_index()
+    for entry in entries:
+        embedding = index.get(entry["job_id"])
+        if embedding is not None:
+            index.upsert(
+                entry["job_id"], embedding, entry.get("user_id"), entry.get("title")
+            )
+
+
+def get_job_vector_metadata(job_ids: list) -> dict:
+    """{job_id: metadata} for the given jobs' records (an id lookup, not a scan)."""
+    if not job_ids:
+        return {}
+    store = get_vector_store()
+    with span("vector_get", store.name):
+        return store.get_metadata(job_ids)
+
+
+def iter_job_vector_metadata(page_size: int = 5000):
+    """Yield (record id, metadata) for every record in the store."""
+    return get_vector_store().iter_metadata(page_size)
+
+
+# ✅ Function to store job descriptions in the vector store
+def store_job(
+    job_text: str,
+    job_id: int,
+    user_id: int = None,
+    title: str = None,
+    description_hash: str = None,
+):
+    """Store (or re-store) a job description for matching against resumes.
+
+    With a `description_hash`, a job whose stored vector has the same hash is
+    left alone. Returns True once the job's embedding is stored.
+    """
+    if description_hash is not None:
+        stored = get_job_vector_metadata([job_id]).get(job_id)
+        if stored is not None and stored.get("description_hash") == description_hash:
+            logger.info(
+                f"✅ Job {job_id} is unchanged in the vector store. Skipping storage."
+            )
+            return True
 
     # Generate job embedding
     try:
-        summary_text = summarize_experience(job_text)
-        job_embedding = embedding_model.embed_query(summary_text)
+        job_embedding = embed_for_matching(job_text)
         if job_embedding is None:
             raise ValueError("❌ Embedding generation failed!")
     except Exception as e:
         logger.error(f"❌ Error in embedding generation: {e}")
-        return
+        return False
 
-    # Check if job already exists in ChromaDB
     try:
-        existing_data = db.get(include=["embeddings"], where={"job_id": str(job_id)})
-        if existing_data and existing_data["embeddings"]:
-            logger.warning(
-                f"⚠️ Job {job_id} already exists in ChromaDB. Skipping storage."
-            )
-            return
+        upsert_job_embeddings(
+            [
+                {
+                    "job_id": job_id,
+                    "text": job_text,
+                    "embedding": job_embedding,
+                    "user_id": user_id,
+                    "title": title,
+                    "description_hash": description_hash,
+                }
+            ]
+        )
+        logger.info(f"✅ Job {job_id} stored successfully in the vector store!")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error storing job embedding in the vector store: {e}")
+    return False
+
+
+# ✅ Embed text the same way for resumes and jobs (EMBEDDING_MODE selects how)
+def embed_document_for_matching(text: str):
+    """Return (matching embedding, per-chunk vectors or None when summarizing)."""
+    if EMBEDDING_MODE == "chunked":
+        pooled, chunk_vectors = embed_chunked(text)
+        return pooled.tolist(), chunk_vectors
+    return embed(summarize_experience(text)), None
+
+
+def embed_for_matching(text: str):
+    """Return the matching embedding for a resume or job text."""
+    return embed_document_for_matching(text)[0]
+
 
-        # Store in ChromaDB
-        db.add_texts(
-            [job_text],
-            metadatas=[{"job_id": str(job_id)}],
-            embeddings=[job_embedding],
+def embed_many_for_matching(texts: list) -> list:
+    """Batched `embed_document_for_matching` for bulk jobs."""
+    if EMBEDDING_MODE == "chunked":
+        return [
+            (pooled.tolist(), chunk_vectors)
+            for pooled, chunk_vectors in embed_documents_chunked(texts)
+        ]
+    return [(vector, None) for vector in embed_many(summarize_experiences(texts))]
+
+
+# ✅ In-process job_id -> embedding index over every stored job vector.
+# Loaded from the vector store once per process (at startup when MODEL_WARMUP is set) and
+# updated on every store / delete, so lookups never scan the collection.
+_indexed_hashes = {}  # job_id -> description hash the indexed vector was embedded from
+
+
+def _load_job_index() -> JobVectorIndex:
+    started = time.perf_counter()
+    ids, metadatas, embeddings = get_vector_store().all_records()
+
+    # One row per job: prefer the job-id keyed record over older duplicates
+    rows = {}
+    for row, (record_id, metadata) in enumerate(zip(ids, metadatas)):
+        job_id = int(metadata["job_id"])
+        if job_id not in rows or record_id == vector_id(job_id):
+            rows[job_id] = row
+    metadatas = [metadatas[row] for row in rows.values()]
+
+    index = JobVectorIndex()
+    if metadatas:
+        index.build(
+            job_ids=list(rows),
+            embeddings=[embeddings[row] for row in rows.values()],
+            user_ids=[m.get("user_id") for m in metadatas],
+            titles=[m.get("title") for m in metadatas],
         )
-        logger.info(f"✅ Job {job_id} stored successfully in ChromaDB!")
+    _indexed_hashes.clear()
+    _indexed_hashes.update(
+        {int(m["job_id"]): m.get("description_hash") for m in metadatas}
+    )
+    logger.info(
+        f"✅ Indexed {len(index)} job embeddings in {time.perf_counter() - started:.2f}s"
+    )
+    return index
 
-        # Verify storage
-        results = db.get(include=["embeddings"], where={"job_id": str(job_id)})
-        if results and results["embeddings"]:
-            logger.info(
-                f"✅ Embedding successfully stored and retrieved for Job {job_id}!"
-            )
+
+register_model("job_index", _load_job_index)
+
+
+def get_job_index() -> JobVectorIndex:
+    return get_model("job_index")
+
+
+# ✅ Fetch a stored job embedding (O(1) index lookup)
+def get_job_embedding(job_id: int, description_hash: str = None):
+    """Return the stored embedding for a job, or None if it was never stored.
+
+    Passing the job's current `description_hash` re-reads the record from
+    the vector store when this process indexed an older version of the job.
+    """
+    index = get_job_index()
+    embedding = index.get(job_id)
+    indexed_hash = _indexed_hashes.get(job_id)
+    if embedding is not None and (
+        description_hash is None or indexed_hash in (None, description_hash)
+    ):
+        return embedding  # (records written before hashes were stored always match)
+
+    # Missing or outdated here: the job may have been (re)stored by another
+    # process since this index was loaded (e.g. a Celery worker)
+    store = get_vector_store()
+    with span("vector_get", store.name):
+        record = store.get_record(job_id)
+    if record is None:
+        if embedding is not None:  # Deleted by another process
+            index.remove(job_id)
+            _indexed_hashes.pop(job_id, None)
+        return None
+    stored_embedding, metadata = record
+    index.upsert(
+        job_id, stored_embedding, metadata.get("user_id"), metadata.get("title")
+    )
+    _indexed_hashes[job_id] = metadata.get("description_hash")
+    return index.get(job_id)
+
+
+def get_job_embeddings(description_hashes: dict) -> dict:
+    """Bulk `get_job_embedding`: {job_id: hash or None} -> {job_id: embedding}.
+
+    Jobs missing from (or outdated in) the index are read from the vector
+    store in one call; jobs without a stored vector are left out.
+    """
+    index = get_job_index()
+    embeddings, refetch = {}, []
+    for job_id, description_hash in description_hashes.items():
+        embedding = index.get(job_id)
+        indexed_hash = _indexed_hashes.get(job_id)
+        if embedding is not None and (
+            description_hash is None or indexed_hash in (None, description_hash)
+        ):
+            embeddings[job_id] = embedding
         else:
-            logger.warning(
-                f"⚠️ Storage verification failed for Job {job_id}. Check ChromaDB persistence settings."
-            )
+            refetch.append(job_id)
+    if not refetch:
+        return embeddings
 
-    except Exception as e:
-        logger.error(f"❌ Error storing job embedding in ChromaDB: {e}")
+    store = get_vector_store()
+    with span("vector_get", store.name):
+        records = store.get_records(refetch)
+    for job_id in refetch:
+        if job_id not in records:
+            if index.remove(job_id):  # Deleted by another process
+                _indexed_hashes.pop(job_id, None)
+            continue
+        stored_embedding, metadata = records[job_id]
+        index.upsert(
+            job_id, stored_embedding, metadata.get("user_id"), metadata.get("title")
+        )
+        _indexed_hashes[job_id] = metadata.get("description_hash")
+        embeddings[job_id] = index.get(job_id)
+    return embeddings
 
 
-# ✅ Function to match a resume against a specific job
-def match_resume_to_job(resume_text: str, job_id: int, db_session: Session):
-    """Match a resume to a job description and return a match percentage."""
+def delete_job_embeddings(job_ids: list) -> int:
+    """Remove jobs' vectors from the vector store and the in-process index."""
+    if not job_ids:
+        return 0
+    get_vector_store().delete_jobs(job_ids)
+    index = get_job_index()
+    for job_id in job_ids:
+        index.remove(job_id)
+        _indexed_hashes.pop(job_id, None)
+    return len(job_ids)
 
-    # Fetch job description from the database
-    job = db_session.query(Job).filter(Job.id == job_id).first()
-    if not job:
-        logger.warning(f"⚠️ Job ID {job_id} not found in the database.")
-        return None, "Job not found"
 
-    # Encode the resume text using the same embedding model
-    try:
-        summary_text = summarize_experience(resume_text)
-        resume_embedding = embedding_model.embed_query(summary_text)
-    except Exception as e:
-        logger.error(f"❌ Error in resume embedding generation: {e}")
-        return None, "Failed to generate resume embedding"
+def delete_vector_records(ids: list):
+    """Drop store records by record id (duplicates left by older writes)."""
+    if ids:
+        get_vector_store().delete_records(ids)
 
-    # ✅ Retrieve job embedding from ChromaDB
-    try:
-        results = db.get(include=["embeddings"], where={"job_id": str(job_id)})
 
-        if not results or not results["embeddings"]:
-            logger.warning(f"⚠️ Job ID {job_id} embedding not found in ChromaDB.")
-            return None, "Job embedding not found in ChromaDB"
+# ✅ Convert two embeddings into a match percentage (0 to 100)
+def score_embeddings(resume_embedding, job_embedding) -> float:
+    return round(float(cosine_similarity(resume_embedding, job_embedding)) * 100, 2)
 
-        job_embedding = results["embeddings"][
-            0
-        ]  # ✅ Extract the first embedding correctly
 
-        # ✅ Compute cosine similarity using the extracted embedding
-        similarity_score = cosine_similarity(resume_embedding, job_embedding)
+# ✅ Score a resume embedding against one stored job
+def match_job_embedding(job_id: int, resume_embedding, description_hash: str = None):
+    """Return the match percentage for a job, or None if it has no stored vector.
 
-        # ✅ Convert similarity to a percentage (0 to 100)
-        match_percentage = round(similarity_score * 100, 2)
+    Stores with `supports_sql_match` (pgvector) fetch the vector and compute
+    the distance in one query; others score against the in-process index.
+    """
+    store = get_vector_store()
+    if store.supports_sql_match:
+        with span("vector_query", store.name):
+            similarity = store.match_job(job_id, resume_embedding)
+        return None if similarity is None else round(similarity * 100, 2)
 
-        logger.info(f"✅ Resume match for Job {job_id}: {match_percentage}% similarity")
-        return match_percentage, None
+    job_embedding = get_job_embedding(job_id, description_hash)
+    if job_embedding is None:
+        return None
+    return score_embeddings(resume_embedding, job_embedding)
 
-    except Exception as e:
-        logger.error(f"❌ Error retrieving job embedding from ChromaDB: {e}")
-        return None, "Error retrieving job embedding from ChromaDB"
+
+# ✅ Rank all stored jobs for one query embedding in a single ANN query
+def search_jobs(query_embedding, k: int = 10, user_id=None, title=None, keyword=None):
+    """Return [(job_id, match_percentage), ...] for the k best matching jobs."""
+    hits = None
+    if VECTOR_SEARCH_BACKEND != "local" or keyword:
+        try:
+            store = get_vector_store()
+            with span("vector_query", store.name):
+                hits = store.search(query_embedding, k, user_id, title, keyword)
+        except Exception as e:
+            if keyword:
+                raise
+            logger.warning(f"⚠️ Vector store top-k query failed, using local index: {e}")
+
+    if hits is None:
+        with span("vector_query", "local"):
+            hits = get_job_index().search(
+                query_embedding, k, user_id=user_id, title=title
+            )
+    return [(job_id, round(score * 100, 2)) for job_id, score in hits]
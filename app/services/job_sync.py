@@ -0,0 +1,118 @@
+import logging
+from sqlalchemy.orm import Session
+from app.config import VECTOR_SYNC_BATCH_SIZE
+from app.models.job import Job
+from app.services.job_matching import (
+    delete_job_embeddings,
+    delete_vector_records,
+    embed_many_for_matching,
+    get_job_vector_metadata,
+    iter_job_vector_metadata,
+    update_job_metadata,
+    upsert_job_embeddings,
+)
+from app.services.vector_store import vector_id
+from app.services.match_store import refresh_matches_for_job, text_hash
+
+logger = logging.getLogger(__name__)
+
+
+def _batches(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _entry(job: Job, embedding=None) -> dict:
+    return {
+        "job_id": job.id,
+        "text": job.description,
+        "embedding": embedding,
+        "user_id": job.user_id,
+        "title": job.title,
+        "description_hash": text_hash(job.description),
+    }
+
+
+# ✅ Bring the vector store in line with the `jobs` rows for the given ids
+def sync_jobs(job_ids: list, db_session: Session, force: bool = False) -> dict:
+    """Upsert changed jobs and delete vectors of jobs that no longer exist.
+
+    A job is re-embedded only when its description hash differs from the one
+    stored with its vector (or `force` is set); title / owner changes only
+    rewrite metadata. Writes go to the store in batches of VECTOR_SYNC_BATCH_SIZE.
+    """
+    jobs = db_session.query(Job).filter(Job.id.in_(job_ids)).all()
+    found = {job.id for job in jobs}
+    deleted = delete_job_embeddings(
+        [job_id for job_id in job_ids if job_id not in found]
+    )
+
+    stored = {} if force else get_job_vector_metadata(list(found))
+    changed, relabelled = [], []
+    for job in jobs:
+        entry = _entry(job)
+        metadata = stored.get(job.id) or {}
+        if metadata.get("description_hash") != entry["description_hash"]:
+            changed.append(job)
+        elif (
+            metadata.get("title") != job.title or metadata.get("user_id") != job.user_id
+        ):
+            relabelled.append(entry)
+
+    for batch in _batches(changed, VECTOR_SYNC_BATCH_SIZE):
+        documents = embed_many_for_matching([job.description for job in batch])
+        upsert_job_embeddings(
+            [_entry(job, vector) for job, (vector, _) in zip(batch, documents)]
+        )
+    for batch in _batches(relabelled, VECTOR_SYNC_BATCH_SIZE):
+        update_job_metadata(batch)
+
+    for job in changed:
+        refresh_matches_for_job(job, db_session)
+
+    result = {
+        "upserted": len(changed),
+        "relabelled": len(relabelled),
+        "unchanged": len(jobs) - len(changed) - len(relabelled),
+        "deleted": deleted,
+    }
+    logger.info(f"✅ Synced {len(job_ids)} job vectors: {result}")
+    return result
+
+
+# ✅ Full diff of the `jobs` table against the vector store
+def reconcile_job_vectors(db_session: Session) -> dict:
+    """Delete orphaned / duplicate vectors and re-sync missing or stale jobs."""
+    rows = db_session.query(Job.id, Job.description).yield_per(1000)
+    current = {job_id: text_hash(description) for job_id, description in rows}
+
+    stored = {}
+    orphaned, duplicates = set(), []
+    for record_id, metadata in iter_job_vector_metadata():
+        job_id = int(metadata["job_id"])
+        if job_id not in current:
+            orphaned.add(job_id)
+        elif record_id != vector_id(job_id):
+            duplicates.append(record_id)  # Written before records were keyed by job id
+        else:
+            stored[job_id] = metadata.get("description_hash")
+
+    for batch in _batches(sorted(orphaned), VECTOR_SYNC_BATCH_SIZE):
+        delete_job_embeddings(batch)
+    for batch in _batches(duplicates, VECTOR_SYNC_BATCH_SIZE):
+        delete_vector_records(batch)
+
+    stale = [
+        job_id for job_id, digest in current.items() if stored.get(job_id) != digest
+    ]
+    for batch in _batches(stale, VECTOR_SYNC_BATCH_SIZE):
+        sync_jobs(batch, db_session, force=True)
+
+    result = {
+        "jobs": len(current),
+        "resynced": len(stale),
+        "orphans_deleted": len(orphaned),
+        "duplicates_deleted": len(duplicates),
+    }
+    logger.info(f"✅ Reconciled job vectors: {result}")
+    return result
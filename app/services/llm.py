@@ -0,0 +1,211 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+import httpx
+from app.config import (
+    DEFAULT_MODEL,
+    DEFAULT_API_KEY,
+    OPENROUTER_API_BASE,
+    LLM_TIMEOUT_SECONDS,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE,
+    LLM_MAX_CONCURRENCY,
+    LLM_CLIENT_CACHE_SIZE,
+    LLM_METRIC_MODELS,
+)
+from app.services.llm_cache import response_cache, response_key
+from app.services.metrics import span
+
+# ✅ Pooled keep-alive HTTP sessions shared by every LLM client in the process
+_limits = httpx.Limits(
+    max_connections=LLM_MAX_CONNECTIONS,
+    max_keepalive_connections=LLM_MAX_KEEPALIVE,
+)
+_sync_http = None
+_async_http = None
+_http_lock = threading.Lock()
+
+# ✅ One chat model per (model, api_key), reused across requests
+_chat_models = OrderedDict()
+_chat_models_lock = threading.Lock()
+
+# ✅ Caps on concurrent upstream calls
+_sync_slots = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+_async_slots = None
+
+
+def _get_sync_http() -> httpx.Client:
+    global _sync_http
+    with _http_lock:
+        if _sync_http is None:
+            _sync_http = httpx.Client(limits=_limits, timeout=LLM_TIMEOUT_SECONDS)
+        return _sync_http
+
+
+def _get_async_http() -> httpx.AsyncClient:
+    global _async_http
+    with _http_lock:
+        if _async_http is None:
+            _async_http = httpx.AsyncClient(limits=_limits, timeout=LLM_TIMEOUT_SECONDS)
+        return _async_http
+
+
+def _get_async_slots() -> asyncio.Semaphore:
+    global _async_slots
+    if _async_slots is None:
+        _async_slots = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return _async_slots
+
+
+def get_chat_model(user_model: str = None, user_api_key: str = None):
+    """Return the shared ChatOpenAI client for a model / API key pair."""
+    import openai
+    from langchain_community.chat_models import ChatOpenAI
+
+    model = user_model or DEFAULT_MODEL
+    api_key = user_api_key or DEFAULT_API_KEY
+    key = (model, api_key)
+
+    with _chat_models_lock:
+        llm = _chat_models.get(key)
+        if llm is not None:
+            _chat_models.move_to_end(key)
+            return llm
+
+        client_params = {"api_key": api_key, "base_url": OPENROUTER_API_BASE}
+        llm = ChatOpenAI(
+            model=model,
+            openai_api_key=api_key,
+            openai_api_base=OPENROUTER_API_BASE,
+            client=openai.OpenAI(
+                **client_params, http_client=_get_sync_http()
+            ).chat.completions,
+            async_client=openai.AsyncOpenAI(
+                **client_params, http_client=_get_async_http()
+            ).chat.completions,
+        )
+        _chat_models[key] = llm
+        while len(_chat_models) > LLM_CLIENT_CACHE_SIZE:
+            _chat_models.popitem(last=False)
+        return llm
+
+
+@lru_cache(maxsize=None)
+def get_prompt(messages: tuple):
+    """Build (once) the ChatPromptTemplate for a tuple of (role, template) messages."""
+    from langchain.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate.from_messages(list(messages))
+
+
+def _chain(prompt, user_model, user_api_key):
+    if isinstance(prompt, tuple):
+        prompt = get_prompt(prompt)
+    return prompt | get_chat_model(user_model, user_api_key)
+
+
+def response_text(response) -> str:
+    return response.content if hasattr(response, "content") else str(response)
+
+
+def _model_label(user_model) -> str:
+    """Metrics label for the chat model, bounded so clients cannot add series."""
+    model = user_model or DEFAULT_MODEL
+    if model == DEFAULT_MODEL or model in LLM_METRIC_MODELS:
+        return model
+    return "custom"
+
+
+def _cache_key(template, inputs, user_model):
+    if response_cache is None or template is None:
+        return None
+    return response_key(user_model or DEFAULT_MODEL, template, inputs)
+
+
+# ✅ Run (or stream) a prompt | llm chain within the concurrency limit.
+# Passing `template` (a versioned prompt name) routes the call through the
+# response cache; `bypass_cache=True` forces a fresh completion.
+def invoke_chain(
+    prompt,
+    inputs: dict,
+    user_model=None,
+    user_api_key=None,
+    template: str = None,
+    bypass_cache: bool = False,
+) -> str:
+    def compute():
+        chain = _chain(prompt, user_model, user_api_key)
+        with _sync_slots, span("llm", _model_label(user_model)):
+            return response_text(chain.invoke(inputs))
+
+    key = _cache_key(template, inputs, user_model)
+    if key is None:
+        return compute()
+    return response_cache.call(key, compute, bypass=bypass_cache)
+
+
+async def ainvoke_chain(
+    prompt,
+    inputs: dict,
+    user_model=None,
+    user_api_key=None,
+    template: str = None,
+    bypass_cache: bool = False,
+) -> str:
+    async def compute():
+        chain = _chain(prompt, user_model, user_api_key)
+        async with _get_async_slots():
+            with span("llm", _model_label(user_model)):
+                return response_text(await chain.ainvoke(inputs))
+
+    key = _cache_key(template, inputs, user_model)
+    if key is None:
+        return await compute()
+    return await response_cache.acall(key, compute, bypass=bypass_cache)
+
+
+async def astream_chain(
+    prompt,
+    inputs: dict,
+    user_model=None,
+    user_api_key=None,
+    template: str = None,
+    bypass_cache: bool = False,
+):
+    """Yield completion text chunks as they arrive from the LLM.
+
+    A cached completion is replayed as a single chunk; a streamed one is
+    cached once it completes.
+    """
+    key = _cache_key(template, inputs, user_model)
+    if key is not None and not bypass_cache:
+        cached = response_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+    chain = _chain(prompt, user_model, user_api_key)
+    parts = []
+    async with _get_async_slots():
+        with span("llm", _model_label(user_model)):
+            async for chunk in chain.astream(inputs):
+                text = response_text(chunk)
+                if text:
+                    parts.append(text)
+                    yield text
+    if key is not None:
+        response_cache.set(key, "".join(parts))
+
+
+async def aclose():
+    """Close the pooled HTTP sessions (called on application shutdown)."""
+    global _sync_http, _async_http
+    with _chat_models_lock:
+        _chat_models.clear()
+    if _async_http is not None:
+        await _async_http.aclose()
+        _async_http = None
+    if _sync_http is not None:
+        _sync_http.close()
+        _sync_http = None
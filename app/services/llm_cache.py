@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from app.config import (
+    REDIS_URL,
+    CACHE_BACKEND,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MAX_ENTRIES,
+)
+from app.services.cache import RedisTier
+
+logger = logging.getLogger(__name__)
+
+
+def response_key(model: str, template: str, inputs: dict) -> str:
+    """Key on (model, prompt template version, hash of every input)."""
+    input_hashes = {
+        name: hashlib.sha256(str(value).encode("utf-8")).hexdigest()
+        for name, value in sorted(inputs.items())
+    }
+    payload = json.dumps([model, template, input_hashes])
+    return "llm:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _retrieve_exception(task: asyncio.Task):
+    """Mark a failed call's exception retrieved when every caller went away."""
+    if not task.cancelled():
+        task.exception()
+
+
+class LLMResponseCache:
+    """TTL cache for LLM completions with in-flight request coalescing.
+
+    Concurrent identical requests share one upstream call: the first caller
+    computes, the others wait for its result. `bypass=True` skips the cache
+    read (the fresh completion still replaces the cached one).
+    """
+
+    def __init__(self, ttl_seconds=None, max_entries=None, backend="default"):
+        self.ttl_seconds = LLM_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_entries = max_entries or LLM_CACHE_MAX_ENTRIES
+        if backend == "default":
+            backend = self._make_backend()
+        self.backend = backend
+        self._entries = OrderedDict()  # key -> (expires_at, text)
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> concurrent.futures.Future
+        self._ainflight = {}  # key -> asyncio.Task
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _make_backend(self):
+        if CACHE_BACKEND != "redis":
+            return None
+        try:
+            return RedisTier(REDIS_URL, self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"⚠️ LLM cache Redis backend unavailable: {e}")
+            return None
+
+    # ✅ Storage
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, text = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return text
+                del self._entries[key]
+
+        if self.backend is not None:
+            try:
+                text = self.backend.get(key)
+            except Exception as e:
+                logger.warning(f"⚠️ LLM cache backend read failed: {e}")
+                text = None
+            if text is not None:
+                self._store_local(key, text)
+                with self._lock:
+                    self.hits += 1
+                return text
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, text: str):
+        self._store_local(key, text)
+        if self.backend is not None:
+            try:
+                self.backend.set(key, text)
+            except Exception as e:
+                logger.warning(f"⚠️ LLM cache backend write failed: {e}")
+
+    def _store_local(self, key: str, text: str):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # ✅ Cached + coalesced calls
+    def call(self, key: str, compute, bypass: bool = False) -> str:
+        if not bypass:
+            text = self.get(key)
+            if text is not None:
+                return text
+
+        with self._lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+        if not leader:
+            return pending.result()
+
+        try:
+            text = compute()
+            self.set(key, text)
+            pending.set_result(text)
+            return text
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def acall(self, key: str, compute, bypass: bool = False) -> str:
+        if not bypass:
+            text = self.get(key)
+            if text is not None:
+                return text
+
+        task = self._ainflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            # Detached from the caller: if it disconnects, the coalesced callers
+            # still get the result (and it is cached for the next request)
+            task = self._ainflight[key] = asyncio.create_task(
+                self._acompute(key, compute)
+            )
+            task.add_done_callback(_retrieve_exception)
+        return await asyncio.shield(task)
+
+    async def _acompute(self, key: str, compute) -> str:
+        try:
+            text = await compute()
+            self.set(key, text)
+            return text
+        finally:
+            self._ainflight.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "entries": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "backend": type(self.backend).__name__ if self.backend else None,
+        }
+
+
+response_cache = LLMResponseCache() if LLM_CACHE_ENABLED else None
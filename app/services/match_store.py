@@ -0,0 +1,373 @@
+import logging
+import numpy as np
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.config import (
+    EMBEDDING_MODEL,
+    EMBEDDING_MODE,
+    EMBEDDING_CHUNK_TOKENS,
+    EMBEDDING_CHUNK_OVERLAP,
+)
+from app.models.job import Job
+from app.models.job_match import JobMatch
+from app.models.resume import Resume
+from app.services.ai import resume_summary_input
+from app.services.inference import chunk_text, embed_chunked
+from app.services.vector_index import normalize_rows
+from app.services.cache import content_hash
+from app.services.resume_index import record_embedding
+from app.utils.resume_sections import split_sections, matching_text
+from app.services.job_matching import (
+    embed_document_for_matching,
+    embed_many_for_matching,
+    get_job_embedding,
+    get_job_embeddings,
+    match_job_embedding,
+    score_embeddings,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ✅ Vector (de)serialization for the LargeBinary embedding column
+def encode_vector(vector) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def decode_vector(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def decode_matrix(blob: bytes, dim: int) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float32).reshape(-1, dim)
+
+
+def resume_matching_text(resume: Resume) -> str:
+    """The sections a resume is matched on (improved version when available)."""
+    if EMBEDDING_MODE == "chunked":
+        # Chunking covers the whole document, so no section is cut short
+        text = resume.improved_experience or resume.experience
+        sections = resume.sections if not resume.improved_experience else None
+        sections = sections or split_sections(text)
+        return matching_text(sections, len(text), fallback=text)
+    if resume.improved_experience:
+        return resume_summary_input(resume.improved_experience)
+    return resume_summary_input(resume.experience, resume.sections)
+
+
+# Embeddings from different modes are not comparable, so the mode is part of the hash
+_MATCHING_MODEL_KEY = (
+    EMBEDDING_MODEL
+    if EMBEDDING_MODE != "chunked"
+    else f"{EMBEDDING_MODEL}:chunked:{EMBEDDING_CHUNK_TOKENS}:{EMBEDDING_CHUNK_OVERLAP}"
+)
+
+
+def text_hash(text: str) -> str:
+    return content_hash(_MATCHING_MODEL_KEY, text)
+
+
+def job_hash(job: Job) -> str:
+    """Current description hash of a job, backfilled for older rows."""
+    if job.description_hash is None:
+        job.description_hash = text_hash(job.description)
+    return job.description_hash
+
+
+# ✅ Resume embeddings
+def refresh_resume_embedding(resume: Resume) -> np.ndarray:
+    """Embed the resume if its text changed since the stored embedding."""
+    text = resume_matching_text(resume)
+    current_hash = text_hash(text)
+    if resume.embedding is not None and resume.embedding_hash == current_hash:
+        return decode_vector(resume.embedding)
+
+    vector, chunk_vectors = embed_document_for_matching(text)
+    vector = np.asarray(vector, dtype=np.float32)
+    resume.embedding = vector.tobytes()
+    resume.embedding_hash = current_hash
+    resume.chunk_embeddings = (
+        encode_vector(chunk_vectors) if chunk_vectors is not None else None
+    )
+    record_embedding(resume.id, resume.user_id, vector)
+    return vector
+
+
+# ✅ Precomputed match scores
+def _bulk_upsert_matches(db_session: Session, rows: list):
+    """Insert or overwrite many `job_matches` rows in one statement.
+
+    An upsert on the (resume_id, job_id) constraint, so concurrent refreshes
+    (API and Celery) never collide.
+    """
+    if not rows:
+        return
+    dialect = db_session.get_bind().dialect.name
+    insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+    stmt = insert(JobMatch).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[JobMatch.resume_id, JobMatch.job_id],
+        set_={
+            "match_score": stmt.excluded.match_score,
+            "resume_hash": stmt.excluded.resume_hash,
+            "job_hash": stmt.excluded.job_hash,
+        },
+    )
+    db_session.execute(stmt)
+
+
+def _match_row(resume: Resume, job: Job, score: float) -> dict:
+    return {
+        "resume_id": resume.id,
+        "job_id": job.id,
+        "match_score": score,
+        "resume_hash": resume.embedding_hash,
+        "job_hash": job_hash(job),
+    }
+
+
+def refresh_matches_for_resume(resume: Resume, db_session: Session):
+    """Embed a resume and score it against all of the user's jobs."""
+    try:
+        resume_vector = refresh_resume_embedding(resume)
+    except Exception as e:
+        logger.error(f"❌ Error embedding resume {resume.id}: {e}")
+        return
+
+    jobs = db_session.query(Job).filter(Job.user_id == resume.user_id).all()
+    rows = []
+    for job in jobs:
+        try:
+            job_vector = get_job_embedding(job.id, job_hash(job))
+        except Exception as e:
+            logger.error(f"❌ Error retrieving embedding for Job {job.id}: {e}")
+            continue
+        if job_vector is not None:
+            rows.append(
+                _match_row(resume, job, score_embeddings(resume_vector, job_vector))
+            )
+    _bulk_upsert_matches(db_session, rows)
+    db_session.commit()
+
+
+def refresh_matches_for_job(job: Job, db_session: Session):
+    """Score a (re)stored job against all of the user's embedded resumes."""
+    job.description_hash = text_hash(job.description)
+    try:
+        if EMBEDDING_MODE == "chunked":
+            # Chunk vectors are already in the embedding cache from `sync_jobs`
+            job.chunk_embeddings = encode_vector(embed_chunked(job.description)[1])
+        job_vector = get_job_embedding(job.id, job.description_hash)
+    except Exception as e:
+        logger.error(f"❌ Error embedding Job {job.id}: {e}")
+        return
+    if job_vector is None:
+        db_session.commit()
+        return
+
+    resumes = (
+        db_session.query(Resume)
+        .filter(Resume.user_id == job.user_id, Resume.embedding.isnot(None))
+        .all()
+    )
+    rows = [
+        _match_row(
+            resume, job, score_embeddings(decode_vector(resume.embedding), job_vector)
+        )
+        for resume in resumes
+    ]
+    _bulk_upsert_matches(db_session, rows)
+    db_session.commit()
+
+
+def get_match_score(resume: Resume, job_id: int, db_session: Session):
+    """Serve a match from `job_matches`, recomputing only when it is stale."""
+    job = db_session.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        return None, "Job not found"
+
+    current_resume_hash = text_hash(resume_matching_text(resume))
+    match = (
+        db_session.query(JobMatch)
+        .filter(JobMatch.resume_id == resume.id, JobMatch.job_id == job_id)
+        .first()
+    )
+    if (
+        match is not None
+        and match.resume_hash == current_resume_hash
+        and match.job_hash == job_hash(job)
+    ):
+        return match.match_score, None
+
+    # ✅ Stale or missing: recompute from stored embeddings and persist
+    try:
+        resume_vector = refresh_resume_embedding(resume)
+    except Exception as e:
+        logger.error(f"❌ Error in resume embedding generation: {e}")
+        return None, "Failed to generate resume embedding"
+
+    try:
+        score = match_job_embedding(job_id, resume_vector, job_hash(job))
+    except Exception as e:
+        logger.error(f"❌ Error retrieving job embedding from the vector store: {e}")
+        return None, "Error retrieving job embedding from ChromaDB"
+    if score is None:
+        return None, "Job embedding not found in ChromaDB"
+
+    _bulk_upsert_matches(db_session, [_match_row(resume, job, score)])
+    db_session.commit()
+    return score, None
+
+
+def refresh_resume_embeddings(resumes: list, db_session: Session):
+    """Batched `refresh_resume_embedding`: each distinct stale text is embedded once."""
+    pending = {}  # text hash -> (text, resumes)
+    for resume in resumes:
+        text = resume_matching_text(resume)
+        current_hash = text_hash(text)
+        if resume.embedding is None or resume.embedding_hash != current_hash:
+            pending.setdefault(current_hash, (text, []))[1].append(resume)
+    if not pending:
+        return
+
+    documents = embed_many_for_matching([text for text, _ in pending.values()])
+    for (current_hash, (_, stale)), (vector, chunk_vectors) in zip(
+        pending.items(), documents
+    ):
+        for resume in stale:
+            resume.embedding = encode_vector(vector)
+            resume.embedding_hash = current_hash
+            resume.chunk_embeddings = (
+                encode_vector(chunk_vectors) if chunk_vectors is not None else None
+            )
+            record_embedding(resume.id, resume.user_id, vector)
+    db_session.commit()
+
+
+def refresh_matches_for_resumes(resumes: list, db_session: Session):
+    """Batched `refresh_matches_for_resume` for bulk uploads."""
+    refresh_resume_embeddings(resumes, db_session)
+
+    # ✅ Job vectors are fetched once per user, not once per resume
+    job_vectors, rows = {}, []
+    for resume in resumes:
+        if resume.user_id not in job_vectors:
+            jobs = db_session.query(Job).filter(Job.user_id == resume.user_id).all()
+            vectors = []
+            for job in jobs:
+                try:
+                    job_vector = get_job_embedding(job.id, job_hash(job))
+                except Exception as e:
+                    logger.error(f"❌ Error retrieving embedding for Job {job.id}: {e}")
+                    continue
+                if job_vector is not None:
+                    vectors.append((job, job_vector))
+            job_vectors[resume.user_id] = vectors
+
+        resume_vector = decode_vector(resume.embedding)
+        rows.extend(
+            _match_row(resume, job, score_embeddings(resume_vector, job_vector))
+            for job, job_vector in job_vectors[resume.user_id]
+        )
+    _bulk_upsert_matches(db_session, rows)
+    db_session.commit()
+
+
+# ✅ Resumes x jobs score matrix in one matmul
+def batch_match_scores(
+    resume_ids: list, job_ids: list, db_session: Session, persist: bool = False
+) -> dict:
+    """Score every resume against every job.
+
+    Resumes and jobs are loaded with one query each, stale resume embeddings
+    are computed in one batch, and job vectors come from one vector store
+    call. `scores[i][j]` is the match percentage of `resume_ids[i]` for
+    `job_ids[j]` (None when the job has no stored vector). With `persist`,
+    the scores are bulk-upserted into `job_matches`.
+    """
+    resume_ids = list(dict.fromkeys(resume_ids))
+    job_ids = list(dict.fromkeys(job_ids))
+    resumes = {
+        resume.id: resume
+        for resume in db_session.query(Resume).filter(Resume.id.in_(resume_ids))
+    }
+    jobs = {job.id: job for job in db_session.query(Job).filter(Job.id.in_(job_ids))}
+    found_resumes = [resume_id for resume_id in resume_ids if resume_id in resumes]
+    found_jobs = [job_id for job_id in job_ids if job_id in jobs]
+
+    refresh_resume_embeddings([resumes[i] for i in found_resumes], db_session)
+    job_vectors = get_job_embeddings({i: job_hash(jobs[i]) for i in found_jobs})
+    scored_jobs = [job_id for job_id in found_jobs if job_id in job_vectors]
+
+    scores = np.full((len(found_resumes), len(found_jobs)), np.nan)
+    if found_resumes and scored_jobs:
+        resume_matrix = normalize_rows(
+            np.stack([decode_vector(resumes[i].embedding) for i in found_resumes])
+        )
+        job_matrix = normalize_rows(np.stack([job_vectors[i] for i in scored_jobs]))
+        columns = [
+            column for column, job_id in enumerate(found_jobs) if job_id in job_vectors
+        ]
+        similarities = (resume_matrix @ job_matrix.T).astype(np.float64)
+        scores[:, columns] = np.round(similarities * 100, 2)
+
+    if persist:
+        _bulk_upsert_matches(
+            db_session,
+            [
+                {
+                    "resume_id": resume_id,
+                    "job_id": job_id,
+                    "match_score": float(scores[row, column]),
+                    "resume_hash": resumes[resume_id].embedding_hash,
+                    "job_hash": jobs[job_id].description_hash,
+                }
+                for row, resume_id in enumerate(found_resumes)
+                for column, job_id in enumerate(found_jobs)
+                if job_id in job_vectors
+            ],
+        )
+    db_session.commit()  # Also saves backfilled job description hashes
+
+    return {
+        "resume_ids": found_resumes,
+        "job_ids": found_jobs,
+        "scores": [
+            [None if np.isnan(score) else float(score) for score in row]
+            for row in scores
+        ],
+        "missing_resume_ids": [i for i in resume_ids if i not in resumes],
+        "missing_job_ids": [i for i in job_ids if i not in jobs],
+        "unembedded_job_ids": [i for i in found_jobs if i not in job_vectors],
+    }
+
+
+# ✅ Explainability: which parts of a resume and job drove the match
+def explain_match(resume: Resume, job: Job, top_n: int = 3):
+    """Return the best-matching (resume chunk, job chunk, similarity) pairs.
+
+    Only available in chunked mode, once both sides have chunk vectors.
+    """
+    if resume.chunk_embeddings is None or job.chunk_embeddings is None:
+        return None
+    dim = len(decode_vector(resume.embedding))
+    resume_chunks = normalize_rows(decode_matrix(resume.chunk_embeddings, dim))
+    job_chunks = normalize_rows(decode_matrix(job.chunk_embeddings, dim))
+    resume_texts = chunk_text(resume_matching_text(resume))
+    job_texts = chunk_text(job.description)
+    if len(resume_texts) != len(resume_chunks) or len(job_texts) != len(job_chunks):
+        return None  # Stored vectors predate a chunking settings change
+
+    similarities = resume_chunks @ job_chunks.T
+    best = np.argsort(similarities, axis=None)[::-1][:top_n]
+    pairs = []
+    for flat_index in best:
+        i, j = np.unravel_index(flat_index, similarities.shape)
+        pairs.append(
+            {
+                "resume_chunk": resume_texts[i],
+                "job_chunk": job_texts[j],
+                "similarity": round(float(similarities[i, j]) * 100, 2),
+            }
+        )
+    return pairs
@@ -0,0 +1,146 @@
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import SERVER_TIMING
+
+# Requests range from cache hits (ms) to LLM calls and cold model loads (minutes)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=BUCKETS,
+)
+STAGE_DURATION = Histogram(
+    "stage_duration_seconds",
+    "Time spent in a pipeline stage (pdf_extract, summarize, embed, vector_*, llm, db)",
+    ["stage", "model", "route"],
+    buckets=BUCKETS,
+)
+
+# {stage: [seconds, calls]} for the current request (None outside requests)
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+_request_scope = contextvars.ContextVar("request_scope", default=None)
+
+
+def _route_label(scope) -> str:
+    if scope is None:
+        return ""  # Outside a request (Celery tasks, scripts)
+    route = scope.get("route")  # Set by the router once the path matched
+    return route.path if route else "unmatched"  # Bounded label values
+
+
+def _record(stage: str, model: str, seconds: float):
+    route = _route_label(_request_scope.get())
+    STAGE_DURATION.labels(stage, model or "", route).observe(seconds)
+    timings = _request_timings.get()
+    if timings is not None:
+        total = timings.setdefault(stage, [0.0, 0])
+        total[0] += seconds
+        total[1] += 1
+
+
+# ✅ Time a block as one stage (works around sync code and awaits alike)
+@contextmanager
+def span(stage: str, model: str = ""):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(stage, model, time.perf_counter() - started)
+
+
+# ✅ Every SQL statement (sync and async engines) is a "db" span
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append((context, time.perf_counter()))
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _, started = conn.info["query_started"].pop()
+    _record("db", conn.dialect.name, time.perf_counter() - started)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute: drop its start
+    # time so it does not pile up on the pooled connection
+    conn = exception_context.connection
+    started = conn.info.get("query_started") if conn is not None else None
+    if started and started[-1][0] is exception_context.execution_context:
+        _, query_started = started.pop()
+        _record("db", conn.dialect.name, time.perf_counter() - query_started)
+
+
+def _server_timing(timings: dict, total: float) -> bytes:
+    entries = [
+        f'{stage};desc="{calls}x";dur={seconds * 1000:.1f}'
+        for stage, (seconds, calls) in sorted(timings.items())
+    ]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries).encode()
+
+
+class MetricsMiddleware:
+    """Record request latency per route template and collect stage spans.
+
+    With SERVER_TIMING=true (or an `X-Server-Timing: 1` request header) the
+    per-stage totals are returned in a `Server-Timing` response header. Stages
+    still running when a streamed response starts are not included.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        timings = {}
+        timings_token = _request_timings.set(timings)
+        scope_token = _request_scope.set(scope)
+        wants_timing = SERVER_TIMING or (b"x-server-timing", b"1") in scope["headers"]
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if wants_timing:
+                    total = time.perf_counter() - started
+                    message.setdefault("headers", []).append(
+                        (b"server-timing", _server_timing(timings, total))
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            REQUEST_DURATION.labels(
+                scope["method"], _route_label(scope), str(status)
+            ).observe(time.perf_counter() - started)
+            _request_timings.reset(timings_token)
+            _request_scope.reset(scope_token)
+
+
+def metrics_payload():
+    """(body, content type) for /metrics; aggregates worker processes when
+    PROMETHEUS_MULTIPROC_DIR is set."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,167 @@
+import logging
+import os
+import resource
+import threading
+import time
+from app.config import (
+    SUMMARIZATION_MODEL,
+    EMBEDDING_MODEL,
+    MODEL_DEVICE,
+    MODEL_NUM_THREADS,
+    MODEL_WARMUP,
+)
+
+logger = logging.getLogger(__name__)
+
+# ✅ Process-wide registry: every model is loaded at most once and shared
+_loaders = {}
+_models = {}
+_stats = {}
+_locks = {}
+_registry_lock = threading.Lock()
+_torch_configured = False
+
+# ✅ Warm-up progress reported by the readiness probe
+_warmup = {"state": "idle", "started_at": None, "finished_at": None, "error": None}
+
+
+def register_model(name: str, loader):
+    """Register a zero-argument loader for a named model."""
+    with _registry_lock:
+        _loaders[name] = loader
+        _locks.setdefault(name, threading.Lock())
+
+
+def _rss_bytes() -> int:
+    """Current resident set size of this process (falls back to peak RSS)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _configure_torch():
+    """Apply the configured thread count once, before the first model loads."""
+    global _torch_configured
+    if _torch_configured:
+        return
+    _torch_configured = True
+    if MODEL_NUM_THREADS > 0:
+        import torch
+
+        torch.set_num_threads(MODEL_NUM_THREADS)
+        logger.info(f"🧵 Torch intra-op threads set to {MODEL_NUM_THREADS}")
+
+
+def get_model(name: str):
+    """Return the shared instance of a model, loading it on first use."""
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    if name not in _loaders:
+        raise KeyError(f"Unknown model '{name}'")
+
+    with _locks[name]:
+        # Another thread may have finished loading while we waited
+        model = _models.get(name)
+        if model is not None:
+            return model
+
+        _configure_torch()
+        rss_before = _rss_bytes()
+        started = time.perf_counter()
+        model = _loaders[name]()
+        load_seconds = time.perf_counter() - started
+
+        _stats[name] = {
+            "load_seconds": round(load_seconds, 3),
+            "rss_delta_mb": round((_rss_bytes() - rss_before) / (1024 * 1024), 1),
+            "loaded_at": time.time(),
+            "device": MODEL_DEVICE,
+        }
+        _models[name] = model
+        logger.info(
+            f"✅ Model '{name}' loaded in {load_seconds:.2f}s "
+            f"(+{_stats[name]['rss_delta_mb']} MB RSS)"
+        )
+        return model
+
+
+def is_loaded(name: str) -> bool:
+    return name in _models
+
+
+def warm_up(names=None):
+    """Eagerly load the given models (all registered models by default)."""
+    _warmup.update(
+        state="warming", started_at=time.time(), finished_at=None, error=None
+    )
+    try:
+        for name in names or list(_loaders):
+            get_model(name)
+    except Exception as e:
+        _warmup.update(state="failed", finished_at=time.time(), error=str(e))
+        raise
+    _warmup.update(state="ready", finished_at=time.time())
+
+
+def warm_up_in_background(names=None) -> threading.Thread:
+    """Run `warm_up` on a daemon thread so the server can accept traffic meanwhile."""
+
+    def run():
+        try:
+            warm_up(names)
+        except Exception as e:
+            logger.error(f"❌ Model warm-up failed: {e}")
+
+    thread = threading.Thread(target=run, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def readiness() -> dict:
+    """Whether this process should receive traffic, plus per-model load state.
+
+    With MODEL_WARMUP=lazy models load on first use, so the process is always
+    ready; otherwise it is ready once warm-up has loaded every model.
+    """
+    return {
+        "ready": MODEL_WARMUP == "lazy" or _warmup["state"] == "ready",
+        "warmup": MODEL_WARMUP,
+        **_warmup,
+        "models": {name: name in _models for name in _loaders},
+    }
+
+
+def model_stats() -> dict:
+    """Load metrics for every registered model."""
+    return {
+        "device": MODEL_DEVICE,
+        "num_threads": MODEL_NUM_THREADS or None,
+        "rss_mb": round(_rss_bytes() / (1024 * 1024), 1),
+        "models": {
+            name: {"loaded": name in _models, **_stats.get(name, {})}
+            for name in _loaders
+        },
+    }
+
+
+# ✅ Built-in models
+def _load_summarizer():
+    from transformers import pipeline
+
+    return pipeline("summarization", model=SUMMARIZATION_MODEL, device=MODEL_DEVICE)
+
+
+def _load_embeddings():
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
+    return HuggingFaceEmbeddings(
+        model_name=EMBEDDING_MODEL, model_kwargs={"device": MODEL_DEVICE}
+    )
+
+
+register_model("summarizer", _load_summarizer)
+register_model("embeddings", _load_embeddings)
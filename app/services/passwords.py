@@ -0,0 +1,44 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from passlib.context import CryptContext
+from app.config import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS
+
+# ✅ Hashes with any other cost are flagged by `verify_and_update` and
+# re-hashed on the next successful login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+# ✅ bcrypt is CPU-bound (and releases the GIL), so it gets its own bounded
+# pool instead of the threadpool shared by every sync route
+password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+)
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def verify_password(password: str, hashed: str):
+    """(valid, new hash or None). Unknown users still pay for one bcrypt round."""
+    if hashed is None:
+        pwd_context.dummy_verify()
+        return False, None
+    return pwd_context.verify_and_update(password, hashed)
+
+
+async def ahash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, hash_password, password)
+
+
+async def averify_password(password: str, hashed: str):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, verify_password, password, hashed
+    )
@@ -0,0 +1,195 @@
+import logging
+import os
+import threading
+import time
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config import RESUME_MATRIX_PATH, RESUME_MATRIX_TTL_SECONDS
+from app.models.resume import Resume
+from app.services.vector_index import normalize_rows, top_k_indices
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeMatrix:
+    """All stored resume embeddings as one contiguous, normalized float32 matrix."""
+
+    def __init__(self, resume_ids, user_ids, matrix, token):
+        self.resume_ids = resume_ids
+        self.user_ids = user_ids
+        self.matrix = matrix
+        self.token = token
+        self.loaded_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.resume_ids)
+
+    def rank(self, job_embedding, offset=0, limit=20, min_score=0.0):
+        """Score every resume with one mat-vec product and page through the top hits.
+
+        Returns (total_above_threshold, [(resume_id, user_id, match_percentage)]).
+        """
+        if len(self) == 0:
+            return 0, []
+        query = np.asarray(job_embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        scores = np.asarray(self.matrix @ query) * 100
+
+        rows = np.flatnonzero(scores >= min_score)
+        total = len(rows)
+        if offset >= total:
+            return total, []
+        best = rows[top_k_indices(scores[rows], offset + limit)][offset:]
+        return total, [
+            (int(self.resume_ids[i]), int(self.user_ids[i]), round(float(scores[i]), 2))
+            for i in best
+        ]
+
+    def with_rows(self, updates: dict) -> "ResumeMatrix":
+        """A copy with rows replaced or appended: {resume_id: (user_id, vector)}.
+
+        Rows stay sorted by resume id. Vectors of a different dimension
+        (another embedding model) are skipped until the next reload.
+        """
+        dim = self.matrix.shape[1] if len(self) else None
+        ids, user_ids, vectors = [], [], []
+        for resume_id, (user_id, vector) in sorted(updates.items()):
+            vector = np.asarray(vector, dtype=np.float32)
+            if dim is not None and len(vector) != dim:
+                logger.warning(
+                    f"⚠️ Resume {resume_id} embedding has {len(vector)} dimensions, "
+                    f"expected {dim}; left out of the resume matrix"
+                )
+                continue
+            dim = len(vector)
+            ids.append(resume_id)
+            user_ids.append(user_id)
+            vectors.append(vector)
+        if not ids:
+            return self
+        ids = np.asarray(ids, dtype=np.int64)
+        rows = normalize_rows(np.stack(vectors)).astype(np.float32)
+
+        positions = np.searchsorted(self.resume_ids, ids)
+        found = positions < len(self)
+        found[found] = self.resume_ids[positions[found]] == ids[found]
+        matrix = np.array(self.matrix if len(self) else rows[:0])  # Writable copy
+        matrix[positions[found]] = rows[found]
+
+        resume_ids = np.concatenate([self.resume_ids, ids[~found]])
+        owners = np.concatenate(
+            [self.user_ids, np.asarray(user_ids, dtype=np.int64)[~found]]
+        )
+        matrix = np.concatenate([matrix, rows[~found]])
+        if len(resume_ids) and not np.all(resume_ids[:-1] < resume_ids[1:]):
+            order = np.argsort(resume_ids, kind="stable")
+            resume_ids, owners, matrix = resume_ids[order], owners[order], matrix[order]
+
+        updated = ResumeMatrix(resume_ids, owners, matrix, self.token)
+        updated.loaded_at = self.loaded_at
+        return updated
+
+
+_matrix = None
+_lock = threading.Lock()
+# Embeddings written in this process since the matrix was last updated
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def record_embedding(resume_id: int, user_id: int, vector):
+    """Called whenever a resume embedding is written in this process.
+
+    The row is replaced or appended on the next `get_resume_matrix` call;
+    writes from other processes show up when the TTL expires.
+    """
+    with _pending_lock:
+        _pending[resume_id] = (user_id, vector)
+
+
+def _apply_pending(matrix: ResumeMatrix) -> ResumeMatrix:
+    global _pending
+    with _pending_lock:
+        updates, _pending = _pending, {}
+    return matrix.with_rows(updates) if updates else matrix
+
+
+def _db_token(db_session: Session):
+    """Cheap fingerprint of the embedded resume set (catches other workers' inserts)."""
+    count, max_id = (
+        db_session.query(func.count(Resume.id), func.max(Resume.id))
+        .filter(Resume.embedding.isnot(None))
+        .one()
+    )
+    return count, max_id
+
+
+def _load(db_session: Session, token) -> ResumeMatrix:
+    started = time.perf_counter()
+    rows = (
+        db_session.query(Resume.id, Resume.user_id, Resume.embedding)
+        .filter(Resume.embedding.isnot(None))
+        .order_by(Resume.id)
+        .yield_per(5000)
+    )
+    resume_ids, user_ids, blobs = [], [], []
+    dim_bytes = None
+    skipped = 0
+    for resume_id, user_id, blob in rows:
+        dim_bytes = dim_bytes or len(blob)
+        if len(blob) != dim_bytes:
+            skipped += 1  # Embedded with a different model; skip until re-embedded
+            continue
+        resume_ids.append(resume_id)
+        user_ids.append(user_id)
+        blobs.append(blob)
+
+    if blobs:
+        matrix = np.frombuffer(b"".join(blobs), dtype=np.float32)
+        matrix = normalize_rows(matrix.reshape(len(blobs), -1)).astype(np.float32)
+    else:
+        matrix = np.zeros((0, 0), dtype=np.float32)
+    resume_ids = np.asarray(resume_ids, dtype=np.int64)
+    user_ids = np.asarray(user_ids, dtype=np.int64)
+
+    # ✅ Optionally persist and memory-map so all workers share the page cache
+    if RESUME_MATRIX_PATH and len(matrix):
+        tmp_path = f"{RESUME_MATRIX_PATH}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, matrix)
+        os.replace(tmp_path, f"{RESUME_MATRIX_PATH}.npy")
+        matrix = np.load(f"{RESUME_MATRIX_PATH}.npy", mmap_mode="r")
+
+    if skipped:
+        logger.warning(
+            f"⚠️ Skipped {skipped} resume embeddings whose dimension differs from "
+            f"the first one ({dim_bytes // 4}); they are matched once re-embedded"
+        )
+    logger.info(
+        f"✅ Loaded {len(resume_ids)} resume embeddings in "
+        f"{time.perf_counter() - started:.2f}s"
+    )
+    return ResumeMatrix(resume_ids, user_ids, matrix, token)
+
+
+def get_resume_matrix(db_session: Session) -> ResumeMatrix:
+    """Return the cached matrix, reloading it when expired and changed in the DB."""
+    global _matrix
+    current = _matrix
+    expired = (
+        current is None
+        or time.monotonic() - current.loaded_at > RESUME_MATRIX_TTL_SECONDS
+    )
+    if not expired and not _pending:
+        return current
+
+    with _lock:
+        if expired:
+            token = _db_token(db_session)
+            if _matrix is not None and _matrix.token == token:
+                _matrix.loaded_at = time.monotonic()  # Unchanged: extend the TTL
+            else:
+                _matrix = _load(db_session, token)
+        # ✅ Rows written here are applied in place instead of reloading every row
+        _matrix = _apply_pending(_matrix)
+        return _matrix
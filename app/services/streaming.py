@@ -0,0 +1,38 @@
+import json
+import logging
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+
+def sse(data: dict, event: str = None) -> str:
+    """Format one Server-Sent Event (JSON payload keeps newlines intact)."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+async def stream_completion(chunks, on_complete):
+    """Forward LLM chunks as `token` events, then persist the full text.
+
+    `on_complete(full_text)` is awaited once the stream finishes and its return
+    value is sent as the final `done` event.
+    """
+    parts = []
+    try:
+        async for chunk in chunks:
+            parts.append(chunk)
+            yield sse({"token": chunk})
+        result = await on_complete("".join(parts))
+    except Exception as e:
+        logger.error(f"❌ Streaming completion failed: {e}")
+        yield sse({"detail": "Generation failed"}, event="error")
+        return
+    yield sse(result, event="done")
+
+
+def sse_response(events) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
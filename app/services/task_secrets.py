@@ -0,0 +1,30 @@
+from cryptography.fernet import Fernet, InvalidToken
+from app.config import TASK_SECRET_KEY
+
+# ✅ Secrets passed to Celery tasks (e.g. a caller's LLM API key) are encrypted
+# with TASK_SECRET_KEY, so broker messages never carry them in plaintext
+_fernet = Fernet(TASK_SECRET_KEY) if TASK_SECRET_KEY else None
+
+
+def encrypt_secret(value: str = None) -> str:
+    """Encrypt a secret for a task message (None passes through)."""
+    if value is None:
+        return None
+    if _fernet is None:
+        raise ValueError(
+            "TASK_SECRET_KEY is not configured; use the streaming endpoint "
+            "to call the LLM with your own API key"
+        )
+    return _fernet.encrypt(value.encode()).decode()
+
+
+def decrypt_secret(token: str = None) -> str:
+    """Decrypt a secret in the worker (None passes through)."""
+    if token is None:
+        return None
+    if _fernet is None:
+        raise ValueError("TASK_SECRET_KEY is not configured on this worker")
+    try:
+        return _fernet.decrypt(token.encode()).decode()
+    except InvalidToken:
+        raise ValueError("Task secret was encrypted with a different TASK_SECRET_KEY")
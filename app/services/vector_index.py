@@ -0,0 +1,224 @@
+import logging
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:  # Optional approximate index; exact NumPy search is used without it
+    import hnswlib
+except ImportError:  # pragma: no cover - depends on the deployment
+    hnswlib = None
+
+# Below this size an exact scan is as fast as an HNSW lookup
+HNSW_MIN_ROWS = 20000
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first (O(n) selection + O(k log k) sort)."""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+class JobVectorIndex:
+    """In-process cosine index over job embeddings with metadata filters.
+
+    Rows live in one contiguous, L2-normalized float32 matrix so a query is a
+    single matrix-vector product, and a job_id -> row map makes single-job
+    lookups O(1). The matrix is over-allocated so `upsert` appends in amortized
+    O(1); `remove` moves the last row into the freed slot. When `hnswlib` is
+    installed and the index is large, an HNSW graph (labelled by row) is built
+    for approximate search instead and updated in place by `upsert`/`remove`.
+    """
+
+    def __init__(self, dim: int = None):
+        self.dim = dim
+        self.titles = []
+        self._size = 0
+        self._matrix = np.zeros((0, dim or 0), dtype=np.float32)
+        self._job_ids = np.zeros(0, dtype=np.int64)
+        self._user_ids = np.zeros(0, dtype=np.int64)
+        self._rows = {}
+        self._hnsw = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, job_id):
+        return int(job_id) in self._rows
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._matrix[: self._size]
+
+    @property
+    def job_ids(self) -> np.ndarray:
+        return self._job_ids[: self._size]
+
+    @property
+    def user_ids(self) -> np.ndarray:
+        return self._user_ids[: self._size]
+
+    def build(self, job_ids, embeddings, user_ids=None, titles=None):
+        """Replace the index contents in one shot."""
+        matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2:
+            matrix = matrix.reshape(len(job_ids), -1)
+        with self._lock:
+            self.dim = matrix.shape[1]
+            self._matrix = normalize_rows(matrix)
+            self._job_ids = np.asarray(job_ids, dtype=np.int64)
+            self._user_ids = np.asarray(
+                [-1 if u is None else u for u in (user_ids or [None] * len(job_ids))],
+                dtype=np.int64,
+            )
+            self.titles = list(titles or [None] * len(job_ids))
+            self._size = len(self._job_ids)
+            self._rows = {int(job_id): row for row, job_id in enumerate(self._job_ids)}
+            self._hnsw = None
+        self._ensure_hnsw()
+        return self
+
+    def get(self, job_id):
+        """The (normalized) embedding stored for a job, or None."""
+        with self._lock:
+            row = self._rows.get(int(job_id))
+            return None if row is None else self._matrix[row].copy()
+
+    def upsert(self, job_id, embedding, user_id=None, title=None):
+        """Insert a job's embedding, or replace it in place if already indexed."""
+        vector = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+        vector = normalize_rows(vector)[0]
+        with self._lock:
+            if self.dim is None or self._size == 0:
+                self.dim = len(vector)
+            elif len(vector) != self.dim:
+                raise ValueError(
+                    f"Embedding for Job {job_id} has {len(vector)} dims, index has {self.dim}"
+                )
+            row = self._rows.get(int(job_id))
+            if row is None:
+                row = self._size
+                self._grow(row + 1)
+                self._rows[int(job_id)] = row
+                self._size += 1
+                self.titles.append(title)
+            else:
+                self.titles[row] = title
+            self._matrix[row] = vector
+            self._job_ids[row] = job_id
+            self._user_ids[row] = -1 if user_id is None else user_id
+            self._hnsw_set(row)
+
+    def remove(self, job_id) -> bool:
+        """Drop a job from the index; returns False if it was not indexed."""
+        with self._lock:
+            row = self._rows.pop(int(job_id), None)
+            if row is None:
+                return False
+            last = self._size - 1
+            if row != last:
+                self._matrix[row] = self._matrix[last]
+                self._job_ids[row] = self._job_ids[last]
+                self._user_ids[row] = self._user_ids[last]
+                self.titles[row] = self.titles[last]
+                self._rows[int(self._job_ids[row])] = row
+                self._hnsw_set(row)
+            if self._hnsw is not None:
+                self._hnsw.mark_deleted(last)
+            self.titles.pop()
+            self._size = last
+            return True
+
+    def _grow(self, needed: int):
+        capacity = len(self._job_ids)
+        if needed <= capacity and self._matrix.shape[1] == self.dim:
+            return
+        capacity = max(needed, capacity * 2, 64)
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        job_ids = np.zeros(capacity, dtype=np.int64)
+        user_ids = np.full(capacity, -1, dtype=np.int64)
+        if self._size:
+            matrix[: self._size] = self.matrix
+            job_ids[: self._size] = self.job_ids
+            user_ids[: self._size] = self.user_ids
+        self._matrix, self._job_ids, self._user_ids = matrix, job_ids, user_ids
+
+    def _ensure_hnsw(self):
+        if hnswlib is None or self._size < HNSW_MIN_ROWS or self._hnsw is not None:
+            return
+        with self._lock:
+            if self._hnsw is None:
+                self._build_hnsw()
+
+    def _hnsw_set(self, row: int):
+        """Point HNSW label `row` at the row's current vector (re-adding it if deleted)."""
+        if self._hnsw is None:
+            return
+        if row >= self._hnsw.get_max_elements():
+            self._hnsw.resize_index(max(row + 1, self._hnsw.get_max_elements() * 2))
+        self._hnsw.add_items(self._matrix[row : row + 1], [row])
+
+    def _build_hnsw(self):
+        index = hnswlib.Index(space="ip", dim=self.dim)
+        index.init_index(max_elements=self._size, ef_construction=200, M=16)
+        index.add_items(self.matrix, np.arange(self._size))
+        index.set_ef(128)
+        self._hnsw = index
+
+    def _filter_mask(self, user_id=None, title=None):
+        if user_id is None and title is None:
+            return None
+        mask = np.ones(len(self.job_ids), dtype=bool)
+        if user_id is not None:
+            mask &= self.user_ids == user_id
+        if title is not None:
+            mask &= np.array([t == title for t in self.titles], dtype=bool)
+        return mask
+
+    def search(self, query, k: int = 10, user_id=None, title=None):
+        """Return [(job_id, cosine_similarity), ...] for the k nearest jobs."""
+        if self._size == 0 or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        self._ensure_hnsw()
+        with self._lock:
+            return self._search(query, k, user_id, title)
+
+    def _search(self, query, k, user_id, title):
+        mask = self._filter_mask(user_id, title)
+
+        if self._hnsw is not None:
+            allowed = None if mask is None else (lambda label: bool(mask[label]))
+            available = len(self.job_ids) if mask is None else int(mask.sum())
+            if available == 0:
+                return []
+            try:
+                labels, distances = self._hnsw.knn_query(
+                    query, k=min(k, available), filter=allowed
+                )
+            except RuntimeError:
+                # The graph walk reached fewer than k rows passing a selective
+                # filter: fall through to the exact scan
+                pass
+            else:
+                return [
+                    (int(self.job_ids[label]), float(1.0 - distance))
+                    for label, distance in zip(labels[0], distances[0])
+                ]
+
+        scores = self.matrix @ query
+        rows = np.arange(len(scores))
+        if mask is not None:
+            rows, scores = rows[mask], scores[mask]
+        best = top_k_indices(scores, k)
+        return [(int(self.job_ids[rows[i]]), float(scores[i])) for i in best]
@@ -0,0 +1,506 @@
+import logging
+from abc import ABC, abstractmethod
+import numpy as np
+from app.config import (
+    VECTOR_STORE_BACKEND,
+    CHROMA_HOST,
+    CHROMA_PORT,
+    CHROMA_PERSIST_DIR,
+    CHROMA_COLLECTION,
+)
+from app.services.vector_index import JobVectorIndex
+
+logger = logging.getLogger(__name__)
+
+
+# ✅ One record per job, keyed by job id so writes are idempotent upserts
+def vector_id(job_id: int) -> str:
+    return f"job-{job_id}"
+
+
+def vector_job_id(record_id: str) -> int:
+    """Inverse of `vector_id`."""
+    return int(record_id.removeprefix("job-"))
+
+
+def job_metadata(job_id: int, user_id=None, title=None, description_hash=None) -> dict:
+    """Record metadata for a job (user_id / title are top-k search filters)."""
+    metadata = {"job_id": str(job_id)}
+    if user_id is not None:
+        metadata["user_id"] = user_id
+    if title is not None:
+        metadata["title"] = title
+    if description_hash is not None:
+        metadata["description_hash"] = description_hash
+    return metadata
+
+
+def _entry_metadata(entry: dict) -> dict:
+    return job_metadata(
+        entry["job_id"],
+        entry.get("user_id"),
+        entry.get("title"),
+        entry.get("description_hash"),
+    )
+
+
+def _cosine(query, embeddings) -> np.ndarray:
+    matrix = np.asarray(embeddings, dtype=np.float32).reshape(len(embeddings), -1)
+    query = np.asarray(query, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+    norms[norms == 0] = 1.0
+    return matrix @ query / norms
+
+
+class VectorStore(ABC):
+    """Storage for job embeddings.
+
+    Entries passed to `upsert` / `update_metadata` are dicts with job_id, text,
+    embedding, user_id, title and description_hash. Metadata comes back in the
+    `job_metadata` format. `search` returns [(job_id, cosine_similarity), ...].
+    """
+
+    name = None
+    # True when `match_job` scores the stored vector in the database (one query)
+    supports_sql_match = False
+
+    @abstractmethod
+    def upsert(self, entries: list):
+        """Write (or replace) the records of the given jobs."""
+
+    @abstractmethod
+    def update_metadata(self, entries: list):
+        """Rewrite the filter metadata of existing records without re-embedding."""
+
+    @abstractmethod
+    def delete_jobs(self, job_ids: list):
+        """Drop every record of the given jobs."""
+
+    @abstractmethod
+    def delete_records(self, record_ids: list):
+        """Drop records by record id (only Chroma has records not keyed by job id)."""
+
+    @abstractmethod
+    def get_metadata(self, job_ids: list) -> dict:
+        """{job_id: metadata} for the given jobs' records."""
+
+    @abstractmethod
+    def iter_metadata(self, page_size: int = 5000):
+        """Yield (record id, metadata) for every record."""
+
+    @abstractmethod
+    def get_record(self, job_id: int):
+        """(embedding, metadata) of a job's record, or None."""
+
+    def get_records(self, job_ids: list) -> dict:
+        """{job_id: (embedding, metadata)} for the given jobs that have a record."""
+        records = {}
+        for job_id in job_ids:
+            record = self.get_record(job_id)
+            if record is not None:
+                records[job_id] = record
+        return records
+
+    @abstractmethod
+    def all_records(self):
+        """(record ids, metadatas, embeddings) for every record."""
+
+    @abstractmethod
+    def search(self, query_embedding, k: int, user_id=None, title=None, keyword=None):
+        """[(job_id, cosine similarity), ...] for the k best matching records."""
+
+    def match_job(self, job_id: int, query_embedding):
+        """Cosine similarity of a job's stored vector, or None if it has none."""
+        record = self.get_record(job_id)
+        if record is None:
+            return None
+        return float(_cosine(query_embedding, [record[0]])[0])
+
+
+# ✅ ChromaDB (embedded on-disk store, or a Chroma server when CHROMA_HOST is set)
+class ChromaVectorStore(VectorStore):
+    name = "chroma"
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    @classmethod
+    def connect(cls):
+        import chromadb
+
+        if CHROMA_HOST:
+            client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
+        else:
+            client = chromadb.PersistentClient(path=CHROMA_PERSIST_DIR)
+        # Embeddings are always computed by the app, never by Chroma
+        return cls(
+            client.get_or_create_collection(CHROMA_COLLECTION, embedding_function=None)
+        )
+
+    def upsert(self, entries: list):
+        self.collection.upsert(
+            ids=[vector_id(entry["job_id"]) for entry in entries],
+            embeddings=[list(map(float, entry["embedding"])) for entry in entries],
+            metadatas=[_entry_metadata(entry) for entry in entries],
+            documents=[entry["text"] for entry in entries],
+        )
+
+    def update_metadata(self, entries: list):
+        self.collection.update(
+            ids=[vector_id(entry["job_id"]) for entry in entries],
+            metadatas=[_entry_metadata(entry) for entry in entries],
+        )
+
+    def delete_jobs(self, job_ids: list):
+        self.collection.delete(
+            where={"job_id": {"$in": [str(job_id) for job_id in job_ids]}}
+        )
+
+    def delete_records(self, record_ids: list):
+        self.collection.delete(ids=list(record_ids))
+
+    def get_metadata(self, job_ids: list) -> dict:
+        results = self.collection.get(
+            ids=[vector_id(job_id) for job_id in job_ids], include=["metadatas"]
+        )
+        return {int(m["job_id"]): m for m in results.get("metadatas") or []}
+
+    def iter_metadata(self, page_size: int = 5000):
+        offset = 0
+        while True:
+            page = self.collection.get(
+                include=["metadatas"], limit=page_size, offset=offset
+            )
+            ids = page.get("ids") or []
+            yield from zip(ids, page.get("metadatas") or [])
+            if len(ids) < page_size:
+                return
+            offset += page_size
+
+    def get_record(self, job_id: int):
+        include = ["embeddings", "metadatas"]
+        results = self.collection.get(ids=[vector_id(job_id)], include=include)
+        if not results or not len(results["ids"]):
+            # Stored before records were keyed by job id
+            results = self.collection.get(
+                where={"job_id": str(job_id)}, include=include
+            )
+        if not results or not len(results["ids"]):
+            return None
+        return results["embeddings"][0], results["metadatas"][0]
+
+    def get_records(self, job_ids: list) -> dict:
+        include = ["embeddings", "metadatas"]
+        results = self.collection.get(
+            ids=[vector_id(job_id) for job_id in job_ids], include=include
+        )
+        records = {
+            int(metadata["job_id"]): (embedding, metadata)
+            for metadata, embedding in zip(results["metadatas"], results["embeddings"])
+        }
+        missing = [str(job_id) for job_id in job_ids if job_id not in records]
+        if missing:  # Stored before records were keyed by job id
+            results = self.collection.get(
+                where={"job_id": {"$in": missing}}, include=include
+            )
+            for metadata, embedding in zip(results["metadatas"], results["embeddings"]):
+                records.setdefault(int(metadata["job_id"]), (embedding, metadata))
+        return records
+
+    def all_records(self):
+        results = self.collection.get(include=["embeddings", "metadatas"])
+        return (
+            results.get("ids") or [],
+            results.get("metadatas") or [],
+            results.get("embeddings"),
+        )
+
+    def search(self, query_embedding, k: int, user_id=None, title=None, keyword=None):
+        query = {
+            "query_embeddings": [list(map(float, query_embedding))],
+            "n_results": k,
+            "include": ["metadatas", "embeddings"],
+        }
+        conditions = []
+        if user_id is not None:
+            conditions.append({"user_id": user_id})
+        if title is not None:
+            conditions.append({"title": title})
+        if conditions:
+            query["where"] = (
+                conditions[0] if len(conditions) == 1 else {"$and": conditions}
+            )
+        if keyword:
+            query["where_document"] = {"$contains": keyword}
+
+        results = self.collection.query(**query)
+        metadatas = results["metadatas"][0] if results["metadatas"] else []
+        embeddings = results["embeddings"][0] if results["embeddings"] else []
+        if not metadatas:
+            return []
+        # The collection's distance space is L2, so similarities are recomputed
+        similarities = _cosine(query_embedding, embeddings)
+        return [
+            (int(metadata["job_id"]), float(similarity))
+            for metadata, similarity in zip(metadatas, similarities)
+        ]
+
+
+# ✅ pgvector: job vectors live next to the `jobs` rows in Postgres
+class PgVectorStore(VectorStore):
+    """Vectors in the `job_embeddings` table; title / owner come from `jobs`.
+
+    Rows are removed by the `jobs` foreign-key cascade, so no metadata has to
+    be kept in sync and searches filter with a plain join.
+    """
+
+    name = "pgvector"
+    supports_sql_match = True
+
+    def __init__(self, session_factory=None):
+        from app.database import SessionLocal
+
+        self.session_factory = session_factory or SessionLocal
+
+    def _metadata_query(self):
+        from sqlalchemy import select
+        from app.models.job import Job
+        from app.models.job_embedding import JobEmbedding
+
+        return select(
+            JobEmbedding.job_id,
+            JobEmbedding.description_hash,
+            Job.user_id,
+            Job.title,
+        ).join(Job, Job.id == JobEmbedding.job_id)
+
+    @staticmethod
+    def _metadata(row) -> dict:
+        return job_metadata(row.job_id, row.user_id, row.title, row.description_hash)
+
+    def upsert(self, entries: list):
+        from sqlalchemy.dialects.postgresql import insert
+        from app.models.job_embedding import JobEmbedding
+
+        stmt = insert(JobEmbedding).values(
+            [
+                {
+                    "job_id": entry["job_id"],
+                    "embedding": list(map(float, entry["embedding"])),
+                    "description_hash": entry.get("description_hash"),
+                }
+                for entry in entries
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JobEmbedding.job_id],
+            set_={
+                "embedding": stmt.excluded.embedding,
+                "description_hash": stmt.excluded.description_hash,
+            },
+        )
+        with self.session_factory() as session:
+            session.execute(stmt)
+            session.commit()
+
+    def update_metadata(self, entries: list):
+        pass  # Title / owner are read from `jobs` at query time
+
+    def delete_jobs(self, job_ids: list):
+        from sqlalchemy import delete
+        from app.models.job_embedding import JobEmbedding
+
+        with self.session_factory() as session:
+            session.execute(
+                delete(JobEmbedding).where(JobEmbedding.job_id.in_(job_ids))
+            )
+            session.commit()
+
+    def delete_records(self, record_ids: list):
+        self.delete_jobs([vector_job_id(record_id) for record_id in record_ids])
+
+    def get_metadata(self, job_ids: list) -> dict:
+        from app.models.job_embedding import JobEmbedding
+
+        query = self._metadata_query().where(JobEmbedding.job_id.in_(job_ids))
+        with self.session_factory() as session:
+            return {row.job_id: self._metadata(row) for row in session.execute(query)}
+
+    def iter_metadata(self, page_size: int = 5000):
+        query = self._metadata_query().execution_options(yield_per=page_size)
+        with self.session_factory() as session:
+            for row in session.execute(query):
+                yield vector_id(row.job_id), self._metadata(row)
+
+    def get_record(self, job_id: int):
+        from app.models.job_embedding import JobEmbedding
+
+        query = self._metadata_query().add_columns(JobEmbedding.embedding)
+        with self.session_factory() as session:
+            row = session.execute(query.where(JobEmbedding.job_id == job_id)).first()
+        if row is None:
+            return None
+        return np.asarray(row.embedding, dtype=np.float32), self._metadata(row)
+
+    def get_records(self, job_ids: list) -> dict:
+        from app.models.job_embedding import JobEmbedding
+
+        query = (
+            self._metadata_query()
+            .add_columns(JobEmbedding.embedding)
+            .where(JobEmbedding.job_id.in_(job_ids))
+        )
+        with self.session_factory() as session:
+            return {
+                row.job_id: (
+                    np.asarray(row.embedding, dtype=np.float32),
+                    self._metadata(row),
+                )
+                for row in session.execute(query)
+            }
+
+    def all_records(self):
+        from app.models.job_embedding import JobEmbedding
+
+        query = self._metadata_query().add_columns(JobEmbedding.embedding)
+        with self.session_factory() as session:
+            rows = session.execute(query).all()
+        return (
+            [vector_id(row.job_id) for row in rows],
+            [self._metadata(row) for row in rows],
+            [row.embedding for row in rows],
+        )
+
+    def search(self, query_embedding, k: int, user_id=None, title=None, keyword=None):
+        """Top-k by cosine distance.
+
+        Filters are applied to the `hnsw.ef_search` candidates the HNSW index
+        returns, so a selective filter can yield fewer than k rows.
+        """
+        from app.models.job import Job
+        from app.models.job_embedding import JobEmbedding
+
+        distance = JobEmbedding.embedding.cosine_distance(
+            list(map(float, query_embedding))
+        )
+        query = (
+            self._metadata_query()
+            .add_columns((1 - distance).label("similarity"))
+            .order_by(distance)  # Served by the HNSW / IVFFlat index
+            .limit(k)
+        )
+        if user_id is not None:
+            query = query.where(Job.user_id == user_id)
+        if title is not None:
+            query = query.where(Job.title == title)
+        if keyword:
+            query = query.where(Job.description.contains(keyword, autoescape=True))
+        with self.session_factory() as session:
+            return [
+                (row.job_id, float(row.similarity)) for row in session.execute(query)
+            ]
+
+    def match_job(self, job_id: int, query_embedding):
+        """Vector lookup and cosine distance in one query."""
+        from sqlalchemy import select
+        from app.models.job_embedding import JobEmbedding
+
+        distance = JobEmbedding.embedding.cosine_distance(
+            list(map(float, query_embedding))
+        )
+        query = select((1 - distance).label("similarity")).where(
+            JobEmbedding.job_id == job_id
+        )
+        with self.session_factory() as session:
+            similarity = session.execute(query).scalar()
+        return None if similarity is None else float(similarity)
+
+
+# ✅ Pure NumPy, in memory (tests and local experiments; nothing is persisted)
+class NumpyVectorStore(VectorStore):
+    name = "numpy"
+
+    def __init__(self):
+        self.index = JobVectorIndex()
+        self.metadata = {}
+        self.texts = {}
+
+    def upsert(self, entries: list):
+        for entry in entries:
+            job_id = entry["job_id"]
+            self.index.upsert(
+                job_id, entry["embedding"], entry.get("user_id"), entry.get("title")
+            )
+            self.metadata[job_id] = _entry_metadata(entry)
+            self.texts[job_id] = entry["text"]
+
+    def update_metadata(self, entries: list):
+        for entry in entries:
+            job_id = entry["job_id"]
+            embedding = self.index.get(job_id)
+            if embedding is not None:
+                self.index.upsert(
+                    job_id, embedding, entry.get("user_id"), entry.get("title")
+                )
+                self.metadata[job_id] = _entry_metadata(entry)
+
+    def delete_jobs(self, job_ids: list):
+        for job_id in job_ids:
+            self.index.remove(job_id)
+            self.metadata.pop(job_id, None)
+            self.texts.pop(job_id, None)
+
+    def delete_records(self, record_ids: list):
+        self.delete_jobs([vector_job_id(record_id) for record_id in record_ids])
+
+    def get_metadata(self, job_ids: list) -> dict:
+        return {
+            job_id: self.metadata[job_id]
+            for job_id in job_ids
+            if job_id in self.metadata
+        }
+
+    def iter_metadata(self, page_size: int = 5000):
+        for job_id, metadata in list(self.metadata.items()):
+            yield vector_id(job_id), metadata
+
+    def get_record(self, job_id: int):
+        embedding = self.index.get(job_id)
+        if embedding is None:
+            return None
+        return embedding, self.metadata[job_id]
+
+    def all_records(self):
+        job_ids = [int(job_id) for job_id in self.index.job_ids]
+        return (
+            [vector_id(job_id) for job_id in job_ids],
+            [self.metadata[job_id] for job_id in job_ids],
+            self.index.matrix.copy(),
+        )
+
+    def search(self, query_embedding, k: int, user_id=None, title=None, keyword=None):
+        if not keyword:
+            return self.index.search(query_embedding, k, user_id=user_id, title=title)
+        hits = self.index.search(
+            query_embedding, len(self.index), user_id=user_id, title=title
+        )
+        return [hit for hit in hits if keyword in self.texts[hit[0]]][:k]
+
+
+_BACKENDS = {
+    "chroma": ChromaVectorStore.connect,
+    "pgvector": PgVectorStore,
+    "numpy": NumpyVectorStore,
+}
+
+
+def create_vector_store(backend: str = None) -> VectorStore:
+    """Instantiate the configured backend (VECTOR_STORE_BACKEND by default)."""
+    backend = backend or VECTOR_STORE_BACKEND
+    if backend not in _BACKENDS:
+        raise ValueError(
+            f"Unknown VECTOR_STORE_BACKEND '{backend}' (expected one of {sorted(_BACKENDS)})"
+        )
+    store = _BACKENDS[backend]()
+    logger.info(f"✅ Vector store backend: {backend}")
+    return store
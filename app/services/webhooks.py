@@ -0,0 +1,59 @@
+import ipaddress
+import logging
+import socket
+from urllib.parse import urlsplit
+import httpx
+from fastapi import HTTPException, Query
+from app.config import WEBHOOK_TIMEOUT_SECONDS, WEBHOOK_ALLOWED_HOSTS
+
+logger = logging.getLogger(__name__)
+
+
+def validate_callback_url(url: str) -> str:
+    """Return `url` if it is safe to POST to from a worker, else raise ValueError.
+
+    Callbacks must be https. With WEBHOOK_ALLOWED_HOSTS set only those hosts are
+    accepted; otherwise every address the host resolves to must be public (no
+    private, loopback, link-local or otherwise reserved ranges), so callbacks
+    cannot reach the compose network or cloud metadata endpoints.
+    """
+    parts = urlsplit(url)
+    if parts.scheme != "https" or not parts.hostname:
+        raise ValueError("callback_url must be an https URL")
+    host = parts.hostname.lower()
+    if WEBHOOK_ALLOWED_HOSTS:
+        if host not in WEBHOOK_ALLOWED_HOSTS:
+            raise ValueError(f"callback_url host {host} is not allowed")
+        return url
+
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, parts.port or 443)}
+    except (socket.gaierror, UnicodeError):
+        raise ValueError(f"callback_url host {host} does not resolve")
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%")[0])  # Strip IPv6 zone ids
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError(f"callback_url host {host} is not a public address")
+    return url
+
+
+# ✅ Query parameter dependency: rejects unsafe callback URLs when the request arrives
+# (a sync dependency, so the DNS lookup runs in the threadpool)
+def callback_url_param(callback_url: str = Query(None)) -> str:
+    if callback_url is None:
+        return None
+    try:
+        return validate_callback_url(callback_url)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def send_webhook(url: str, payload: dict):
+    """POST a task completion payload; failures are logged, never raised."""
+    try:
+        # Re-checked at send time: the host may resolve differently by now
+        validate_callback_url(url)
+        response = httpx.post(url, json=payload, timeout=WEBHOOK_TIMEOUT_SECONDS)
+        response.raise_for_status()
+    except Exception as e:
+        logger.warning(f"⚠️ Webhook to {url} failed: {e}")
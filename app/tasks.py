@@ -0,0 +1,158 @@
+import logging
+import httpx
+from celery import Task
+from celery.utils.time import get_exponential_backoff_interval
+from sqlalchemy.exc import OperationalError
+from app.config import TASK_MAX_RETRIES
+from app.database import SessionLocal
+from app.models.resume import Resume
+from app.schemas.resume import ResumeResponse
+from app.services.ai import improve_resume, summarize_experience, resume_summary_input
+from app.services.job_sync import sync_jobs, reconcile_job_vectors
+from app.services.job_matching import delete_job_embeddings
+from app.services.match_store import (
+    refresh_matches_for_resume,
+    refresh_matches_for_resumes,
+)
+from app.services.task_secrets import decrypt_secret
+from app.services.webhooks import send_webhook
+from app.worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+def is_transient(exc: Exception) -> bool:
+    """Failures a later attempt can fix: lost connections, timeouts, rate limits, 5xx."""
+    if isinstance(
+        exc, (ConnectionError, TimeoutError, httpx.TransportError, OperationalError)
+    ):
+        return True
+    import openai  # Loaded with the LLM stack; only needed once a task failed
+
+    if isinstance(exc, (openai.APIConnectionError, openai.RateLimitError)):
+        return True  # APITimeoutError is an APIConnectionError
+    return isinstance(exc, openai.APIStatusError) and exc.status_code >= 500
+
+
+class WebhookTask(Task):
+    """Retries transient failures with backoff, then notifies `callback_url` once
+    the task settles.
+
+    Anything else (bad input, a rotated TASK_SECRET_KEY, a 4xx from the LLM
+    provider) fails right away.
+    """
+
+    max_retries = TASK_MAX_RETRIES
+    retry_backoff_max = 600
+
+    def __call__(self, *args, **kwargs):
+        try:
+            return super().__call__(*args, **kwargs)
+        except Exception as exc:
+            if not is_transient(exc):
+                raise
+            countdown = get_exponential_backoff_interval(
+                factor=1,
+                retries=self.request.retries,
+                maximum=self.retry_backoff_max,
+                full_jitter=True,
+            )
+            raise self.retry(exc=exc, countdown=countdown)
+
+    def on_success(self, retval, task_id, args, kwargs):
+        self._notify(
+            kwargs, {"task_id": task_id, "status": "SUCCESS", "result": retval}
+        )
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        self._notify(
+            kwargs, {"task_id": task_id, "status": "FAILURE", "error": str(exc)}
+        )
+
+    def _notify(self, kwargs, payload):
+        callback_url = kwargs.get("callback_url")
+        if callback_url:
+            send_webhook(callback_url, payload)
+
+
+# ✅ Summarize + embed a job (if its description changed), upsert it in the vector store
+# and refresh match scores
+@celery_app.task(base=WebhookTask)
+def store_job_task(job_id: int, callback_url: str = None) -> dict:
+    db = SessionLocal()
+    try:
+        result = sync_jobs([job_id], db)
+        if result["deleted"]:
+            return {"job_id": job_id, "detail": "Job not found"}
+        return {"job_id": job_id}
+    finally:
+        db.close()
+
+
+# ✅ Drop vectors of deleted jobs (job or user deletes)
+@celery_app.task(base=WebhookTask)
+def delete_job_vectors_task(job_ids: list, callback_url: str = None) -> dict:
+    return {"deleted": delete_job_embeddings(job_ids)}
+
+
+# ✅ Diff the jobs table against the vector store: re-sync stale jobs, drop orphans
+@celery_app.task(base=WebhookTask)
+def reconcile_job_vectors_task(callback_url: str = None) -> dict:
+    db = SessionLocal()
+    try:
+        return reconcile_job_vectors(db)
+    finally:
+        db.close()
+
+
+# ✅ Batched summaries + embeddings + match scores for bulk-uploaded resumes
+@celery_app.task(base=WebhookTask)
+def embed_resumes_task(resume_ids: list, callback_url: str = None) -> dict:
+    db = SessionLocal()
+    try:
+        resumes = db.query(Resume).filter(Resume.id.in_(resume_ids)).all()
+        refresh_matches_for_resumes(resumes, db)
+        return {"resume_ids": [resume.id for resume in resumes]}
+    finally:
+        db.close()
+
+
+# ✅ LLM improvement + summary + re-embedding for a resume
+@celery_app.task(base=WebhookTask)
+def improve_resume_task(
+    resume_id: int,
+    user_model: str = None,
+    encrypted_api_key: str = None,
+    no_cache: bool = False,
+    callback_url: str = None,
+) -> dict:
+    """`encrypted_api_key` is the caller's key encrypted with `encrypt_secret`."""
+    # Read the input, then release the connection for the duration of the LLM call
+    db = SessionLocal()
+    try:
+        resume = db.query(Resume).filter(Resume.id == resume_id).first()
+        if not resume:
+            return {"resume_id": resume_id, "detail": "Resume not found"}
+        experience = resume.experience
+    finally:
+        db.close()
+
+    improved_text = improve_resume(
+        experience, user_model, decrypt_secret(encrypted_api_key), bypass_cache=no_cache
+    )
+    summary_text = summarize_experience(resume_summary_input(improved_text))
+
+    db = SessionLocal()
+    try:
+        resume = db.query(Resume).filter(Resume.id == resume_id).first()
+        if not resume:
+            return {"resume_id": resume_id, "detail": "Resume not found"}
+        resume.improved_experience = improved_text
+        resume.summary_experience = summary_text
+        db.commit()
+
+        refresh_matches_for_resume(resume, db)
+        db.refresh(resume)
+        return ResumeResponse.model_validate(resume).model_dump()
+    finally:
+        db.close()
@@ -0,0 +1,17 @@
+from sqlalchemy.orm import Query
+
+
+# ✅ Keyset (cursor) pagination: every page is an index range scan, unlike OFFSET
+def keyset_page(query: Query, key, cursor=None, limit: int = 50):
+    """Return (rows, next_cursor) for the page of `query` after `cursor`.
+
+    `key` must be a unique, indexed column (the primary key); rows are ordered
+    by it and `next_cursor` is the key of the last row, or None on the last page.
+    """
+    if cursor is not None:
+        query = query.filter(key > cursor)
+    rows = query.order_by(key).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, getattr(rows[-1], key.key)
@@ -1,35 +1,191 @@
-import fitz  # PyMuPDF
-import pdfplumber
+import hashlib
+import io
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from app.config import (
+    PDF_MAX_PAGES,
+    PDF_TIME_LIMIT_SECONDS,
+    PDF_MIN_PAGE_CHARS,
+    PDF_PAGE_CACHE_SIZE,
+)
 
+logger = logging.getLogger(__name__)
 
-def extract_text_pymupdf(pdf_path: str) -> str:
+
+# A PDF source is either a file path or the raw document bytes (parsed in memory).
+# The parser libraries are imported on first use to keep them off the API import path.
+def _open_pymupdf(source):
+    import fitz  # PyMuPDF
+
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+def _open_pdfplumber(source):
+    import pdfplumber
+
+    if isinstance(source, (bytes, bytearray)):
+        return pdfplumber.open(io.BytesIO(source))
+    return pdfplumber.open(source)
+
+
+def extract_text_pymupdf(source) -> str:
     """Extract text from a PDF using PyMuPDF"""
-    doc = fitz.open(pdf_path)
-    text = "\n".join([page.get_text("text") for page in doc])
+    with _open_pymupdf(source) as doc:
+        text = "\n".join([page.get_text("text") for page in doc])
     return text
 
 
-def extract_text_pdfplumber(pdf_path: str) -> str:
+def extract_text_pdfplumber(source) -> str:
     """Extract text from a PDF using pdfplumber"""
-    with pdfplumber.open(pdf_path) as pdf:
-        text = "\n".join(
-            [page.extract_text() for page in pdf.pages if page.extract_text()]
-        )
+    with _open_pdfplumber(source) as pdf:
+        page_texts = (page.extract_text() for page in pdf.pages)
+        text = "\n".join([page_text for page_text in page_texts if page_text])
     return text
 
 
-def parse_experience(text: str) -> str:
-    """Extract and format relevant experience from the parsed text"""
-    lines = text.split("\n")
-    experience_lines = [
-        line
-        for line in lines
-        # if "experience" in line.lower() or "work history" in line.lower()
+# ✅ Page-level extraction with per-page fallback
+@dataclass
+class PdfExtraction:
+    text: str
+    page_count: int  # Pages in the document
+    pages_extracted: int
+    fallback_pages: list = field(default_factory=list)  # Re-read with pdfplumber
+    cached_pages: int = 0
+    truncated: bool = False  # Page or time limit reached
+    timings: dict = field(default_factory=dict)  # Seconds per stage
+
+
+_page_cache = OrderedDict()  # (document hash, page index) -> text
+_page_cache_lock = threading.Lock()
+
+
+def _cache_get(key):
+    with _page_cache_lock:
+        text = _page_cache.get(key)
+        if text is not None:
+            _page_cache.move_to_end(key)
+        return text
+
+
+def _cache_set(key, text: str):
+    with _page_cache_lock:
+        _page_cache[key] = text
+        _page_cache.move_to_end(key)
+        while len(_page_cache) > PDF_PAGE_CACHE_SIZE:
+            _page_cache.popitem(last=False)
+
+
+def page_text_ok(text: str) -> bool:
+    """Heuristic: enough characters, mostly readable (not a scan or garbled font)."""
+    stripped = "".join(text.split())
+    if len(stripped) < PDF_MIN_PAGE_CHARS:
+        return False
+    readable = sum(ch.isalnum() or ch in ".,;:()-/&@%+'\"" for ch in stripped)
+    garbled = stripped.count("\ufffd")  # Unicode replacement character
+    return readable / len(stripped) >= 0.6 and garbled / len(stripped) < 0.05
+
+
+def extract_pages(source, max_pages=None, time_limit=None) -> PdfExtraction:
+    """Extract text page by page: PyMuPDF first, pdfplumber only for bad pages."""
+    max_pages = max_pages or PDF_MAX_PAGES
+    time_limit = time_limit or PDF_TIME_LIMIT_SECONDS
+    started = time.perf_counter()
+    deadline = started + time_limit
+
+    if not isinstance(source, (bytes, bytearray)):
+        with open(source, "rb") as f:
+            source = f.read()
+    doc_hash = hashlib.sha256(source).hexdigest()
+
+    texts = {}
+    cached = set()
+    truncated = False
+    with _open_pymupdf(source) as doc:
+        page_count = doc.page_count
+        pages_to_read = min(page_count, max_pages)
+        truncated = page_count > max_pages
+        opened = time.perf_counter()
+
+        for index in range(pages_to_read):
+            if time.perf_counter() > deadline:
+                truncated = True
+                break
+            cached_text = _cache_get((doc_hash, index))
+            if cached_text is not None:
+                texts[index] = cached_text
+                cached.add(index)
+            else:
+                texts[index] = doc[index].get_text("text")
+    pymupdf_done = time.perf_counter()
+
+    # ✅ Fall back to pdfplumber only for uncached pages PyMuPDF handled badly
+    fallback_pages = [
+        index
+        for index, text in texts.items()
+        if index not in cached and not page_text_ok(text)
     ]
-    return "\n".join(experience_lines)
+    reread = set()
+    if fallback_pages and time.perf_counter() < deadline:
+        with _open_pdfplumber(source) as pdf:
+            for index in fallback_pages:
+                if time.perf_counter() > deadline:
+                    truncated = True
+                    break
+                reread.add(index)
+                alternative = pdf.pages[index].extract_text() or ""
+                if page_text_ok(alternative) or len(alternative.strip()) > len(
+                    texts[index].strip()
+                ):
+                    texts[index] = alternative
+    finished = time.perf_counter()
+
+    # Pages whose fallback was skipped by the deadline are not cached, so the
+    # next extraction of the document gets to re-read them with pdfplumber
+    for index, text in texts.items():
+        if index not in cached and (index in reread or index not in fallback_pages):
+            _cache_set((doc_hash, index), text)
+
+    return PdfExtraction(
+        text="\n".join(texts[index] for index in sorted(texts)),
+        page_count=page_count,
+        pages_extracted=len(texts),
+        fallback_pages=fallback_pages,
+        cached_pages=len(cached),
+        truncated=truncated,
+        timings={
+            "open": round(opened - started, 4),
+            "pymupdf": round(pymupdf_done - opened, 4),
+            "pdfplumber": round(finished - pymupdf_done, 4),
+            "total": round(finished - started, 4),
+        },
+    )
+
+
+def parse_experience(text: str) -> str:
+    """Normalize extracted text: trim lines and collapse runs of blank lines.
+
+    Sectioning happens on the stored text (see `app.utils.resume_sections`).
+    """
+    lines = []
+    for line in text.split("\n"):
+        line = line.rstrip()
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return "\n".join(lines).strip()
 
 
-def extract_experience_from_pdf(pdf_path: str) -> str:
-    """Extract structured experience from a PDF resume"""
-    text = extract_text_pymupdf(pdf_path) or extract_text_pdfplumber(pdf_path)
-    return parse_experience(text)
+def extract_experience_from_pdf(source) -> str:
+    """Extract structured experience from a PDF resume (path or bytes)"""
+    extraction = extract_pages(source)
+    logger.info(
+        f"📄 Extracted {extraction.pages_extracted}/{extraction.page_count} pages "
+        f"({len(extraction.fallback_pages)} via pdfplumber, "
+        f"{extraction.cached_pages} cached) in {extraction.timings}"
+        + (" - truncated by page/time limit" if extraction.truncated else "")
+    )
+    return parse_experience(extraction.text)
@@ -0,0 +1,93 @@
+import re
+
+# ✅ Canonical sections and the headings that introduce them
+SECTION_ALIASES = {
+    "summary": [
+        "summary",
+        "professional summary",
+        "profile",
+        "professional profile",
+        "objective",
+        "career objective",
+        "about me",
+        "about",
+    ],
+    "experience": [
+        "experience",
+        "work experience",
+        "professional experience",
+        "work history",
+        "employment history",
+        "employment",
+        "career history",
+    ],
+    "education": ["education", "academic background", "education and training"],
+    "skills": [
+        "skills",
+        "technical skills",
+        "core competencies",
+        "key skills",
+        "technologies",
+        "skills and technologies",
+    ],
+    "projects": ["projects", "personal projects", "key projects", "selected projects"],
+}
+
+_HEADING_TO_SECTION = {
+    alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases
+}
+
+# Sections that describe what a candidate can do; education and the contact
+# header are left out of summarization and embedding
+MATCHING_SECTIONS = ["summary", "experience", "skills", "projects"]
+
+_DECORATION = re.compile(r"^[#*_\s>-]+|[#*_:\s]+$")
+
+
+def _heading_section(line: str):
+    """Return the section a line introduces, or None if it is not a heading."""
+    if len(line) > 60:
+        return None
+    heading = _DECORATION.sub("", line).lower().replace("&", "and")
+    return _HEADING_TO_SECTION.get(heading)
+
+
+def split_sections(text: str) -> dict:
+    """Split resume text into {section: text}; text before any heading is "header"."""
+    sections = {}
+    current = "header"
+    lines = []
+    for line in text.splitlines():
+        section = _heading_section(line.strip())
+        if section:
+            if lines:
+                sections[current] = (
+                    sections.get(current, "") + "\n" + "\n".join(lines)
+                ).strip()
+            current, lines = section, []
+        else:
+            lines.append(line)
+    if lines:
+        sections[current] = (
+            sections.get(current, "") + "\n" + "\n".join(lines)
+        ).strip()
+    return {name: body for name, body in sections.items() if body}
+
+
+def matching_text(sections: dict, budget: int, fallback: str = "") -> str:
+    """Join the matching sections, giving each a fair share of a character budget.
+
+    Short sections keep all their text and donate the unused budget to longer
+    ones, so a long experience section can no longer crowd out skills.
+    """
+    parts = [(name, sections[name]) for name in MATCHING_SECTIONS if sections.get(name)]
+    if not parts:
+        return fallback[:budget]
+
+    remaining = budget - 2 * (len(parts) - 1)  # Room for the separators
+    allowance = {}
+    for position, (name, body) in enumerate(sorted(parts, key=lambda p: len(p[1]))):
+        share = remaining // (len(parts) - position)
+        allowance[name] = min(len(body), share)
+        remaining -= allowance[name]
+    return "\n\n".join(body[: allowance[name]] for name, body in parts)
@@ -0,0 +1,45 @@
+from celery import Celery
+from app.config import (
+    CELERY_BROKER_URL,
+    CELERY_RESULT_BACKEND,
+    CELERY_TASK_ALWAYS_EAGER,
+    TASK_RESULT_EXPIRES,
+    VECTOR_RECONCILE_INTERVAL_SECONDS,
+)
+
+# ✅ Celery app shared by the API (to enqueue) and the workers (to execute)
+#
+# Each task type has its own queue so worker pools scale independently:
+#   celery -A app.worker worker -Q embeddings -c 2   # BART / MiniLM (CPU bound)
+#   celery -A app.worker worker -Q llm -c 32 -P threads   # OpenRouter (I/O bound)
+celery_app = Celery(
+    "ai_resume",
+    broker=CELERY_BROKER_URL,
+    backend=CELERY_RESULT_BACKEND,
+    include=["app.tasks"],
+)
+
+celery_app.conf.update(
+    task_routes={
+        "app.tasks.store_job_task": {"queue": "embeddings"},
+        "app.tasks.delete_job_vectors_task": {"queue": "embeddings"},
+        "app.tasks.reconcile_job_vectors_task": {"queue": "embeddings"},
+        "app.tasks.embed_resumes_task": {"queue": "embeddings"},
+        "app.tasks.improve_resume_task": {"queue": "llm"},
+    },
+    task_track_started=True,
+    task_acks_late=True,  # Re-deliver if a worker dies mid-task
+    worker_prefetch_multiplier=1,  # Long tasks: don't hoard messages
+    result_expires=TASK_RESULT_EXPIRES,
+    task_always_eager=CELERY_TASK_ALWAYS_EAGER,
+    task_store_eager_result=True,
+)
+
+# ✅ Periodic vector store reconciliation (run `celery -A app.worker beat` alongside workers)
+if VECTOR_RECONCILE_INTERVAL_SECONDS > 0:
+    celery_app.conf.beat_schedule = {
+        "reconcile-job-vectors": {
+            "task": "app.tasks.reconcile_job_vectors_task",
+            "schedule": VECTOR_RECONCILE_INTERVAL_SECONDS,
+        }
+    }
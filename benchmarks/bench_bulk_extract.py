@@ -0,0 +1,43 @@
+"""Bulk PDF extraction throughput vs. number of worker processes.
+
+Usage:
+    python -m benchmarks.bench_bulk_extract --documents 400 --pages 3
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.utils.pdf_parser import extract_experience_from_pdf
+from benchmarks.bench_pdf_upload import make_pdf
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    data = make_pdf(args.pages)
+    documents = [data] * args.documents
+    baseline = None
+    print(f"documents={args.documents} pages={args.pages}")
+    print(f"{'procs':>5} {'docs/s':>9} {'speedup':>8}")
+    processes = 1
+    while processes <= args.max_processes:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            list(
+                pool.map(extract_experience_from_pdf, documents[:processes])
+            )  # warm-up
+            started = time.perf_counter()
+            list(pool.map(extract_experience_from_pdf, documents, chunksize=8))
+            rate = args.documents / (time.perf_counter() - started)
+        baseline = baseline or rate
+        print(f"{processes:>5} {rate:>9.1f} {rate / baseline:>7.2f}x")
+        processes *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Database pool usage under concurrent AI requests.
+
+Fires `--requests` concurrent cover-letter generations (each waits on the LLM)
+at a running app and polls `/health/db` meanwhile. With sessions released
+before the LLM call, the peak number of checked-out connections stays far
+below the concurrency and no request fails with a pool timeout.
+
+Start the fake LLM server and the app with a small pool first:
+    uvicorn benchmarks.fake_openai_server:app --port 9000
+    OPENROUTER_API_BASE=http://localhost:9000/v1 DB_POOL_SIZE=5 DB_MAX_OVERFLOW=0 \\
+        DB_POOL_TIMEOUT=5 uvicorn app.main:app --port 8000
+
+Then, for a user whose resume is linked to the job:
+    python -m benchmarks.bench_db_pool --user-id 1 --job-id 1 --requests 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def poll_pool(client: httpx.AsyncClient, peaks: dict, done: asyncio.Event):
+    while not done.is_set():
+        stats = (await client.get("/health/db")).json()
+        for name, pool in stats.items():
+            peaks[name] = max(peaks.get(name, 0), pool["checked_out"] or 0)
+        await asyncio.sleep(0.05)
+
+
+async def generate(client: httpx.AsyncClient, path: str, latencies: list) -> int:
+    started = time.perf_counter()
+    try:
+        response = await client.post(path, params={"no_cache": "true"})
+    except httpx.HTTPError:
+        return 0
+    latencies.append(time.perf_counter() - started)
+    return response.status_code
+
+
+async def run(args):
+    path = f"/cover-letters/{args.user_id}/{args.job_id}/generate"
+    limits = httpx.Limits(max_connections=args.requests + 1)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        peaks, latencies, done = {}, [], asyncio.Event()
+        poller = asyncio.create_task(poll_pool(client, peaks, done))
+        started = time.perf_counter()
+        statuses = await asyncio.gather(
+            *(generate(client, path, latencies) for _ in range(args.requests))
+        )
+        elapsed = time.perf_counter() - started
+        done.set()
+        await poller
+
+    ok = sum(status == 200 for status in statuses)
+    latencies.sort()
+    print(f"requests={args.requests} ok={ok} failed={args.requests - ok}")
+    print(f"throughput={args.requests / elapsed:.1f} req/s")
+    if latencies:
+        print(
+            f"latency p50={statistics.median(latencies):.2f}s "
+            f"p95={latencies[int(len(latencies) * 0.95) - 1]:.2f}s"
+        )
+    print(
+        "peak checked-out connections: "
+        + ", ".join(f"{name}={peak}" for name, peak in peaks.items())
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--job-id", type=int, required=True)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=120)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Latency and ranking quality of the two matching embedding modes.
+
+"summarize" embeds a BART summary of at most 1024 characters; "chunked" embeds
+token-bounded chunks of the whole document in one MiniLM batch and pools them.
+The fixture corpus pairs each job with one resume whose role-specific
+experience sits after a long generic summary and an unrelated earlier role, the
+way most real resumes are laid out. Quality is how highly each resume ranks its
+own job (recall@1 and MRR).
+
+Usage:
+    python -m benchmarks.bench_embedding_modes
+    python -m benchmarks.bench_embedding_modes --repeat 3
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.ai import resume_summary_input, summarize_experience
+from app.services.inference import (
+    embed,
+    embed_chunked,
+    embedding_cache,
+    summary_cache,
+)
+from app.services.model_registry import warm_up
+from app.utils.resume_sections import matching_text, split_sections
+
+GENERIC_SUMMARY = (
+    "Dependable, detail-oriented professional with a strong work ethic and a track "
+    "record of delivering results in fast-paced environments. Excellent written and "
+    "verbal communication skills, comfortable presenting to stakeholders at every "
+    "level of the organization. Collaborative team player who also works well "
+    "independently, manages competing priorities, and meets tight deadlines. "
+    "Passionate about continuous learning, mentoring colleagues, and improving "
+    "processes. Known for a positive attitude, adaptability, and a customer-first "
+    "mindset. Experienced in cross-functional projects, vendor coordination, "
+    "budgeting, reporting, and documentation. Seeking a challenging role where I "
+    "can contribute to a mission-driven organization and keep growing my skills."
+)
+
+EARLIER_ROLE = (
+    "Retail Associate, Main Street Outfitters (2012-2015)\n"
+    "- Assisted customers on the sales floor, handled returns and exchanges.\n"
+    "- Opened and closed the store, balanced registers, and tracked inventory.\n"
+    "- Trained seasonal staff on store policies and point-of-sale software.\n"
+    "- Recognized as employee of the month four times for customer service."
+)
+
+# (job title, job description, role-specific experience, skills)
+CORPUS = [
+    (
+        "Backend Engineer",
+        "We need a backend engineer to build Python microservices with FastAPI, "
+        "design PostgreSQL schemas, tune slow SQL queries, and run services on "
+        "Kubernetes with CI/CD pipelines and observability.",
+        "Senior Backend Engineer, Nimbus Labs (2018-2024)\n"
+        "- Built FastAPI microservices in Python serving 20k requests per second.\n"
+        "- Designed PostgreSQL schemas and cut p95 query latency by 60 percent.\n"
+        "- Moved deployments to Kubernetes with GitHub Actions CI/CD and Prometheus.",
+        "Python, FastAPI, PostgreSQL, SQLAlchemy, Kubernetes, Docker, Prometheus",
+    ),
+    (
+        "Registered Nurse (ICU)",
+        "Hospital seeking an ICU registered nurse to care for critically ill "
+        "patients, manage ventilators and titrate vasoactive drips, and "
+        "coordinate with intensivists. BLS and ACLS certification required.",
+        "Registered Nurse, St. Mary's Medical Center ICU (2017-2024)\n"
+        "- Cared for 2-3 critically ill patients per shift in a 24-bed ICU.\n"
+        "- Managed mechanical ventilation and titrated vasopressor infusions.\n"
+        "- Charge nurse on nights; precepted new graduate nurses.",
+        "ICU nursing, ventilator management, ACLS, BLS, CRRT, patient advocacy",
+    ),
+    (
+        "Data Scientist",
+        "Data scientist to build machine learning models for churn prediction, "
+        "run A/B tests, and communicate insights. Python, pandas, scikit-learn, "
+        "SQL and experimentation design are required.",
+        "Data Scientist, Streamline Analytics (2019-2024)\n"
+        "- Built gradient boosted churn models in scikit-learn, lifting retention 8%.\n"
+        "- Designed and analyzed A/B tests for pricing and onboarding flows.\n"
+        "- Automated feature pipelines with pandas and SQL in Airflow.",
+        "Python, pandas, scikit-learn, XGBoost, SQL, statistics, A/B testing",
+    ),
+    (
+        "Accountant",
+        "Accounting firm hiring a staff accountant to prepare month-end close, "
+        "reconcile general ledger accounts, prepare financial statements under "
+        "GAAP, and support external audits. CPA preferred.",
+        "Staff Accountant, Brightline CPAs (2016-2024)\n"
+        "- Ran month-end close for 12 clients and reconciled general ledgers.\n"
+        "- Prepared GAAP financial statements and audit support schedules.\n"
+        "- Implemented QuickBooks to NetSuite migration for a mid-size client.",
+        "GAAP, month-end close, reconciliations, NetSuite, Excel, CPA",
+    ),
+    (
+        "Electrician",
+        "Licensed journeyman electrician for commercial construction: install "
+        "conduit and wiring, read blueprints, terminate panels, troubleshoot "
+        "circuits, and follow NEC code and OSHA safety rules.",
+        "Journeyman Electrician, Volt Commercial Electric (2015-2024)\n"
+        "- Installed EMT conduit, pulled wire, and terminated 480V panels.\n"
+        "- Read blueprints and led a crew of four on tenant fit-outs.\n"
+        "- Troubleshot motor control circuits; zero OSHA recordables.",
+        "NEC code, conduit bending, blueprint reading, OSHA 30, troubleshooting",
+    ),
+    (
+        "Graphic Designer",
+        "Creative agency seeks a graphic designer for brand identity, marketing "
+        "collateral, and social media assets using Adobe Illustrator, Photoshop, "
+        "InDesign and Figma. Portfolio required.",
+        "Graphic Designer, Pixel & Ink Studio (2018-2024)\n"
+        "- Designed brand identities and logos for 30+ clients in Illustrator.\n"
+        "- Produced print collateral in InDesign and social assets in Photoshop.\n"
+        "- Built a shared Figma component library for the web team.",
+        "Adobe Illustrator, Photoshop, InDesign, Figma, typography, branding",
+    ),
+    (
+        "High School Math Teacher",
+        "School district hiring a high school mathematics teacher for algebra, "
+        "geometry and AP Calculus; plan lessons, differentiate instruction, "
+        "and track student progress. State teaching license required.",
+        "Mathematics Teacher, Lincoln High School (2014-2024)\n"
+        "- Taught Algebra II, Geometry and AP Calculus AB to 150 students a year.\n"
+        "- Raised AP pass rate from 54% to 78% with targeted review sessions.\n"
+        "- Differentiated lessons for English learners and IEP students.",
+        "Curriculum design, AP Calculus, classroom management, state license",
+    ),
+    (
+        "Supply Chain Analyst",
+        "Supply chain analyst to forecast demand, optimize inventory levels, "
+        "analyze supplier performance and logistics costs, and build reports "
+        "in SQL and Power BI.",
+        "Supply Chain Analyst, Northwind Distribution (2017-2024)\n"
+        "- Built demand forecasts that cut safety stock by 15% across 3 DCs.\n"
+        "- Analyzed supplier lead times and freight costs; renegotiated lanes.\n"
+        "- Created Power BI inventory dashboards backed by SQL Server.",
+        "Demand forecasting, inventory optimization, SQL, Power BI, SAP",
+    ),
+]
+
+
+def make_resume(experience: str, skills: str) -> str:
+    return (
+        "Alex Morgan\nalex.morgan@example.com | (555) 010-2000\n\n"
+        f"Professional Summary\n{GENERIC_SUMMARY}\n\n"
+        f"Work Experience\n{EARLIER_ROLE}\n\n{experience}\n\n"
+        "Education\nB.A., State University, 2012\n\n"
+        f"Skills\n{skills}\n"
+    )
+
+
+# ✅ The two modes, exactly as the matching pipeline applies them
+def summarize_resume(text: str):
+    return embed(summarize_experience(resume_summary_input(text)))
+
+
+def summarize_job(text: str):
+    return embed(summarize_experience(text))
+
+
+def chunked_resume(text: str):
+    sections = split_sections(text)
+    return embed_chunked(matching_text(sections, len(text), fallback=text))[0]
+
+
+def chunked_job(text: str):
+    return embed_chunked(text)[0]
+
+
+MODES = {
+    "summarize": (summarize_resume, summarize_job),
+    "chunked": (chunked_resume, chunked_job),
+}
+
+
+def unit(vectors) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def run_mode(embed_resume, embed_job, resumes, jobs) -> dict:
+    summary_cache.clear()
+    embedding_cache.clear()
+    started = time.perf_counter()
+    resume_vectors = unit([embed_resume(text) for text in resumes])
+    job_vectors = unit([embed_job(text) for text in jobs])
+    elapsed = time.perf_counter() - started
+
+    scores = resume_vectors @ job_vectors.T
+    ranks = [
+        int((scores[i] > scores[i, i]).sum()) + 1  # Rank of the resume's own job
+        for i in range(len(resumes))
+    ]
+    return {
+        "ms_per_doc": elapsed * 1000 / (len(resumes) + len(jobs)),
+        "recall@1": sum(rank == 1 for rank in ranks) / len(ranks),
+        "mrr": sum(1 / rank for rank in ranks) / len(ranks),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    resumes = [make_resume(experience, skills) for _, _, experience, skills in CORPUS]
+    jobs = [f"{title}\n{description}" for title, description, _, _ in CORPUS]
+    warm_up(["summarizer", "embeddings"])
+
+    print(
+        f"pairs={len(CORPUS)} avg resume chars="
+        f"{sum(map(len, resumes)) // len(resumes)} (cold caches each run)"
+    )
+    print(f"{'mode':>10} {'ms/doc':>10} {'recall@1':>9} {'MRR':>6}")
+    for name, (embed_resume, embed_job) in MODES.items():
+        for _ in range(args.repeat):
+            result = run_mode(embed_resume, embed_job, resumes, jobs)
+            print(
+                f"{name:>10} {result['ms_per_doc']:>10.1f} "
+                f"{result['recall@1']:>9.2f} {result['mrr']:>6.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
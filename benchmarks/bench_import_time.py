@@ -0,0 +1,101 @@
+"""Cold import cost of `app.main` (what every worker start and `--reload` pays).
+
+Each run imports the app in a fresh interpreter and reports wall time, the
+slowest modules from `python -X importtime`, and any heavy ML packages that
+were imported eagerly. `--max-seconds` exits non-zero when the median import
+time regresses past the budget (for CI).
+
+Usage:
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --runs 10 --top 15 --max-seconds 2
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Packages that should only be imported once a model / vector store is used
+HEAVY_MODULES = (
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "langchain",
+    "langchain_community",
+    "langchain_core",
+    "chromadb",
+    "fitz",
+    "pdfplumber",
+)
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+heavy = sorted(name for name in {heavy!r} if name in sys.modules)
+print(json.dumps({{"seconds": elapsed, "modules": len(sys.modules), "heavy": heavy}}))
+"""
+
+
+def run_probe() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def slowest_modules(top: int) -> list:
+    """(cumulative seconds, module) for the `top` slowest top-level imports."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[12:].split("|"))
+        package = name.split(".")[0]
+        # Nested imports are indented; the outermost line carries the full cost
+        totals[package] = max(totals.get(package, 0), int(cumulative) / 1e6)
+    return sorted(((seconds, name) for name, seconds in totals.items()), reverse=True)[
+        :top
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-seconds", type=float, default=None)
+    args = parser.parse_args()
+
+    results = [run_probe() for _ in range(args.runs)]
+    timings = sorted(result["seconds"] for result in results)
+    median = statistics.median(timings)
+    print(
+        f"import app.main: median={median:.3f}s min={timings[0]:.3f}s "
+        f"max={timings[-1]:.3f}s modules={results[-1]['modules']}"
+    )
+
+    print(f"\n{'cumulative':>10}  package")
+    for seconds, name in slowest_modules(args.top):
+        print(f"{seconds:>9.3f}s  {name}")
+
+    heavy = results[-1]["heavy"]
+    print(f"\neagerly imported heavy packages: {', '.join(heavy) or 'none'}")
+
+    if args.max_seconds is not None and median > args.max_seconds:
+        print(f"❌ median import time {median:.3f}s exceeds {args.max_seconds:.3f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Single-job embedding lookup latency as the job collection grows.
+
+Compares the in-process `JobVectorIndex.get` with the ChromaDB metadata-filtered
+`get(where={"job_id": ...})` it replaces. Uses random vectors, so no model is loaded.
+
+Usage:
+    python -m benchmarks.bench_job_lookup
+    python -m benchmarks.bench_job_lookup --sizes 1000,10000,100000 --chroma
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.vector_index import JobVectorIndex
+from benchmarks.bench_top_k import random_vectors, time_queries
+
+
+def bench_index(size, vectors, lookups):
+    started = time.perf_counter()
+    index = JobVectorIndex().build(np.arange(size), vectors)
+    build_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for job_id in range(size, size + 1000):
+        index.upsert(job_id, vectors[job_id % size])
+    upsert_us = (time.perf_counter() - started) * 1000  # per 1000 inserts -> µs each
+
+    latencies = time_queries(index.get, lookups)
+    print(
+        f"{size:>9} {'index':>7} build={build_s:7.2f}s upsert={upsert_us:7.2f}µs "
+        f"p50={latencies['p50_ms'] * 1000:8.2f}µs p95={latencies['p95_ms'] * 1000:8.2f}µs"
+    )
+
+
+def bench_chroma(size, vectors, lookups):
+    import chromadb
+
+    client = chromadb.EphemeralClient()
+    collection = client.create_collection(f"lookup-{size}")
+    for start in range(0, size, 5000):
+        end = min(start + 5000, size)
+        collection.add(
+            ids=[f"job-{i}" for i in range(start, end)],
+            embeddings=vectors[start:end].tolist(),
+            metadatas=[{"job_id": str(i)} for i in range(start, end)],
+        )
+
+    def lookup(job_id):
+        collection.get(include=["embeddings"], where={"job_id": str(job_id)})
+
+    latencies = time_queries(lookup, lookups)
+    print(
+        f"{size:>9} {'chroma':>7} {'':>36}"
+        f"p50={latencies['p50_ms'] * 1000:8.2f}µs p95={latencies['p95_ms'] * 1000:8.2f}µs"
+    )
+    client.delete_collection(f"lookup-{size}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000")
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--chroma", action="store_true", help="also benchmark Chroma")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for size in [int(s) for s in args.sizes.split(",")]:
+        vectors = random_vectors(size, rng)
+        lookups = rng.integers(0, size, args.lookups).tolist()
+        bench_index(size, vectors, lookups)
+        if args.chroma:
+            bench_chroma(size, vectors, lookups)
+
+
+if __name__ == "__main__":
+    main()
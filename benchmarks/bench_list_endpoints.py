@@ -0,0 +1,139 @@
+"""Query count, latency and payload size of `GET /jobs/` with many stored jobs.
+
+Compares the old unbounded `db.query(Job).all()` (resumes lazy-loaded per job)
+with the keyset-paginated list, with and without `full=true`. Runs against an
+in-memory SQLite database, so no Postgres is needed.
+
+Usage:
+    python -m benchmarks.bench_list_endpoints
+    python -m benchmarks.bench_list_endpoints --jobs 10000 --resumes-per-job 2 --limit 100
+"""
+
+import argparse
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import Job, Resume, User
+from app.routers.job import get_all_jobs
+from app.schemas.job import JobPage, JobResponse
+
+EXPERIENCE = "Built and operated data pipelines in Python and SQL. " * 80  # ~4 KB
+
+
+def seed(session_factory, jobs: int, resumes_per_job: int):
+    with session_factory() as db:
+        db.add(User(id=1, name="bench", email="bench@example.com", password="x"))
+        db.bulk_insert_mappings(
+            Job,
+            [
+                {
+                    "id": i,
+                    "title": f"Job {i}",
+                    "description": EXPERIENCE,
+                    "user_id": 1,
+                }
+                for i in range(1, jobs + 1)
+            ],
+        )
+        db.bulk_insert_mappings(
+            Resume,
+            [
+                {"user_id": 1, "job_id": i, "experience": EXPERIENCE}
+                for i in range(1, jobs + 1)
+                for _ in range(resumes_per_job)
+            ],
+        )
+        db.commit()
+
+
+def measure(label, engine, session_factory, run):
+    statements = []
+
+    def count(*_):
+        statements.append(1)
+
+    event.listen(engine, "before_cursor_execute", count)
+    started = time.perf_counter()
+    with session_factory() as db:
+        payload = run(db)
+    elapsed = time.perf_counter() - started
+    event.remove(engine, "before_cursor_execute", count)
+    print(
+        f"{label:<22} queries={len(statements):>6} time={elapsed * 1000:9.1f}ms "
+        f"payload={len(payload) / 1024:10.1f}KiB"
+    )
+
+
+def unbounded(db) -> bytes:
+    jobs = db.query(Job).all()
+    return (
+        b"["
+        + b",".join(
+            JobResponse.model_validate(job).model_dump_json().encode() for job in jobs
+        )
+        + b"]"
+    )
+
+
+def first_page(limit: int, full: bool):
+    def run(db) -> bytes:
+        page = get_all_jobs(cursor=None, limit=limit, user_id=None, full=full, db=db)
+        return (
+            JobPage.model_validate(page, from_attributes=True)
+            .model_dump_json(exclude_unset=True)
+            .encode()
+        )
+
+    return run
+
+
+def all_pages(limit: int):
+    def run(db) -> bytes:
+        payload, cursor = b"", None
+        while True:
+            page = get_all_jobs(
+                cursor=cursor, limit=limit, user_id=None, full=False, db=db
+            )
+            payload += (
+                JobPage.model_validate(page, from_attributes=True)
+                .model_dump_json(exclude_unset=True)
+                .encode()
+            )
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return payload
+
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--resumes-per-job", type=int, default=1)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(
+        engine, tables=[User.__table__, Job.__table__, Resume.__table__]
+    )
+    session_factory = sessionmaker(bind=engine)
+    seed(session_factory, args.jobs, args.resumes_per_job)
+
+    print(f"jobs={args.jobs} resumes/job={args.resumes_per_job} limit={args.limit}")
+    measure("unbounded .all()", engine, session_factory, unbounded)
+    measure("page", engine, session_factory, first_page(args.limit, full=False))
+    measure("page full=true", engine, session_factory, first_page(args.limit, True))
+    measure("all pages (projected)", engine, session_factory, all_pages(args.limit))
+
+
+if __name__ == "__main__":
+    main()
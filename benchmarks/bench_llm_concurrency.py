@@ -0,0 +1,50 @@
+"""Throughput of pooled async LLM calls vs. sync calls on a bounded thread pool.
+
+Start the fake server first:
+    uvicorn benchmarks.fake_openai_server:app --port 9000
+
+Then:
+    OPENROUTER_API_BASE=http://localhost:9000/v1 python -m benchmarks.bench_llm_concurrency
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.ai import aimprove_resume, improve_resume
+
+RESUME = "Backend engineer with 5 years of Python, FastAPI and PostgreSQL experience."
+
+
+async def run_async(requests: int) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(*(aimprove_resume(RESUME) for _ in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+def run_threads(requests: int, workers: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda _: improve_resume(RESUME), range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--threads", type=int, default=40, help="AnyIO's default pool size"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"sync  ({args.threads} threads): {run_threads(args.requests, args.threads):7.1f} req/s"
+    )
+    print(
+        f"async (pooled client):   {asyncio.run(run_async(args.requests)):7.1f} req/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
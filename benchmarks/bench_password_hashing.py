@@ -0,0 +1,57 @@
+"""Signup throughput (bcrypt hashes per second) vs. password pool size.
+
+Each signup hashes one password on a pool of `n` threads, the way
+`POST /users/` does on `password_executor`. bcrypt releases the GIL, so
+throughput scales with the pool until the CPU cores are busy; past that,
+extra threads only add latency.
+
+Usage:
+    python -m benchmarks.bench_password_hashing
+    python -m benchmarks.bench_password_hashing --signups 200 --pools 1,2,4,8 --rounds 12
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+
+async def signups(context, pool_size: int, count: int) -> tuple:
+    loop = asyncio.get_running_loop()
+    latencies = []
+
+    async def signup(i):
+        started = time.perf_counter()
+        await loop.run_in_executor(executor, context.hash, f"password-{i}")
+        latencies.append(time.perf_counter() - started)
+
+    with ThreadPoolExecutor(max_workers=pool_size) as executor:
+        started = time.perf_counter()
+        await asyncio.gather(*(signup(i) for i in range(count)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return count / elapsed, statistics.median(latencies), latencies[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--signups", type=int, default=100)
+    parser.add_argument("--pools", default=f"1,2,4,{os.cpu_count() or 1},16")
+    parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS")
+    args = parser.parse_args()
+
+    context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=args.rounds)
+    context.hash("warm-up")
+    print(f"signups={args.signups} rounds={args.rounds} cpus={os.cpu_count()}")
+    print(f"{'pool':>5} {'signups/s':>10} {'p50':>8} {'max':>8}")
+    for pool_size in sorted({int(p) for p in args.pools.split(",")}):
+        rate, p50, worst = asyncio.run(signups(context, pool_size, args.signups))
+        print(f"{pool_size:>5} {rate:>10.1f} {p50:>7.2f}s {worst:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Concurrent resume PDF ingestion: in-memory parsing on the PDF pool vs. the
+old write-to-/tmp-and-parse-on-the-event-loop path, for 1-20 page documents.
+
+Usage:
+    python -m benchmarks.bench_pdf_upload --concurrency 16
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+import fitz
+
+from app.services.ingestion import extract_experience
+from app.utils.pdf_parser import extract_experience_from_pdf
+
+LINE = "Senior Backend Engineer - Built FastAPI services on PostgreSQL and Redis."
+
+
+def make_pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for page_number in range(pages):
+        page = doc.new_page()
+        text = "\n".join(f"{page_number}.{i} {LINE}" for i in range(45))
+        page.insert_text((40, 40), text, fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+async def legacy_ingest(data: bytes):
+    path = f"/tmp/{uuid.uuid4().hex}.pdf"
+    with open(path, "wb") as buffer:
+        buffer.write(data)
+    try:
+        return extract_experience_from_pdf(path)  # Blocks the event loop
+    finally:
+        os.remove(path)
+
+
+async def heartbeat(stop: asyncio.Event, lags: list):
+    """Measure how late a 5 ms timer fires (= how long the loop was blocked)."""
+    while not stop.is_set():
+        expected = time.perf_counter() + 0.005
+        await asyncio.sleep(0.005)
+        lags.append(max(0.0, time.perf_counter() - expected) * 1000)
+
+
+async def run(ingest, data: bytes, uploads: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await ingest(data)
+
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(heartbeat(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(uploads)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    return uploads / elapsed, max(lags, default=0.0)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", default="1,5,10,20")
+    parser.add_argument("--uploads", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"uploads={args.uploads} concurrency={args.concurrency}")
+    print(
+        f"{'pages':>5} {'legacy docs/s':>14} {'max loop lag':>13} "
+        f"{'pooled docs/s':>14} {'max loop lag':>13}"
+    )
+    for pages in [int(p) for p in args.pages.split(",")]:
+        data = make_pdf(pages)
+        legacy, legacy_lag = await run(
+            legacy_ingest, data, args.uploads, args.concurrency
+        )
+        pooled, pooled_lag = await run(
+            extract_experience, data, args.uploads, args.concurrency
+        )
+        print(
+            f"{pages:>5} {legacy:>14.1f} {legacy_lag:>11.1f}ms "
+            f"{pooled:>14.1f} {pooled_lag:>11.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""Top-k job search latency at 10k / 100k / 1M stored jobs.
+
+Uses random unit vectors with MiniLM's dimensionality, so no model is loaded.
+
+Usage:
+    python -m benchmarks.bench_top_k
+    python -m benchmarks.bench_top_k --sizes 10000,100000 --chroma
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from app.services import vector_index
+from app.services.vector_index import JobVectorIndex
+
+DIM = 384  # all-MiniLM-L6-v2
+
+
+def random_vectors(count: int, rng) -> np.ndarray:
+    vectors = rng.standard_normal((count, DIM), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def time_queries(search, queries) -> dict:
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        search(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+def bench_local(size, vectors, queries, k, use_hnsw):
+    saved = vector_index.hnswlib
+    if not use_hnsw:
+        vector_index.hnswlib = None
+    try:
+        started = time.perf_counter()
+        user_ids = list(np.arange(size) % 1000)
+        index = JobVectorIndex().build(np.arange(size), vectors, user_ids=user_ids)
+        build_s = time.perf_counter() - started
+    finally:
+        vector_index.hnswlib = saved
+
+    unfiltered = time_queries(lambda q: index.search(q, k), queries)
+    filtered = time_queries(lambda q: index.search(q, k, user_id=7), queries)
+    label = "hnsw" if use_hnsw else "numpy"
+    print(
+        f"{size:>9} {label:>7} build={build_s:7.2f}s "
+        f"p50={unfiltered['p50_ms']:8.2f}ms p95={unfiltered['p95_ms']:8.2f}ms "
+        f"filtered p50={filtered['p50_ms']:8.2f}ms"
+    )
+
+
+def bench_chroma(size, vectors, queries, k):
+    import chromadb
+
+    client = chromadb.EphemeralClient()
+    collection = client.create_collection(f"bench-{size}")
+    started = time.perf_counter()
+    for start in range(0, size, 5000):
+        end = min(start + 5000, size)
+        collection.add(
+            ids=[str(i) for i in range(start, end)],
+            embeddings=vectors[start:end].tolist(),
+            metadatas=[
+                {"job_id": str(i), "user_id": i % 1000} for i in range(start, end)
+            ],
+        )
+    build_s = time.perf_counter() - started
+
+    def search(query, where=None):
+        kwargs = {"query_embeddings": [query.tolist()], "n_results": k}
+        if where:
+            kwargs["where"] = where
+        collection.query(**kwargs)
+
+    unfiltered = time_queries(search, queries)
+    filtered = time_queries(lambda q: search(q, {"user_id": 7}), queries)
+    print(
+        f"{size:>9} {'chroma':>7} build={build_s:7.2f}s "
+        f"p50={unfiltered['p50_ms']:8.2f}ms p95={unfiltered['p95_ms']:8.2f}ms "
+        f"filtered p50={filtered['p50_ms']:8.2f}ms"
+    )
+    client.delete_collection(f"bench-{size}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--chroma", action="store_true", help="also benchmark Chroma")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = random_vectors(args.queries, rng)
+    for size in [int(s) for s in args.sizes.split(",")]:
+        vectors = random_vectors(size, rng)
+        bench_local(size, vectors, queries, args.k, use_hnsw=False)
+        if vector_index.hnswlib is not None:
+            bench_local(size, vectors, queries, args.k, use_hnsw=True)
+        if args.chroma:
+            bench_chroma(size, vectors, queries, args.k)
+
+
+if __name__ == "__main__":
+    main()
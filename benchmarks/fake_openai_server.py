@@ -0,0 +1,75 @@
+"""Minimal OpenAI-compatible chat completions server for load tests.
+
+Replies after FAKE_LLM_DELAY seconds (default 2) with FAKE_LLM_TOKENS words,
+streamed as SSE chunks when the request sets "stream": true.
+
+Usage:
+    uvicorn benchmarks.fake_openai_server:app --port 9000
+    OPENROUTER_API_BASE=http://localhost:9000/v1 uvicorn app.main:app
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+DELAY = float(os.getenv("FAKE_LLM_DELAY", "2"))
+TOKENS = int(os.getenv("FAKE_LLM_TOKENS", "200"))
+
+app = FastAPI()
+
+
+def _chunk(completion_id, model, delta, finish_reason=None):
+    return {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "fake")
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    words = [f"word{i}" for i in range(TOKENS)]
+
+    if body.get("stream"):
+
+        async def events():
+            per_token = DELAY / max(TOKENS, 1)
+            yield f"data: {json.dumps(_chunk(completion_id, model, {'role': 'assistant'}))}\n\n"
+            for word in words:
+                await asyncio.sleep(per_token)
+                delta = {"content": word + " "}
+                yield f"data: {json.dumps(_chunk(completion_id, model, delta))}\n\n"
+            yield f"data: {json.dumps(_chunk(completion_id, model, {}, 'stop'))}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    await asyncio.sleep(DELAY)
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": " ".join(words)},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": 0,
+            "completion_tokens": TOKENS,
+            "total_tokens": TOKENS,
+        },
+    }
@@ -2,15 +2,8 @@
 
 echo "🔥 Running Database Migration Script..."
 
-# Step 1: Ensure Alembic is tracking the latest schema
-echo "📌 Stamping Alembic to the latest migration..."
-alembic stamp head
-
-# Step 2: Generate a new migration (if needed)
-echo "📌 Generating migration files..."
-alembic revision --autogenerate -m "Auto-migration"
-
-# Step 3: Apply all new migrations
+# Migrations are versioned in alembic/versions; new ones are written (and
+# reviewed) with `alembic revision --autogenerate -m "..."` during development
 echo "📌 Applying database migrations..."
 alembic upgrade head
 
@@ -0,0 +1,74 @@
+"""MicroBatcher and summarize_many batching, with stub batch functions.
+
+python -m pytest tests/test_inference.py
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services import inference
+from app.services.inference import MicroBatcher
+
+
+def test_concurrent_calls_share_a_batch():
+    batches = []
+
+    def batch_fn(texts):
+        batches.append(list(texts))
+        return [text.upper() for text in texts]
+
+    batcher = MicroBatcher("test", batch_fn, max_batch_size=8, max_wait_ms=200)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(batcher, ["ccc", "a", "bb", "dddd"]))
+
+    assert results == ["CCC", "A", "BB", "DDDD"]
+    assert len(batches) < 4
+    assert all(batch == sorted(batch, key=len) for batch in batches)
+
+
+def test_batch_size_is_capped():
+    batches = []
+
+    def batch_fn(texts):
+        batches.append(len(texts))
+        return texts
+
+    batcher = MicroBatcher("test", batch_fn, max_batch_size=2, max_wait_ms=50)
+    futures = [batcher.submit(str(i)) for i in range(5)]
+    assert [future.result(timeout=5) for future in futures] == list("01234")
+    assert max(batches) <= 2
+
+
+def test_batch_errors_reach_every_caller():
+    def batch_fn(texts):
+        raise ValueError("model failed")
+
+    batcher = MicroBatcher("test", batch_fn, max_batch_size=4, max_wait_ms=50)
+    futures = [batcher.submit(text) for text in ("a", "b")]
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result(timeout=5)
+
+
+def test_short_results_fail_instead_of_hanging():
+    batcher = MicroBatcher("test", lambda texts: texts[:1], 4, max_wait_ms=50)
+    futures = [batcher.submit(text) for text in ("a", "b", "c")]
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+
+
+def test_summarize_many_slices_length_sorted_batches(monkeypatch):
+    batches = []
+
+    def summarize_batch(texts):
+        batches.append(list(texts))
+        return [f"summary of {text}" for text in texts]
+
+    monkeypatch.setattr(inference, "INFERENCE_MAX_BATCH_SIZE", 2)
+    monkeypatch.setattr(inference, "_summarize_batch", summarize_batch)
+    texts = ["cccc", "a", "bbb", "dd", "eeeee"]
+
+    assert inference.summarize_many(texts) == [f"summary of {t}" for t in texts]
+    assert batches == [["a", "dd"], ["bbb", "cccc"], ["eeeee"]]
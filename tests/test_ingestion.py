@@ -0,0 +1,73 @@
+"""Bulk upload collection: zip expansion, per-member failures and the batch cap.
+
+python -m pytest tests/test_ingestion.py
+"""
+
+import asyncio
+import io
+import zipfile
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.services import ingestion
+
+PDF = b"%PDF-1.4 resume"
+
+
+def make_zip(members: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def upload(filename: str, data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+
+def collect(*files):
+    return asyncio.run(ingestion.collect_bulk_files(list(files)))
+
+
+def test_expand_zip_keeps_pdfs_only():
+    data = make_zip({"a.pdf": PDF, "notes.txt": b"x", "__MACOSX/a.pdf": PDF})
+    assert ingestion.expand_zip(data) == [("a.pdf", PDF, None)]
+
+
+def test_unreadable_zip_members_fail_individually():
+    data = bytearray(make_zip({"a.pdf": PDF, "b.pdf": PDF}))
+    # Mark b.pdf as encrypted in its central directory entry
+    entry = data.rindex(b"PK\x01\x02")
+    data[entry + 8] |= 0x1
+    assert ingestion.expand_zip(bytes(data)) == [
+        ("a.pdf", PDF, None),
+        ("b.pdf", b"", "Could not extract from the zip"),
+    ]
+
+
+def test_collect_reports_bad_archives_as_failed_files():
+    collected = collect(upload("a.pdf", PDF), upload("broken.zip", b"not a zip"))
+    assert collected == [
+        ("a.pdf", PDF, None),
+        ("broken.zip", b"", "Not a valid zip archive"),
+    ]
+
+
+def test_batch_cap_counts_every_archive(monkeypatch):
+    padded = PDF + b"0" * 10_000  # Compresses well below the cap
+    monkeypatch.setattr(ingestion, "BULK_MAX_BYTES", 3 * len(padded))
+    archive = make_zip({"a.pdf": padded, "b.pdf": padded})
+    assert len(collect(upload("1.zip", archive))) == 2
+    with pytest.raises(HTTPException) as error:
+        collect(upload("1.zip", archive), upload("2.zip", archive))
+    assert error.value.status_code == 413
+
+
+def test_extract_many_passes_collected_errors_through():
+    documents = [("a.zip", b"", "Not a valid zip archive"), ("b.pdf", b"text", None)]
+    assert asyncio.run(ingestion.extract_many(documents)) == [
+        ("a.zip", None, "Not a valid zip archive"),
+        ("b.pdf", None, "Not a valid PDF"),
+    ]
@@ -0,0 +1,172 @@
+"""LLMResponseCache: TTL / LRU storage and coalescing of identical in-flight calls.
+
+python -m pytest tests/test_llm_cache.py
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.llm_cache import LLMResponseCache, response_key
+
+
+class DictBackend:
+    def __init__(self, fail=False):
+        self.data = {}
+        self.fail = fail
+
+    def get(self, key):
+        if self.fail:
+            raise ConnectionError("redis is down")
+        return self.data.get(key)
+
+    def set(self, key, text):
+        if self.fail:
+            raise ConnectionError("redis is down")
+        self.data[key] = text
+
+
+@pytest.fixture
+def cache():
+    return LLMResponseCache(ttl_seconds=60, max_entries=2, backend=None)
+
+
+def test_response_key_covers_model_template_and_inputs():
+    key = response_key("m", "improve:v1", {"resume": "a", "job": "b"})
+    assert key == response_key("m", "improve:v1", {"job": "b", "resume": "a"})
+    assert key != response_key("m", "improve:v2", {"resume": "a", "job": "b"})
+    assert key != response_key("other", "improve:v1", {"resume": "a", "job": "b"})
+    assert key != response_key("m", "improve:v1", {"resume": "a", "job": "c"})
+
+
+def test_expired_entries_are_misses():
+    cache = LLMResponseCache(ttl_seconds=0, backend=None)
+    cache.set("k", "text")
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+
+
+def test_backend_hits_are_kept_locally():
+    backend = DictBackend()
+    backend.data["k"] = "shared"
+    cache = LLMResponseCache(ttl_seconds=60, backend=backend)
+    assert cache.get("k") == "shared"
+    backend.data.clear()
+    assert cache.get("k") == "shared"
+
+
+def test_backend_failures_fall_back_to_the_local_cache():
+    cache = LLMResponseCache(ttl_seconds=60, backend=DictBackend(fail=True))
+    assert cache.call("k", lambda: "fresh") == "fresh"
+    assert cache.get("k") == "fresh"
+
+
+def test_call_caches_and_bypass_replaces(cache):
+    assert cache.call("k", lambda: "first") == "first"
+    assert cache.call("k", lambda: "second") == "first"
+    assert cache.call("k", lambda: "second", bypass=True) == "second"
+    assert cache.get("k") == "second"
+
+
+def test_failed_calls_are_not_cached(cache):
+    def fail():
+        raise RuntimeError("upstream 502")
+
+    with pytest.raises(RuntimeError):
+        cache.call("k", fail)
+    assert cache.call("k", lambda: "ok") == "ok"
+
+
+def test_concurrent_identical_calls_share_one_computation(cache):
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "text"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.call("k", compute)))
+        for _ in range(3)
+    ]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    while cache.coalesced < 2:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["text"] * 3
+    assert len(calls) == 1
+
+
+def test_async_identical_calls_share_one_computation(cache):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "text"
+
+    async def main():
+        return await asyncio.gather(*(cache.acall("k", compute) for _ in range(3)))
+
+    assert asyncio.run(main()) == ["text"] * 3
+    assert len(calls) == 1
+    assert cache.coalesced == 2
+
+
+def test_async_call_survives_the_first_caller_going_away(cache):
+    async def main():
+        started, done = asyncio.Event(), asyncio.Event()
+
+        async def compute():
+            started.set()
+            await done.wait()
+            return "text"
+
+        leader = asyncio.create_task(cache.acall("k", compute))
+        await started.wait()
+        follower = asyncio.create_task(cache.acall("k", compute))
+        await asyncio.sleep(0)
+        leader.cancel()  # e.g. the client disconnected
+        done.set()
+        return await follower, leader
+
+    text, leader = asyncio.run(main())
+    assert text == "text"
+    assert leader.cancelled()
+    assert cache.get("k") == "text"
+
+
+def test_async_failures_reach_every_caller(cache):
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream 502")
+
+    async def main():
+        return await asyncio.gather(
+            *(cache.acall("k", compute) for _ in range(2)), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.get("k") is None
+    assert not cache._ainflight
@@ -0,0 +1,64 @@
+"""Stored match scores (job_matches), on SQLite with a stub job vector lookup.
+
+python -m pytest tests/test_match_store.py
+"""
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import Job, JobMatch, Resume, User
+from app.services import match_store
+from app.services.match_store import encode_vector
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(id=1, name="A", email="a@example.com", password="x"))
+        session.add(Job(id=1, title="Engineer", description="python", user_id=1))
+        session.add_all(
+            Resume(
+                id=resume_id,
+                user_id=1,
+                experience="python",
+                embedding=encode_vector(vector),
+                embedding_hash=f"r{resume_id}",
+            )
+            for resume_id, vector in ((1, [1.0, 0.0]), (2, [0.0, 1.0]))
+        )
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def stored_scores(db):
+    return dict(db.execute(select(JobMatch.resume_id, JobMatch.match_score)).all())
+
+
+def test_refresh_matches_for_job_upserts_scores(db, monkeypatch):
+    job = db.get(Job, 1)
+    vectors = iter([np.array([1.0, 0.0]), np.array([0.0, 1.0])])
+    monkeypatch.setattr(
+        match_store, "get_job_embedding", lambda job_id, digest: next(vectors)
+    )
+
+    match_store.refresh_matches_for_job(job, db)
+    assert stored_scores(db) == {1: 100.0, 2: 0.0}
+
+    match_store.refresh_matches_for_job(job, db)  # Rescored in place
+    assert stored_scores(db) == {1: 0.0, 2: 100.0}
+    assert len(db.scalars(select(JobMatch.id)).all()) == 2
+
+
+def test_refresh_matches_for_job_logs_embedding_failures(db, monkeypatch):
+    def fail(job_id, digest):
+        raise RuntimeError("vector store down")
+
+    monkeypatch.setattr(match_store, "get_job_embedding", fail)
+    match_store.refresh_matches_for_job(db.get(Job, 1), db)
+    assert stored_scores(db) == {}
@@ -0,0 +1,47 @@
+"""ORM cascades, run on SQLite with foreign keys enforced.
+
+python -m pytest tests/test_models.py
+"""
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import CoverLetter, Job, JobMatch, Resume, User
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    event.listen(
+        engine, "connect", lambda conn, _: conn.execute("PRAGMA foreign_keys=ON")
+    )
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_deleting_a_user_removes_their_jobs_and_resumes(db):
+    user = User(name="A", email="a@example.com", password="x")
+    other = User(name="B", email="b@example.com", password="x")
+    job = Job(title="Engineer", description="python", user=user)
+    resume = Resume(experience="python", user=user)
+    tailored = Resume(experience="python", user=user, job=job, parent_resume=resume)
+    db.add_all([user, other, Job(title="Other", description="go", user=other)])
+    db.add_all(
+        [
+            JobMatch(resume=resume, job=job, match_score=90.0),
+            CoverLetter(user=user, job=job, resume=tailored, content="Hi"),
+        ]
+    )
+    db.commit()
+
+    db.delete(user)
+    db.commit()
+
+    for model in (Resume, JobMatch, CoverLetter):
+        assert db.scalar(select(func.count()).select_from(model)) == 0
+    assert db.scalars(select(Job.title)).all() == ["Other"]
+    assert db.scalars(select(User.email)).all() == ["b@example.com"]
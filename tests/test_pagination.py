@@ -0,0 +1,69 @@
+"""Keyset pagination over full entities and column projections.
+
+python -m pytest tests/test_pagination.py
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import Job, User
+from app.utils.pagination import keyset_page
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine, tables=[Base.metadata.tables["users"], Base.metadata.tables["jobs"]]
+    )
+    with Session(engine) as session:
+        session.add_all(
+            User(id=user_id, name="A", email=f"{user_id}@example.com", password="x")
+            for user_id in (1, 2)
+        )
+        # Ids out of insertion order and with gaps
+        session.add_all(
+            Job(
+                id=job_id,
+                title=f"Job {job_id}",
+                description="d",
+                user_id=job_id % 2 + 1,
+            )
+            for job_id in (9, 2, 5, 1, 7, 4)
+        )
+        session.commit()
+        yield session
+
+
+def all_pages(query, key, limit):
+    pages, cursor = [], None
+    while True:
+        rows, cursor = keyset_page(query, key, cursor, limit)
+        pages.append([getattr(row, key.key) for row in rows])
+        if cursor is None:
+            return pages
+
+
+def test_pages_walk_every_row_once_in_key_order(db):
+    assert all_pages(db.query(Job), Job.id, limit=4) == [[1, 2, 4, 5], [7, 9]]
+
+
+def test_projected_rows_are_paged_too(db):
+    rows, cursor = keyset_page(db.query(Job.id, Job.title), Job.id, limit=2)
+    assert [tuple(row) for row in rows] == [(1, "Job 1"), (2, "Job 2")]
+    assert cursor == 2
+
+
+def test_filters_apply_before_paging(db):
+    query = db.query(Job.id).filter(Job.user_id == 2)
+    assert all_pages(query, Job.id, limit=2) == [[1, 5], [7, 9]]
+
+
+def test_full_last_page_has_no_next_cursor(db):
+    assert all_pages(db.query(Job.id), Job.id, limit=3) == [[1, 2, 4], [5, 7, 9]]
+
+
+def test_cursor_past_the_end_is_an_empty_last_page(db):
+    assert keyset_page(db.query(Job), Job.id, cursor=9, limit=10) == ([], None)
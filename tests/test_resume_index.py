@@ -0,0 +1,87 @@
+"""Cached resume matrix: ranking, in-place writes and reloads.
+
+python -m pytest tests/test_resume_index.py
+"""
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import Resume, User
+from app.services import resume_index
+from app.services.match_store import encode_vector
+from app.services.resume_index import ResumeMatrix
+
+
+def make_matrix(rows: dict) -> ResumeMatrix:
+    empty = ResumeMatrix(
+        np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros((0, 0)), 0
+    )
+    return empty.with_rows(rows)
+
+
+def test_rank_pages_through_the_best_matches():
+    matrix = make_matrix(
+        {1: (10, [1.0, 0.0]), 2: (20, [0.6, 0.8]), 3: (30, [0.0, 1.0])}
+    )
+    assert matrix.rank([1.0, 0.0], limit=2) == (3, [(1, 10, 100.0), (2, 20, 60.0)])
+    assert matrix.rank([1.0, 0.0], offset=2, limit=2) == (3, [(3, 30, 0.0)])
+    assert matrix.rank([1.0, 0.0], min_score=50) == (2, [(1, 10, 100.0), (2, 20, 60.0)])
+
+
+def test_with_rows_replaces_and_appends_in_id_order():
+    matrix = make_matrix({2: (1, [1.0, 0.0]), 5: (1, [1.0, 0.0])})
+    updated = matrix.with_rows(
+        {5: (1, [0.0, 3.0]), 3: (2, [0.0, 1.0]), 9: (1, [1.0, 1.0, 1.0])}
+    )
+
+    assert updated.resume_ids.tolist() == [2, 3, 5]
+    assert updated.user_ids.tolist() == [1, 2, 1]
+    assert np.allclose(updated.matrix, [[1.0, 0.0], [0.0, 1.0], [0.0, 1.0]])
+    assert matrix.resume_ids.tolist() == [2, 5]  # The original is left untouched
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(resume_index, "_matrix", None)
+    monkeypatch.setattr(resume_index, "_pending", {})
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(id=1, name="A", email="a@example.com", password="x"))
+        session.add_all(
+            Resume(id=i, user_id=1, experience="x", embedding=encode_vector(vector))
+            for i, vector in ((1, [1.0, 0.0]), (2, [0.0, 1.0]), (3, [1.0, 0.0, 0.0]))
+        )
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def test_local_writes_do_not_reload_the_matrix(db, monkeypatch):
+    loads = []
+    load = resume_index._load
+    monkeypatch.setattr(
+        resume_index, "_load", lambda *args: loads.append(1) or load(*args)
+    )
+
+    matrix = resume_index.get_resume_matrix(db)
+    assert matrix.resume_ids.tolist() == [1, 2]  # Resume 3 has another dimension
+
+    resume_index.record_embedding(4, 1, [0.6, 0.8])
+    matrix = resume_index.get_resume_matrix(db)
+    assert matrix.resume_ids.tolist() == [1, 2, 4]
+    assert matrix.rank([0.6, 0.8], limit=1) == (3, [(4, 1, 100.0)])
+    assert len(loads) == 1
+
+
+def test_expired_matrix_reloads_only_when_the_db_changed(db, monkeypatch):
+    first = resume_index.get_resume_matrix(db)
+    monkeypatch.setattr(resume_index, "RESUME_MATRIX_TTL_SECONDS", -1)
+    assert resume_index.get_resume_matrix(db) is first
+
+    db.add(Resume(id=5, user_id=1, experience="x", embedding=encode_vector([1, 1])))
+    db.commit()
+    assert resume_index.get_resume_matrix(db).resume_ids.tolist() == [1, 2, 5]
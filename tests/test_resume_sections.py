@@ -0,0 +1,68 @@
+"""Resume section splitting and the per-section matching text budget.
+
+python -m pytest tests/test_resume_sections.py
+"""
+
+from app.utils.resume_sections import matching_text, split_sections
+
+RESUME = """Jane Doe
+jane@example.com
+
+## Professional Summary:
+Backend engineer.
+
+WORK EXPERIENCE
+Acme - built APIs.
+Globex - ran Postgres.
+
+Education
+BSc Computer Science
+
+**Skills & Technologies**
+Python, FastAPI
+"""
+
+
+def test_split_sections_recognises_decorated_headings():
+    assert split_sections(RESUME) == {
+        "header": "Jane Doe\njane@example.com",
+        "summary": "Backend engineer.",
+        "experience": "Acme - built APIs.\nGlobex - ran Postgres.",
+        "education": "BSc Computer Science",
+        "skills": "Python, FastAPI",
+    }
+
+
+def test_repeated_headings_are_merged():
+    text = "Skills\nPython\nExperience\nAcme\nSkills\nSQL"
+    assert split_sections(text)["skills"] == "Python\nSQL"
+
+
+def test_long_lines_and_unknown_headings_stay_in_the_body():
+    sentence = "Experience " + "x" * 60
+    sections = split_sections(f"Experience\n{sentence}\nHobbies\nChess")
+    assert sections == {"experience": f"{sentence}\nHobbies\nChess"}
+
+
+def test_text_without_headings_is_all_header():
+    assert split_sections("Just a paragraph.\n\n") == {"header": "Just a paragraph."}
+
+
+def test_matching_text_leaves_out_header_and_education():
+    text = matching_text(split_sections(RESUME), budget=1000)
+    assert text == (
+        "Backend engineer.\n\nAcme - built APIs.\nGlobex - ran Postgres."
+        "\n\nPython, FastAPI"
+    )
+
+
+def test_short_sections_donate_their_budget_to_long_ones():
+    sections = {"experience": "e" * 500, "skills": "s" * 10}
+    text = matching_text(sections, budget=102)
+    experience, skills = text.split("\n\n")
+    assert skills == "s" * 10
+    assert experience == "e" * 90
+
+
+def test_matching_text_falls_back_without_matching_sections():
+    assert matching_text({"header": "Jane"}, budget=4, fallback="Jane Doe") == "Jane"
@@ -0,0 +1,65 @@
+"""WebhookTask retries transient failures only.
+
+python -m pytest tests/test_tasks.py
+"""
+
+import httpx
+import pytest
+
+pytest.importorskip("celery")
+openai = pytest.importorskip("openai")
+
+from app import tasks  # noqa: E402
+from app.worker import celery_app  # noqa: E402
+
+REQUEST = httpx.Request("POST", "https://llm.example.com")
+
+
+def status_error(cls, status):
+    return cls("error", response=httpx.Response(status, request=REQUEST), body=None)
+
+
+@pytest.mark.parametrize(
+    "exc, transient",
+    [
+        (ConnectionError("reset"), True),
+        (httpx.ConnectTimeout("slow"), True),
+        (openai.APITimeoutError(request=REQUEST), True),
+        (status_error(openai.RateLimitError, 429), True),
+        (status_error(openai.InternalServerError, 502), True),
+        (status_error(openai.AuthenticationError, 401), False),
+        (status_error(openai.BadRequestError, 400), False),
+        (ValueError("Task secret was encrypted with a different key"), False),
+    ],
+)
+def test_is_transient(exc, transient):
+    assert tasks.is_transient(exc) is transient
+
+
+@pytest.fixture
+def eager(monkeypatch):
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(celery_app.conf, "task_store_eager_result", False)
+    monkeypatch.setattr(celery_app.conf, "result_backend", "cache+memory://")
+    monkeypatch.setattr(tasks, "get_exponential_backoff_interval", lambda **_: 0)
+    webhooks = []
+    monkeypatch.setattr(
+        tasks, "send_webhook", lambda url, payload: webhooks.append(payload)
+    )
+    return webhooks
+
+
+@pytest.mark.parametrize("error, attempts", [(ConnectionError, 3), (ValueError, 1)])
+def test_only_transient_failures_are_retried(eager, error, attempts):
+    calls = []
+
+    @celery_app.task(base=tasks.WebhookTask, max_retries=2, name=f"fail_{attempts}")
+    def failing(callback_url=None):
+        calls.append(1)
+        raise error("failed")
+
+    result = failing.apply(kwargs={"callback_url": "https://hooks.example.com"})
+
+    assert result.state == "FAILURE"
+    assert len(calls) == attempts
+    assert [payload["status"] for payload in eager] == ["FAILURE"]
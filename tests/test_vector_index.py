@@ -0,0 +1,72 @@
+"""In-process job index: exact scan and the HNSW path (when hnswlib is installed).
+
+python -m pytest tests/test_vector_index.py
+"""
+
+import numpy as np
+import pytest
+
+from app.services import vector_index
+from app.services.vector_index import JobVectorIndex
+
+rng = np.random.default_rng(0)
+EMBEDDINGS = rng.normal(size=(300, 16)).astype(np.float32)
+USER_IDS = [job_id % 3 for job_id in range(300)]
+
+
+def build(monkeypatch, hnsw: bool) -> JobVectorIndex:
+    if hnsw:
+        pytest.importorskip("hnswlib")
+    monkeypatch.setattr(vector_index, "HNSW_MIN_ROWS", 100 if hnsw else 10**9)
+    index = JobVectorIndex().build(list(range(300)), EMBEDDINGS, user_ids=USER_IDS)
+    assert (index._hnsw is not None) is hnsw
+    return index
+
+
+def exact(query, k, rows=range(300)):
+    rows = list(rows)
+    matrix = vector_index.normalize_rows(EMBEDDINGS[rows])
+    scores = matrix @ (query / np.linalg.norm(query))
+    return [rows[i] for i in np.argsort(-scores)[:k]]
+
+
+@pytest.mark.parametrize("hnsw", [False, True])
+def test_search_finds_the_nearest_jobs(monkeypatch, hnsw):
+    index = build(monkeypatch, hnsw)
+    query = EMBEDDINGS[42]
+    hits = index.search(query, k=5)
+    assert [job_id for job_id, _ in hits] == exact(query, 5)
+    assert hits[0] == (42, pytest.approx(1.0, abs=1e-5))
+
+
+@pytest.mark.parametrize("hnsw", [False, True])
+def test_search_filters_by_user(monkeypatch, hnsw):
+    index = build(monkeypatch, hnsw)
+    query = EMBEDDINGS[7]
+    hits = index.search(query, k=5, user_id=1)
+    owned = [job_id for job_id in range(300) if USER_IDS[job_id] == 1]
+    assert [job_id for job_id, _ in hits] == exact(query, 5, owned)
+
+
+@pytest.mark.parametrize("hnsw", [False, True])
+def test_upsert_and_remove(monkeypatch, hnsw):
+    index = build(monkeypatch, hnsw)
+    index.remove(42)
+    index.upsert(1000, EMBEDDINGS[42], user_id=2)
+    assert 42 not in index and len(index) == 300
+    assert index.search(EMBEDDINGS[42], k=1)[0][0] == 1000
+    assert np.allclose(index.get(1000), vector_index.normalize_rows(EMBEDDINGS[42:43]))
+
+
+def test_failed_hnsw_query_falls_back_to_the_exact_scan(monkeypatch):
+    index = build(monkeypatch, hnsw=True)
+
+    class SelectiveFilterFailure:
+        def knn_query(self, *args, **kwargs):
+            raise RuntimeError("Cannot return the results in a contiguous 2D array")
+
+    monkeypatch.setattr(index, "_hnsw", SelectiveFilterFailure())
+    query = EMBEDDINGS[3]
+    hits = index.search(query, k=3, user_id=0)
+    owned = [job_id for job_id in range(300) if USER_IDS[job_id] == 0]
+    assert [job_id for job_id, _ in hits] == exact(query, 3, owned)